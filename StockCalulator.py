@@ -1,16 +1,13 @@
 '''
     Stock Calculator Entry Point
     Author: Matthew Barber<mfmbarber@gmail.com>
+
+    With no command the GUI is started, see --help for the headless commands
 '''
 
 import sys
 
-from app.app import App
-from app.model.stock_source_file import StockSourceFile
-from PyQt5.QtWidgets import QApplication
+from app.cli import main
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    # TODO : Read the stock path from the console, or from a config file
-    ex = App(StockSourceFile('all_stocks_5yr.csv'))
-    sys.exit(app.exec_())
+    sys.exit(main())
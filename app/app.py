@@ -17,20 +17,44 @@ class App(QMainWindow):
     '''
         Main window for the stock profit app
     '''
-    def __init__(self, source):
+    def __init__(self,
+                 source,
+                 useSnapshot=True,
+                 processes=None,
+                 progressive=True,
+                 lazy=False):
         super().__init__()
         self.resourceSize = source.getResourceSize()
+        self.useSnapshot = useSnapshot
+        self.processes = processes
+        self.progressive = progressive
+        self.lazy = lazy
+        self.mainController = None
         self.initUI(source)
 
     def updateProgressPercentage(self, bytes: int):
         '''
-            Update the loading percentage based on the current bytes
+            Update the loading percentage based on the current bytes, once
+            the main controller is showing this moves to the status bar
 
             Args:
                 bytes (int): The byte loaded
         '''
-        self.loadingController.updateProgressBar(
-            (bytes / self.resourceSize) * 100)
+        percentage = (bytes / self.resourceSize) * 100
+        if self.mainController is None:
+            self.loadingController.updateProgressBar(int(percentage))
+        else:
+            self.updateStatusBar("Loading stock data... %d%%" % percentage)
+
+    def updateProgressLabel(self, label: str):
+        '''
+            Update the label currently loading, while loading is showing
+
+            Args:
+                label (str): The stock label
+        '''
+        if self.mainController is None:
+            self.loadingController.updateProgress(label)
 
     def loadModel(self, source):
         '''
@@ -39,9 +63,15 @@ class App(QMainWindow):
             Args:
                 source (StockSource): A source for our stock model
         '''
-        worker = StockWorker(self, source)
-        worker.result.connect(self.initMain)
-        worker.progressLabel.connect(self.loadingController.updateProgress)
+        worker = StockWorker(self,
+                             source,
+                             useSnapshot=self.useSnapshot,
+                             processes=self.processes,
+                             progressive=self.progressive,
+                             lazy=self.lazy)
+        worker.result.connect(self.finishMain)
+        worker.partial.connect(self.updateMain)
+        worker.progressLabel.connect(self.updateProgressLabel)
         worker.progressBytes.connect(self.updateProgressPercentage)
         worker.start()
 
@@ -71,10 +101,34 @@ class App(QMainWindow):
             Args:
                 model (Stock): The stock model to attach to the main controller
         '''
-        self.updateStatusBar("Ready...")
         self.mainController = MainController(stock)
         self.setCentralWidget(self.mainController)
 
+    def updateMain(self, stock, labels):
+        '''
+            Show the stock published so far by a progressive load, the main
+            controller is shown as soon as there is any
+
+            Args:
+                stock   (Stock):        The stock model being loaded
+                labels  (List[str]):    The labels just published
+        '''
+        if self.mainController is None:
+            self.initMain(stock)
+        else:
+            self.mainController.addStock(labels)
+
+    def finishMain(self, stock):
+        '''
+            Show the loaded stock model
+
+            Args:
+                stock (Stock): The loaded stock model
+        '''
+        if self.mainController is None:
+            self.initMain(stock)
+        self.updateStatusBar("Ready...")
+
     def updateStatusBar(self, value):
         '''
             Sets the default value for the status bar
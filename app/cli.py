@@ -0,0 +1,590 @@
+'''
+    Command Line Interface
+    Headless queries against the stock model, streamed as CSV or JSON lines
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock import Stock
+from app.model.stock_date import StockDate
+from app.model.stock_profit_table import StockProfitTable
+from app.model.stock_source_mapped_file import StockSourceMappedFile
+from itertools import islice
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+
+
+class StockWriter:
+    '''
+        Writes rows to a stream as they're produced, as CSV (with a header)
+        or as JSON lines
+
+        Args:
+            stream  (file): The stream to write to
+            format  (str):  Either csv or json
+    '''
+    FORMATS = ['csv', 'json']
+
+    def __init__(self, stream, format: str = 'csv'):
+        self.stream = stream
+        self.format = format
+        self.writer = None
+
+    def write(self, row):
+        '''
+            Write a row, NaN values are written empty (or null)
+
+            Args:
+                row (dict{str: mixed}): The row, keys are the columns
+        '''
+        row = {
+            key: StockWriter.toValue(value)
+            for key, value in row.items()
+        }
+        if self.format == 'json':
+            self.stream.write(json.dumps(row) + '\n')
+            return
+        if self.writer is None:
+            self.writer = csv.DictWriter(self.stream,
+                                         fieldnames=list(row.keys()),
+                                         lineterminator='\n')
+            self.writer.writeheader()
+        self.writer.writerow(row)
+
+    @staticmethod
+    def toValue(value):
+        '''
+            Convert a NumPy scalar to a plain value
+
+            Args:
+                value (mixed): The value
+
+            Returns:
+                (mixed)
+        '''
+        if hasattr(value, 'item'):
+            value = value.item()
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+
+
+class StockCli:
+    '''
+        Parses the command line and runs a command, with no command the GUI
+        is started. The model is loaded from the source's snapshot when
+        there's an up to date one, so repeated queries start quickly
+    '''
+
+    # Rows read from a scenario file per batch
+    BATCH_ROWS = 65536
+
+    def __init__(self, stream=sys.stdout):
+        self.stream = stream
+        self.parser = self.createParser()
+
+    def createParser(self):
+        '''
+            Build the argument parser, with a sub parser per command
+
+            Returns:
+                (ArgumentParser)
+        '''
+        common = argparse.ArgumentParser(add_help=False)
+        common.add_argument('--source',
+                            default='all_stocks_5yr.csv',
+                            help='the stock CSV file to load')
+        common.add_argument('--format',
+                            choices=StockWriter.FORMATS,
+                            default='csv',
+                            help='the output format')
+        common.add_argument('--no-snapshot',
+                            action='store_true',
+                            help="don't read or write the model snapshot")
+        common.add_argument('--processes',
+                            type=int,
+                            default=None,
+                            help='processes to parse the source with, '
+                            'defaults to one, or one per core for sources '
+                            'over 256 MB')
+        common.add_argument('--lazy',
+                            action='store_true',
+                            help='without a snapshot, index the source and '
+                            'parse each stock when first read')
+        dates = argparse.ArgumentParser(add_help=False)
+        dates.add_argument('--from',
+                           dest='fromDate',
+                           type=self.parseDate,
+                           help='the from (buy) date, yyyy-mm-dd, defaults '
+                           'to the earliest date')
+        dates.add_argument('--to',
+                           dest='toDate',
+                           type=self.parseDate,
+                           help='the to (sell) date, yyyy-mm-dd, defaults to '
+                           'the latest date')
+        stock = argparse.ArgumentParser(add_help=False)
+        stock.add_argument('--stock',
+                           nargs='+',
+                           default=[],
+                           help='stock labels, defaults to all stock')
+
+        parser = argparse.ArgumentParser(
+            prog='StockCalulator.py',
+            description='Stock profit calculator, starts the GUI when no '
+            'command is given')
+        commands = parser.add_subparsers(dest='command')
+        gui = commands.add_parser('gui',
+                                  parents=[common],
+                                  help='start the GUI')
+        gui.set_defaults(run=self.gui)
+        profit = commands.add_parser(
+            'profit',
+            parents=[common, dates, stock],
+            help='profit estimates for buying and selling stock')
+        profit.add_argument('--amount',
+                            type=int,
+                            default=1,
+                            help='the amount of stock')
+        profit.add_argument('--input',
+                            help='a CSV of scenarios, with stock, buy, sell '
+                            'and amount columns, - for stdin')
+        profit.set_defaults(run=self.profit)
+        average = commands.add_parser(
+            'average',
+            parents=[common, dates, stock],
+            help='average values of stock between two dates')
+        average.set_defaults(run=self.average)
+        screen = commands.add_parser(
+            'screen',
+            parents=[common, dates],
+            help='profit metrics for every stock, sorted')
+        screen.add_argument('--amount',
+                            type=int,
+                            default=1,
+                            help='the amount of stock')
+        screen.add_argument('--sort',
+                            choices=['label'] + StockProfitTable.COLUMNS,
+                            default='percentageGain',
+                            help='the column to sort by')
+        screen.add_argument('--ascending',
+                            action='store_true',
+                            help='sort smallest first')
+        screen.add_argument('--limit', type=int, help='the most rows to write')
+        screen.set_defaults(run=self.screen)
+        window = commands.add_parser(
+            'best-window',
+            parents=[common, dates, stock],
+            help='the most profitable buy and sell dates for stock')
+        window.add_argument('--count',
+                            type=int,
+                            default=1,
+                            help='the number of windows per stock')
+        window.set_defaults(run=self.bestWindow)
+        export = commands.add_parser('export',
+                                     parents=[common, dates, stock],
+                                     help='the daily values of stock')
+        export.set_defaults(run=self.export)
+        movers = commands.add_parser(
+            'movers',
+            parents=[common],
+            help='the stock that moved the most on a day')
+        movers.add_argument('--date',
+                            type=self.parseDate,
+                            help='the day, yyyy-mm-dd, defaults to the latest '
+                            'date')
+        movers.add_argument('--limit',
+                            type=int,
+                            default=10,
+                            help='the most rows to write')
+        movers.add_argument('--ascending',
+                            action='store_true',
+                            help='biggest losers first')
+        movers.set_defaults(run=self.movers)
+        breadth = commands.add_parser(
+            'breadth',
+            parents=[common, dates],
+            help='the stock up and down, and the high and low, each day')
+        breadth.set_defaults(run=self.breadth)
+        return parser
+
+    def run(self, argv):
+        '''
+            Run the command line
+
+            Args:
+                argv (List[str]): The arguments, without the program
+
+            Returns:
+                (int) The exit status
+        '''
+        # Options without a command are the GUI's
+        if not argv or (argv[0].startswith('-')
+                        and argv[0] not in ('-h', '--help')):
+            argv = ['gui'] + list(argv)
+        args = self.parser.parse_args(argv)
+        if not os.path.isfile(args.source):
+            self.parser.error("%s doesn't exist" % args.source)
+        source = StockSourceMappedFile(args.source)
+        if args.command == 'gui':
+            return args.run(source, not args.no_snapshot, args.processes,
+                            args.lazy)
+        writer = StockWriter(self.stream, args.format)
+        model = Stock()
+        model.load(source,
+                   useSnapshot=not args.no_snapshot,
+                   processes=args.processes,
+                   lazy=args.lazy)
+        if model.getEarliestDate() is None:
+            self.parser.error("%s has no stock" % args.source)
+        # Commands taking a date range default to the bounds of the data
+        if hasattr(args, 'fromDate'):
+            args.fromDate = args.fromDate or model.getEarliestDateString()
+            args.toDate = args.toDate or model.getLatestDateString()
+            if (StockDate.toDayNumber(args.fromDate) >
+                    StockDate.toDayNumber(args.toDate)):
+                self.parser.error("--from %s is after --to %s" %
+                                  (args.fromDate, args.toDate))
+        status = 0
+        try:
+            status = args.run(model, args, writer) or 0
+            self.stream.flush()
+        except BrokenPipeError:
+            # The reader stopped early (e.g. head), that's fine. Point
+            # stdout at devnull so the exit flush doesn't fail again
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return status
+
+    @staticmethod
+    def parseDate(value: str):
+        '''
+            Validate a date argument
+
+            Args:
+                value (str): Date in yyyy-mm-dd format
+
+            Returns:
+                (str) The date, zero padded
+        '''
+        try:
+            dayNumber = StockDate.toDayNumber(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError("%s isn't a yyyy-mm-dd date" %
+                                             value)
+        return StockDate.toDateString(dayNumber)
+
+    def getNodes(self, model, labels):
+        '''
+            Find the nodes for labels, or every node, reporting any missing
+
+            Args:
+                model   (Stock):        The stock model
+                labels  (List[str]):    Stock labels
+
+            Yields:
+                (StockNode)
+        '''
+        if not labels:
+            yield from model.selectAll().values()
+            return
+        for label in labels:
+            node = model.findByName(label.upper())
+            if node is None:
+                print("%s isn't a stock" % label, file=sys.stderr)
+            else:
+                yield node
+
+    def gui(self,
+            source,
+            useSnapshot: bool = True,
+            processes: int = None,
+            lazy: bool = False):
+        '''
+            Start the GUI, Qt is only imported here so headless commands
+            never load it
+
+            Args:
+                source      (StockSource):  The source of our data
+                useSnapshot (bool):         Read and write the snapshot
+                processes   (int):          Processes to parse the source
+                                            with, None to decide by size
+                lazy        (bool):         Parse stock as it's first read
+
+            Returns:
+                (int) The exit status
+        '''
+        from app.app import App
+        from PyQt5.QtWidgets import QApplication
+        app = QApplication(sys.argv[:1])
+        # Keep a reference to the window while the app runs
+        self.window = App(source,
+                          useSnapshot=useSnapshot,
+                          processes=processes,
+                          lazy=lazy)
+        return app.exec_()
+
+    def profit(self, model, args, writer):
+        '''
+            Write profit estimates, for the stock and dates given, or for
+            each scenario in the input
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+        '''
+        if args.input is None:
+            labels = [label.upper() for label in args.stock
+                      ] or model.selectAllNames()
+            self.writeProfit(
+                model.getProfitValues(labels, args.fromDate, args.toDate,
+                                      args.amount), writer)
+            return
+        stream = sys.stdin if args.input == '-' else open(args.input,
+                                                          newline='')
+        status = 0
+        with stream:
+            scenarios = self.readScenarios(stream, args)
+            while True:
+                batch = list(islice(scenarios, self.BATCH_ROWS))
+                if not batch:
+                    break
+                valid = [scenario for scenario in batch if scenario]
+                if len(valid) < len(batch):
+                    status = 1
+                if not valid:
+                    continue
+                labels, buyDates, sellDates, amounts = zip(*valid)
+                self.writeProfit(
+                    model.getProfitValues(list(labels), list(buyDates),
+                                          list(sellDates), list(amounts)),
+                    writer)
+        return status
+
+    def readScenarios(self, stream, args):
+        '''
+            Read the scenarios of a profit input CSV, a row that isn't
+            valid is reported with its line and read as None
+
+            Args:
+                stream  (file):         The CSV stream
+                args    (Namespace):    The parsed arguments, for the
+                                        default dates and amount
+
+            Yields:
+                (tuple(str, str, str, int) || None) The label, the buy and
+                sell dates, and the amount
+        '''
+        name = 'stdin' if args.input == '-' else args.input
+        rows = csv.DictReader(stream)
+        for row in rows:
+            try:
+                label = (row.get('stock') or '').strip().upper()
+                if not label:
+                    raise ValueError("there's no stock")
+                buyDate = self.parseDate(row.get('buy') or args.fromDate)
+                sellDate = self.parseDate(row.get('sell') or args.toDate)
+                if (StockDate.toDayNumber(buyDate) >
+                        StockDate.toDayNumber(sellDate)):
+                    raise ValueError("%s is after %s" % (buyDate, sellDate))
+                amount = row.get('amount') or args.amount
+                try:
+                    amount = int(amount)
+                except ValueError:
+                    raise ValueError("%s isn't a whole amount" % amount)
+            except (ValueError, argparse.ArgumentTypeError) as error:
+                print("%s line %d: %s" % (name, rows.line_num, error),
+                      file=sys.stderr)
+                yield None
+                continue
+            yield label, buyDate, sellDate, amount
+
+    def writeProfit(self, table, writer):
+        '''
+            Write a row per scenario of a profit table
+
+            Args:
+                table   (StockProfitTable): The profit table
+                writer  (StockWriter):      Where to write the rows
+        '''
+        columns = [(name, table.getColumn(name).tolist())
+                   for name in StockProfitTable.COLUMNS]
+        for index, values in enumerate(
+                zip(table.getLabels().tolist(),
+                    StockDate.toDateStrings(table.getBuyDates()),
+                    StockDate.toDateStrings(table.getSellDates()),
+                    table.getAmounts().tolist(),
+                    table.getFound().tolist())):
+            row = dict(zip(("stock", "buyDate", "sellDate", "amount",
+                            "found"), values))
+            for name, column in columns:
+                row[name] = column[index]
+            writer.write(row)
+
+    def average(self, model, args, writer):
+        '''
+            Write the average values of stock between two dates
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+        '''
+        for node in self.getNodes(model, args.stock):
+            value = node.getAverageValues(args.fromDate, args.toDate)
+            volume = node.getVolumeValues(args.fromDate, args.toDate)
+            writer.write({
+                "stock": node.getLabel(),
+                "fromDate": args.fromDate,
+                "toDate": args.toDate,
+                "open": value.getOpeningValue(),
+                "high": value.getHighValue(),
+                "low": value.getLowValue(),
+                "close": value.getCloseValue(),
+                "volume": volume.getAverageVolume(),
+                "turnover": volume.getTurnover(),
+                "vwap": volume.getVwap()
+            })
+
+    def screen(self, model, args, writer):
+        '''
+            Write the profit metrics of every stock, sorted
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+        '''
+        table = model.screen(args.fromDate, args.toDate, args.amount)
+        table = table.sortBy(args.sort, not args.ascending)
+        if args.limit is not None:
+            table = table.take(slice(0, args.limit))
+        self.writeProfit(table, writer)
+
+    def bestWindow(self, model, args, writer):
+        '''
+            Write the most profitable buy and sell dates of stock, stock
+            whose price never rose have none
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+        '''
+        for node in self.getNodes(model, args.stock):
+            windows = node.getBestWindows(args.fromDate, args.toDate,
+                                          args.count)
+            if not windows:
+                print("%s never rose between %s and %s" %
+                      (node.getLabel(), args.fromDate, args.toDate),
+                      file=sys.stderr)
+            for rank, window in enumerate(windows, 1):
+                writer.write({
+                    "stock": node.getLabel(),
+                    "rank": rank,
+                    "buyDate": window.getBuyDate(),
+                    "sellDate": window.getSellDate(),
+                    "buyPrice": window.getBuyPrice(),
+                    "sellPrice": window.getSellPrice(),
+                    "change": window.getChange(),
+                    "percentageChange": window.getPercentageChange()
+                })
+
+    def export(self, model, args, writer):
+        '''
+            Write the daily values of stock between two dates
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+        '''
+        for node in self.getNodes(model, args.stock):
+            start, end = node.getIndexRange(args.fromDate, args.toDate)
+            dates, open, high, low, close, volume = node.getColumns()
+            label = node.getLabel()
+            for row in zip(StockDate.toDateStrings(dates[start:end]),
+                           open[start:end].tolist(),
+                           high[start:end].tolist(),
+                           low[start:end].tolist(),
+                           close[start:end].tolist(),
+                           volume[start:end].tolist()):
+                writer.write({
+                    "stock": label,
+                    "date": row[0],
+                    "open": row[1],
+                    "high": row[2],
+                    "low": row[3],
+                    "close": row[4],
+                    "volume": row[5]
+                })
+
+    def movers(self, model, args, writer):
+        '''
+            Write the stock that moved the most on a day, from their last
+            close before it
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+
+            Returns:
+                (int) The exit status, 1 when it isn't a trading day
+        '''
+        date = args.date or model.getLatestDateString()
+        crossSection = model.getCrossSection(date)
+        if crossSection is None:
+            print("%s isn't a trading day" % date, file=sys.stderr)
+            return 1
+        order = crossSection.getMovers(args.limit, not args.ascending)
+        labels = crossSection.getLabels()[order]
+        changes = crossSection.getChanges()[order]
+        previousClose = crossSection.getPreviousClose()[order]
+        close = crossSection.getValues("close")[order]
+        volume = crossSection.getValues("volume")[order]
+        for row in zip(labels.tolist(), previousClose.tolist(),
+                       close.tolist(), changes.tolist(), volume.tolist()):
+            writer.write({
+                "stock": row[0],
+                "date": date,
+                "previousClose": row[1],
+                "close": row[2],
+                "percentageChange": row[3],
+                "volume": row[4]
+            })
+
+    def breadth(self, model, args, writer):
+        '''
+            Write the number of stock that closed up, down and unchanged on
+            each trading day between two dates, with the day's high and low
+
+            Args:
+                model   (Stock):        The stock model
+                args    (Namespace):    The parsed arguments
+                writer  (StockWriter):  Where to write the rows
+        '''
+        breadth = model.getPanel().getBreadth(args.fromDate, args.toDate)
+        dates = StockDate.toDateStrings(breadth.pop("days"))
+        names = list(breadth)
+        for date, values in zip(dates, zip(*(breadth[name].tolist()
+                                             for name in names))):
+            row = {"date": date}
+            row.update(zip(names, values))
+            writer.write(row)
+
+
+def main(argv=None):
+    '''
+        Run the command line
+
+        Args:
+            argv (List[str]): The arguments, defaults to sys.argv
+
+        Returns:
+            (int) The exit status
+    '''
+    return StockCli().run(sys.argv[1:] if argv is None else argv)
@@ -5,7 +5,12 @@
     Author:
         Matthew Barber <mfmbarber@gmail.com>
 '''
-from app.view.components.analysis import AverageStockValueData
+from app.lib.recompute_scheduler import RecomputeScheduler
+from app.view.components.analysis import (
+    AverageStockValueData,
+    StockVolumeValueData,
+    StockWindowValueData,
+)
 from app.view.components.labels import AnalysisOverviewLabel
 from app.view.components.stock import StockSelector
 from app.view.layouts import AnalysisLayout
@@ -36,6 +41,9 @@ class AnalysisController(QWidget):
         self.toDate = toDateString
         self.stockNodes = stockNodes
         self.selectedStock = None
+        self.scheduler = RecomputeScheduler(parent=self)
+        self.scheduler.result.connect(self.showAnalysis)
+        self.scheduler.failed.connect(self.showError)
         self.initUI()
 
     def initUI(self):
@@ -52,29 +60,91 @@ class AnalysisController(QWidget):
                 self.selectedStock.getLabel()
                 if self.selectedStock is not None else None))
 
-        self.averageValues = AverageStockValueData(self.getAverageValues())
+        self.averageValues = AverageStockValueData()
+        self.windowValues = StockWindowValueData()
+        self.volumeValues = StockVolumeValueData()
 
         self.setLayout(
             AnalysisLayout(self.stockSelectorComponent, self.overviewComponent,
-                           self.averageValues))
+                           self.averageValues, self.windowValues,
+                           self.volumeValues))
 
-    def getAverageValues(self):
+    def getAnalysis(self, node, fromDate: str, toDate: str, isCancelled):
         '''
-            A wrapper to get the average value from either the current node
-            or an empty value
+            Analyse a node between two dates, run on a worker thread
+
+            Args:
+                node        (StockNode):    The node being analysed
+                fromDate    (str):          The from (buy) date
+                toDate      (str):          The to (sell) date
+                isCancelled (callable):     True once the job is stale
 
             Returns:
-                (StockValue)
+                (tuple(StockValue, StockWindow, StockWindow, StockVolume)) The
+                    average values, max run-up, max drawdown and volume,
+                    None when cancelled
         '''
-        if self.selectedStock is None:
-            return AverageStockValueData.createEmptyValue()
-        return self.selectedStock.getAverageValues(self.fromDate, self.toDate)
+        averageValues = node.getAverageValues(fromDate, toDate)
+        if isCancelled():
+            return None
+        runUp = node.getMaxRunUp(fromDate, toDate)
+        drawdown = node.getMaxDrawdown(fromDate, toDate)
+        if isCancelled():
+            return None
+        return (averageValues, runUp, drawdown,
+                node.getVolumeValues(fromDate, toDate))
+
+    @staticmethod
+    def createEmptyAnalysis():
+        '''
+            Placeholder analysis for when there's no stock to analyse
+
+            Returns:
+                (tuple(StockValue, StockWindow, StockWindow, StockVolume))
+        '''
+        return (AverageStockValueData.createEmptyValue(),
+                StockWindowValueData.createEmptyValue(),
+                StockWindowValueData.createEmptyValue(),
+                StockVolumeValueData.createEmptyValue())
+
+    def showAnalysis(self, analysis):
+        '''
+            Update all the analysis components with the result of getAnalysis
+
+            Args:
+                analysis (tuple): The average, window and volume values
+        '''
+        averageValues, runUp, drawdown, volumeValues = analysis
+        self.updateOverview()
+        self.averageValues.updateAverageValues(averageValues)
+        self.windowValues.updateWindowValues(runUp, drawdown)
+        self.volumeValues.updateVolumeValues(volumeValues)
 
-    def updateAverageValues(self):
+    def showError(self, error: str):
         '''
-            Update the average values component
+            Show the error the analysis raised, in place of the overview
+
+            Args:
+                error (str): The error message
         '''
-        self.averageValues.updateAverageValues(self.getAverageValues())
+        self.showAnalysis(self.createEmptyAnalysis())
+        self.overviewComponent.error(
+            "Couldn't analyse %s: %s" %
+            (self.selectedStock.getLabel()
+             if self.selectedStock is not None else 'the stock', error))
+
+    def updateAnalysis(self):
+        '''
+            Update all the analysis components, the analysis runs in the
+            background once the state settles
+        '''
+        if self.selectedStock is None:
+            self.scheduler.cancel()
+            self.showAnalysis(self.createEmptyAnalysis())
+            return
+        node, fromDate, toDate = self.selectedStock, self.fromDate, self.toDate
+        self.scheduler.schedule(lambda isCancelled: self.getAnalysis(
+            node, fromDate, toDate, isCancelled))
 
     def updateSelectedStock(self, node=None):
         '''
@@ -84,11 +154,17 @@ class AnalysisController(QWidget):
                 node (StockNode): The node being analysed
         '''
         self.selectedStock = node
+        self.updateOverview()
+        self.updateAnalysis()
+
+    def updateOverview(self):
+        '''
+            Update the overview of the dates and stock being analysed
+        '''
         self.overviewComponent.update(
             self.overviewComponent.createOverviewString(
                 self.fromDate, self.toDate,
                 self.selectedStock.getLabel() if self.selectedStock else None))
-        self.updateAverageValues()
 
     def updateSelectedStockByLabel(self, label: str):
         '''
@@ -113,7 +189,7 @@ class AnalysisController(QWidget):
                 fromDate (str): The from (buy) date
         '''
         self.fromDate = fromDate
-        self.updateAverageValues()
+        self.updateAnalysis()
 
     def updateToDate(self, toDate: str):
         '''
@@ -123,7 +199,7 @@ class AnalysisController(QWidget):
                 toDate (str): The to (sell) date
         '''
         self.toDate = toDate
-        self.updateAverageValues()
+        self.updateAnalysis()
 
     def updateStockNodes(self, stockNodes):
         '''
@@ -56,6 +56,18 @@ class CalendarController(QWidget):
         self.labelComponent.update(date)
         self.update.emit(date)
 
+    def setDate(self, date: str):
+        '''
+            Select a date, without emitting an update
+
+            Args:
+                date (str): Date in yyyy-mm-dd format
+        '''
+        self.date = date
+        self.calendarComponent.setSelectedDate(
+            self.calendarComponent.getQDate(date))
+        self.labelComponent.update(date)
+
     def setEarliestDate(self, date: str):
         '''
             Set the earliest date for the calendar
@@ -44,18 +44,52 @@ class GraphController(QWidget):
         self.graphComponent.initGraph(
             Constants.GraphOptions.getOptionOrLabel(self.selectedOption))
 
-    def plotStock(self, label: str, x, y, low: float, high: float):
+    def removeStock(self, label: str):
         '''
-            Plot a stock to the graph
+            Remove a stock from the graph
 
             Args:
-                label   (string)     : The label for the stock
-                x       (List[int])  : Each point represents a day
-                y       (List[float]): Each entry represents the value of the stock
-                low     (float)      : The low for this stock entry
-                high    (float)      : The high for this stock entry
+                label (string): The label for the stock
         '''
-        self.graphComponent.plotStock(label, x, y, low, high)
+        self.graphComponent.removeStock(label)
+
+    def getPlottedLabels(self):
+        '''
+            Return the labels of the stock plotted
+
+            Returns:
+                (List[str])
+        '''
+        return self.graphComponent.getLabels()
+
+    def plotStock(self,
+                  label: str,
+                  x,
+                  y,
+                  low: float,
+                  high: float,
+                  volume=None):
+        '''
+            Plot a stock to the graph, or update it if it's already plotted
+
+            Args:
+                label   (string)        : The label for the stock
+                x       (ndarray[float]): Each point represents a day
+                y       (ndarray[float]): Each entry represents the value of the stock
+                low     (float)         : The low for this stock entry
+                high    (float)         : The high for this stock entry
+                volume  (ndarray[float]): The volume traded each day
+        '''
+        self.graphComponent.plotStock(label, x, y, low, high, volume)
+
+    def showError(self, error: str):
+        '''
+            Show an error on the graph, until the next plot
+
+            Args:
+                error (str): The error message
+        '''
+        self.graphComponent.setError(error)
 
     def updateSelectedOption(self, option):
         '''
@@ -66,3 +100,5 @@ class GraphController(QWidget):
         '''
         if option in Constants.GraphOptions.all():
             self.selectedOption = option
+            self.graphComponent.setTitle(
+                Constants.GraphOptions.getOptionOrLabel(option))
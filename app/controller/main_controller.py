@@ -5,13 +5,14 @@
     Author:
         Matthew Barber <mfmbarber@gmail.com>
 '''
-from datetime import datetime, timedelta
 from .amount_controller import AmountController
 from .analysis_controller import AnalysisController
 from .calendar_controller import CalendarController
 from .graph_controller import GraphController
 from .profit_controller import ProfitController
+from .screen_controller import ScreenController
 from app.lib.constants import Constants
+from app.lib.recompute_scheduler import RecomputeScheduler
 from .stock_controller import StockController
 from PyQt5.QtWidgets import QHBoxLayout, QTabWidget, QVBoxLayout, QWidget
 
@@ -30,6 +31,10 @@ class MainController(QWidget):
         self.state = MainState()
         self.state.fromDate = self.model.getEarliestDateString()
         self.state.toDate = self.model.getLatestDateString()
+        # The date bounds of the model, which grow while it loads
+        self.bounds = (self.state.fromDate, self.state.toDate)
+        # The graph state each plotted stock was last plotted with
+        self.plotted = {}
         self.initControllers()
         self.initUI()
 
@@ -45,6 +50,10 @@ class MainController(QWidget):
         self.profitController = ProfitController(self.state.amount,
                                                  self.state.fromDate,
                                                  self.state.toDate)
+        self.screenController = ScreenController(self.model,
+                                                 self.state.amount,
+                                                 self.state.fromDate,
+                                                 self.state.toDate)
         self.fromCalendarController = CalendarController(
             self.state.fromDate, self.state.fromDate, self.state.toDate,
             "Buy date")
@@ -60,6 +69,9 @@ class MainController(QWidget):
             self.updateSelectedStockState)
         self.graphController = GraphController(self.state.option)
         self.graphController.update.connect(self.updateGraphData)
+        self.scheduler = RecomputeScheduler(parent=self)
+        self.scheduler.result.connect(self.plotSeries)
+        self.scheduler.failed.connect(self.plotFailed)
 
     def initUI(self):
         '''
@@ -79,9 +91,45 @@ class MainController(QWidget):
         tabs.addTab(self.profitController, 'Profit Estimates')
         tabs.addTab(self.graphController, 'Value Graph')
         tabs.addTab(self.analysisController, 'Stock Analysis')
+        tabs.addTab(self.screenController, 'Stock Screen')
 
         layout.addWidget(tabs)
 
+    def addStock(self, labels):
+        '''
+            Take in stock published to the model while it loads, growing the
+            stock list and date bounds, and replotting republished stock
+
+            Args:
+                labels (List[str]): The labels published
+        '''
+        earliest = self.model.getEarliestDateString()
+        latest = self.model.getLatestDateString()
+        previousEarliest, previousLatest = self.bounds
+        self.bounds = (earliest, latest)
+        self.selectedStockController.addLabels(labels)
+        self.screenController.updateScreen()
+        # A republished stock is replotted from its new node, drop its old
+        # curve along with its graph state, so the two never disagree
+        for label in labels:
+            if self.plotted.pop(label, None) is not None:
+                self.graphController.removeStock(label)
+        self.fromCalendarController.setEarliestDate(earliest)
+        self.toCalendarController.setLatestDate(latest)
+        # Dates left at the bounds follow them, which reprocesses
+        moved = False
+        if self.state.fromDate == previousEarliest != earliest:
+            self.fromCalendarController.setDate(earliest)
+            self.updateFromDateState(earliest)
+            moved = True
+        if self.state.toDate == previousLatest != latest:
+            self.toCalendarController.setDate(latest)
+            self.updateToDateState(latest)
+            moved = True
+        if not moved and any(label in self.state.selectedStock
+                             for label in labels):
+            self.process()
+
     def updateAmountState(self, number: int):
         '''
             State management for the amount, on change reprocess the data
@@ -91,6 +139,7 @@ class MainController(QWidget):
         '''
         self.state.amount = number
         self.profitController.updateMultiplier(number)
+        self.screenController.updateMultiplier(number)
         self.process()
 
     def updateFromDateState(self, dateString: str):
@@ -103,6 +152,7 @@ class MainController(QWidget):
         self.state.fromDate = dateString
         self.analysisController.updateFromDate(dateString)
         self.profitController.updateFromDate(dateString)
+        self.screenController.updateFromDate(dateString)
         self.toCalendarController.setEarliestDate(dateString)
         self.process()
 
@@ -116,6 +166,7 @@ class MainController(QWidget):
         self.state.toDate = dateString
         self.analysisController.updateToDate(dateString)
         self.profitController.updateToDate(dateString)
+        self.screenController.updateToDate(dateString)
         self.fromCalendarController.setLatestDate(dateString)
         self.process()
 
@@ -144,77 +195,80 @@ class MainController(QWidget):
         '''
             Using the state, process the selected stock nodes
         '''
-        # Create a new graph (clearing the previous)
-        self.graphController.clear()
         # Fetch the stotck nodes from the model
         stockNodes = [
             self.model.findByName(label) for label in self.state.selectedStock
         ]
         self.analysisController.updateStockNodes(stockNodes)
         self.profitController.updateStockNodes(stockNodes)
-        data = []
-        # Process each node
+        # Remove the plots of any stock that has been deselected
+        for label in self.graphController.getPlottedLabels():
+            if label not in self.state.selectedStock:
+                self.graphController.removeStock(label)
+                self.plotted.pop(label, None)
+        # Only replot the stock whose graph state has changed, the series
+        # are built in the background once the state settles
+        graphState = (self.state.option, self.state.fromDate,
+                      self.state.toDate)
+        stockNodes = [
+            node for node in stockNodes
+            if self.plotted.get(node.getLabel()) != graphState
+        ]
+        if stockNodes:
+            self.scheduler.schedule(lambda isCancelled: self.processNodes(
+                stockNodes, graphState, isCancelled))
+        else:
+            self.scheduler.cancel()
+
+    def processNodes(self, stockNodes, graphState, isCancelled):
+        '''
+            Build the series for stock nodes, run on a worker thread
+
+            Args:
+                stockNodes  (List[StockNode]):  The nodes to process
+                graphState  (tuple):            The option, from and to date
+                isCancelled (callable):         True once the job is stale
+
+            Returns:
+                (tuple(tuple, dict{str: StockSeries}))
+        '''
+        series = {}
         for node in stockNodes:
-            data.append(self.processNode(node))
+            if isCancelled():
+                break
+            series[node.getLabel()] = self.model.getSeries(
+                node.getLabel(), *graphState)
+        return graphState, series
+
+    def plotSeries(self, result):
+        '''
+            Plot the series built by processNodes
 
-    def processNode(self, node):
+            Args:
+                result (tuple(tuple, dict{str: StockSeries})): The graph
+                    state and the series for each label
         '''
-            Process a stock node
+        graphState, series = result
+        for label, stockSeries in series.items():
+            if label not in self.state.selectedStock:
+                continue
+            self.graphController.plotStock(label=label,
+                                           x=stockSeries.getX(),
+                                           y=stockSeries.getY(),
+                                           low=stockSeries.getLow(),
+                                           high=stockSeries.getHigh(),
+                                           volume=stockSeries.getVolume())
+            self.plotted[label] = graphState
+
+    def plotFailed(self, error: str):
+        '''
+            Show the error building the series raised, the stock are left
+            to be replotted on the next change
 
             Args:
-                node (StockNode): A node represnting a stock entry
-        '''
-        data = []    # The data
-        dates = []    # Dates we have data for
-        # Create date boundary objects we can iterate with
-        currentDate = datetime.strptime(self.state.fromDate,
-                                        Constants.PY_DATE_FORMAT)
-        endDate = datetime.strptime(self.state.toDate,
-                                    Constants.PY_DATE_FORMAT)
-
-        # The low/high for that stock
-        low = None
-        high = None
-        buyValue = None
-        # Create a time delta to iterate with
-        delta = timedelta(days=1)
-        while currentDate <= endDate:
-            # We don't have data at weekdays, lets skip,
-            if currentDate.weekday() < 5:
-                # Try and fetch the StockValue object for the currentDate
-                nodeValue = node.getValueForDate(
-                    currentDate.strftime(Constants.PY_DATE_FORMAT))
-                # If we have a value, process, and append with the date
-                if nodeValue is not None:
-                    if buyValue is None:
-                        buyValue = nodeValue.getOHLCAverage()
-
-                    if self.state.option == Constants.GraphOptions.LOW:
-                        value = nodeValue.getLowValue()
-                    elif self.state.option == Constants.GraphOptions.HIGH:
-                        value = nodeValue.getHighValue()
-                    elif self.state.option == Constants.GraphOptions.DIFF:
-                        value = nodeValue.getHighLowDiff()
-                    elif self.state.option == Constants.GraphOptions.AVERAGE:
-                        value = nodeValue.getOHLCAverage()
-                    else:
-                        value = (nodeValue.getOHLCAverage() -
-                                 buyValue) / buyValue * 100
-
-                    if high is None or value > high:
-                        high = value
-                    elif low is None or value < low:
-                        low = value
-                    dates.append(currentDate.timestamp())
-                    data.append(value)
-            # move the currentData by our 1 day delta
-            currentDate += delta
-
-        self.graphController.plotStock(label=node.getLabel(),
-                                       x=dates,
-                                       y=data,
-                                       low=low,
-                                       high=high)
+                error (str): The error message
+        '''
+        self.graphController.showError("Couldn't plot the stock: %s" % error)
 
 
 class MainState:
@@ -5,6 +5,8 @@
     Author:
         Matthew Barber <mfmbarber@gmail.com>
 '''
+from app.lib.recompute_scheduler import RecomputeScheduler
+from app.view.components.labels import BaseLabel
 from app.view.components.profit import (StockProfitValueData)
 from app.view.components.stock import (StockSelector)
 from app.view.layouts import ProfitLayout
@@ -35,7 +37,11 @@ class ProfitController(QWidget):
         self.toDate = toDateString
         self.stockNodes = stockNodes
         self.selectedStock = selectedStock
+        self.scheduler = RecomputeScheduler(parent=self)
+        self.scheduler.result.connect(self.showProfit)
+        self.scheduler.failed.connect(self.showError)
         self.initUI()
+        self.updateProfitDetails()
 
     def initUI(self):
         '''
@@ -46,31 +52,73 @@ class ProfitController(QWidget):
         self.stockSelectorComponent.onChange.connect(
             self.updateSelectedStockByLabel)
 
-        self.profitValue = StockProfitValueData(self.getStockProfit())
+        self.profitValue = StockProfitValueData()
+        # Only shown when the profit couldn't be calculated
+        self.statusComponent = BaseLabel()
+        self.statusComponent.setWordWrap(True)
+        self.statusComponent.hide()
 
-        layout = ProfitLayout(self.stockSelectorComponent, self.profitValue)
+        layout = ProfitLayout(self.stockSelectorComponent, self.profitValue,
+                              self.statusComponent)
         self.setLayout(layout)
 
-    def getStockProfit(self):
+    def getStockProfit(self, node, multiplier: int, fromDate: str,
+                       toDate: str):
         '''
-            A wrapper to get the profit value from either the current node
-            or an empty value
+            A wrapper to get the profit value from a node or an empty value,
+            run on a worker thread
+
+            Args:
+                node        (StockNode):    The node we are analysing
+                multiplier  (int):          The amount of stock units
+                fromDate    (str):          The from (buy) date
+                toDate      (str):          The to (sell) date
 
             Returns:
                 (StockProfit)
         '''
-        empty = StockProfitValueData.createEmptyValue()
-        if self.selectedStock is None:
-            return empty
-        profitValue = self.selectedStock.getProfitValue(
-            self.multiplier, self.fromDate, self.toDate)
-        return empty if profitValue is None else profitValue
+        profitValue = node.getProfitValue(multiplier, fromDate, toDate)
+        if profitValue is None:
+            return StockProfitValueData.createEmptyValue()
+        return profitValue
 
-    def updateProfitDetails(self):
+    def showProfit(self, stockProfit):
         '''
             Update the profit values component
+
+            Args:
+                stockProfit (StockProfit): The profit data
+        '''
+        self.statusComponent.hide()
+        self.profitValue.updateProfitValues(stockProfit)
+
+    def showError(self, error: str):
         '''
-        self.profitValue.updateProfitValues(self.getStockProfit())
+            Show the error calculating the profit raised, over empty values
+
+            Args:
+                error (str): The error message
+        '''
+        self.showProfit(StockProfitValueData.createEmptyValue())
+        self.statusComponent.error(
+            "Couldn't calculate the profit of %s: %s" %
+            (self.selectedStock.getLabel()
+             if self.selectedStock is not None else 'the stock', error))
+        self.statusComponent.show()
+
+    def updateProfitDetails(self):
+        '''
+            Update the profit values component, the profit is calculated in
+            the background once the state settles
+        '''
+        if self.selectedStock is None:
+            self.scheduler.cancel()
+            self.showProfit(StockProfitValueData.createEmptyValue())
+            return
+        node, multiplier = self.selectedStock, self.multiplier
+        fromDate, toDate = self.fromDate, self.toDate
+        self.scheduler.schedule(lambda isCancelled: self.getStockProfit(
+            node, multiplier, fromDate, toDate))
 
     def updateMultiplier(self, multiplier: int):
         '''
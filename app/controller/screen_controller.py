@@ -0,0 +1,101 @@
+'''
+    Screen Controller
+    Controller for the screen widget
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.view.components.screen import StockScreenTable
+from app.view.layouts import ScreenLayout
+from PyQt5.QtWidgets import QWidget
+
+
+class ScreenController(QWidget):
+    '''
+        Screen Controller, ranks every stock in the model between the buy
+        and sell dates
+    '''
+    def __init__(self, model, multiplier, fromDateString, toDateString,
+                 parent=None):
+        '''
+            Initialize the controller and set the instance variables
+
+            Args:
+                model           (Stock):    The stock model
+                multiplier      (int):      The amount of stock units
+                fromDateString  (str):      The from (buy) date
+                toDateString    (str):      The to (sell) date
+        '''
+        super().__init__(parent)
+        self.model = model
+        self.multiplier = multiplier
+        self.fromDate = fromDateString
+        self.toDate = toDateString
+        # The screen is only rebuilt when shown
+        self.stale = True
+        self.initUI()
+
+    def initUI(self):
+        '''
+            Initializes the UI
+        '''
+        self.screenComponent = StockScreenTable()
+        self.setLayout(ScreenLayout(self.screenComponent))
+
+    def updateScreen(self):
+        '''
+            Rebuild the screen now if it's visible, otherwise when it's next
+            shown
+        '''
+        self.stale = True
+        if self.isVisible():
+            self.refresh()
+
+    def refresh(self):
+        '''
+            Screen every stock and update the table
+        '''
+        self.stale = False
+        self.screenComponent.updateTable(
+            self.model.screen(self.fromDate, self.toDate, self.multiplier))
+
+    def showEvent(self, event):
+        '''
+            Rebuild a stale screen as it's shown
+
+            Args:
+                event (QShowEvent): The show event
+        '''
+        if self.stale:
+            self.refresh()
+        super().showEvent(event)
+
+    def updateMultiplier(self, multiplier: int):
+        '''
+            Setter for multiplier instance variable
+
+            Args:
+                multiplier (int): The amount of stock to purchase
+        '''
+        self.multiplier = multiplier
+        self.updateScreen()
+
+    def updateFromDate(self, fromDate: str):
+        '''
+            Update the fromDate in our screen
+
+            Args:
+                fromDate (str): The from (buy) date
+        '''
+        self.fromDate = fromDate
+        self.updateScreen()
+
+    def updateToDate(self, toDate: str):
+        '''
+            Update the toDate in our screen
+
+            Args:
+                toDate (str):  The to (sell) date
+        '''
+        self.toDate = toDate
+        self.updateScreen()
@@ -28,7 +28,7 @@ class StockController(QWidget):
                 stockLabel (List[str]): String array of stock labels
         '''
         super().__init__()
-        self.stockLabels = stockLabels
+        self.stockLabels = list(stockLabels)
         self.stockFilter = ''
         self.selectedStock = []
         self.initUI()
@@ -52,6 +52,16 @@ class StockController(QWidget):
                              self.stockListComponent)
         self.setLayout(layout)
 
+    def addLabels(self, labels):
+        '''
+            Add stock labels, keeping the filter and selection
+
+            Args:
+                labels (List[str]): String array of stock labels
+        '''
+        self.stockListComponent.addValues(labels)
+        self.filterStock(self.stockFilter)
+
     def clearSelected(self):
         '''
             Clear selected stock
@@ -79,10 +89,6 @@ class StockController(QWidget):
                 value (str): Filter value
         '''
         self.stockFilter = value.upper()
-        # Here we are updating the stock label list filtering labels based
-        # on our filter value, we filter out any selected stock labels
-        self.stockListComponent.updateValues(
-            list(
-                filter((lambda label: (self.stockFilter in label and label
-                                       not in self.selectedStock)),
-                       self.stockLabels)), clearSelected)
+        # The list shows the labels matching our filter value after the
+        # selected labels, without rebuilding its rows
+        self.stockListComponent.filterValues(self.stockFilter, clearSelected)
@@ -11,6 +11,11 @@ class Constants:
     DATE_FORMAT = "yyyy-MM-dd"
     PY_DATE_FORMAT = '%Y-%m-%d'
     STOCK_LABEL_REGEX = "[A-Za-z]{0,6}"
+    # The most memory the model spends caching plottable series
+    SERIES_CACHE_BYTES = 64 * 1024 * 1024
+    # Sources smaller than this parse faster serially than the process pool
+    # starts up, pickles and merges them
+    PARALLEL_LOAD_BYTES = 256 * 1024 * 1024
 
     class GraphOptions:
         LOW = 'low'
@@ -18,12 +23,24 @@ class Constants:
         AVERAGE = 'average'
         DIFF = 'diff'
         GAIN = 'gain'
+        SMA = 'sma'
+        EMA = 'ema'
+        BOLLINGER = 'bollinger'
+        RSI = 'rsi'
+        ATR = 'atr'
+        VOLATILITY = 'volatility'
 
         LOW_LABEL = 'Low Price'
         HIGH_LABEL = 'High Price'
         AVERAGE_LABEL = 'Average Price'
         DIFF_LABEL = 'High/Low Price Diff'
         GAIN_LABEL = 'Percentage Gain'
+        SMA_LABEL = 'Moving Average'
+        EMA_LABEL = 'Exponential Average'
+        BOLLINGER_LABEL = 'Bollinger %B'
+        RSI_LABEL = 'RSI'
+        ATR_LABEL = 'Average True Range'
+        VOLATILITY_LABEL = 'Volatility'
 
         @staticmethod
         def all():
@@ -38,7 +55,13 @@ class Constants:
                 Constants.GraphOptions.HIGH,
                 Constants.GraphOptions.AVERAGE,
                 Constants.GraphOptions.DIFF,
-                Constants.GraphOptions.GAIN
+                Constants.GraphOptions.GAIN,
+                Constants.GraphOptions.SMA,
+                Constants.GraphOptions.EMA,
+                Constants.GraphOptions.BOLLINGER,
+                Constants.GraphOptions.RSI,
+                Constants.GraphOptions.ATR,
+                Constants.GraphOptions.VOLATILITY
             ]
 
         @staticmethod
@@ -54,7 +77,13 @@ class Constants:
                 Constants.GraphOptions.HIGH: Constants.GraphOptions.HIGH_LABEL,
                 Constants.GraphOptions.AVERAGE: Constants.GraphOptions.AVERAGE_LABEL,
                 Constants.GraphOptions.DIFF: Constants.GraphOptions.DIFF_LABEL,
-                Constants.GraphOptions.GAIN: Constants.GraphOptions.GAIN_LABEL
+                Constants.GraphOptions.GAIN: Constants.GraphOptions.GAIN_LABEL,
+                Constants.GraphOptions.SMA: Constants.GraphOptions.SMA_LABEL,
+                Constants.GraphOptions.EMA: Constants.GraphOptions.EMA_LABEL,
+                Constants.GraphOptions.BOLLINGER: Constants.GraphOptions.BOLLINGER_LABEL,
+                Constants.GraphOptions.RSI: Constants.GraphOptions.RSI_LABEL,
+                Constants.GraphOptions.ATR: Constants.GraphOptions.ATR_LABEL,
+                Constants.GraphOptions.VOLATILITY: Constants.GraphOptions.VOLATILITY_LABEL
             }
 
         @staticmethod
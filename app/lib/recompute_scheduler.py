@@ -0,0 +1,103 @@
+'''
+    Recompute Scheduler
+    Coalesces bursts of state changes into a single background recompute
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+from .recompute_worker import RecomputeWorker
+
+
+class RecomputeScheduler(QObject):
+    '''
+        Each scheduled job replaces the one before it. Jobs only start once
+        the state has been quiet for the delay, and run on a worker thread.
+        Starting a job cancels any in flight, and only the result of the
+        latest job is emitted, or the error it raised
+
+        Args:
+            delay   (int):      Milliseconds to wait for the state to settle
+            parent  (QObject):  The owner of the scheduler
+    '''
+    result = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, delay: int = 30, parent=None):
+        super(RecomputeScheduler, self).__init__(parent)
+        self.job = None
+        self.generation = 0
+        self.workers = set()
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(delay)
+        self.timer.timeout.connect(self.start)
+
+    def schedule(self, job):
+        '''
+            Schedule a job, restarting the delay
+
+            Args:
+                job (callable): Takes an isCancelled callable, and returns
+                                the result
+        '''
+        self.job = job
+        self.timer.start()
+
+    def cancel(self):
+        '''
+            Drop the scheduled job, and cancel any in flight
+        '''
+        self.job = None
+        self.timer.stop()
+        self.generation += 1
+        for worker in self.workers:
+            worker.cancel()
+
+    def start(self):
+        '''
+            Start the scheduled job on a worker
+        '''
+        if self.job is None:
+            return
+        job = self.job
+        self.cancel()
+        worker = RecomputeWorker(self, job, self.generation)
+        worker.result.connect(self.finish)
+        worker.failed.connect(self.fail)
+        worker.finished.connect(lambda: self.release(worker))
+        self.workers.add(worker)
+        worker.start()
+
+    def finish(self, generation: int, result):
+        '''
+            Emit the result of a job, unless a newer one has been scheduled
+
+            Args:
+                generation  (int):      Identifies the job
+                result      (mixed):    The result of the job
+        '''
+        if generation == self.generation and self.job is None:
+            self.result.emit(result)
+
+    def fail(self, generation: int, error: str):
+        '''
+            Emit the error a job raised, unless a newer one has been
+            scheduled
+
+            Args:
+                generation  (int):  Identifies the job
+                error       (str):  The error message
+        '''
+        if generation == self.generation and self.job is None:
+            self.failed.emit(error)
+
+    def release(self, worker):
+        '''
+            Let go of a finished worker
+
+            Args:
+                worker (RecomputeWorker): The finished worker
+        '''
+        self.workers.discard(worker)
+        worker.deleteLater()
@@ -0,0 +1,48 @@
+'''
+    Recompute Worker
+    A thread used to run a recompute job off the GUI thread
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from PyQt5.QtCore import QThread, pyqtSignal
+
+
+class RecomputeWorker(QThread):
+    '''
+        Worker thread
+
+        Args:
+            parent      (QObject):  The owner of the thread
+            job         (callable): Takes an isCancelled callable, and
+                                    returns the result
+            generation  (int):      Identifies the job
+    '''
+    result = pyqtSignal(int, object)
+    # The generation, and the error the job raised
+    failed = pyqtSignal(int, str)
+
+    def __init__(self, parent, job, generation: int):
+        super(RecomputeWorker, self).__init__(parent)
+        self.job = job
+        self.generation = generation
+
+    def run(self):
+        '''
+            Start the thread
+        '''
+        try:
+            result = self.job(self.isInterruptionRequested)
+        except Exception as error:
+            if not self.isInterruptionRequested():
+                self.failed.emit(self.generation, str(error)
+                                 or type(error).__name__)
+            return
+        if not self.isInterruptionRequested():
+            self.result.emit(self.generation, result)
+
+    def cancel(self):
+        '''
+            Ask the job to stop, the job checks this between steps
+        '''
+        self.requestInterruption()
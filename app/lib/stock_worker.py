@@ -14,16 +14,35 @@ class StockWorker(QThread):
         Worker thread
 
         Args:
-            parent  (QWidget):     The owner of the thread
-            source  (StockSource): A stock source
+            parent      (QWidget):     The owner of the thread
+            source      (StockSource): A stock source
+            useSnapshot (bool):        Read and write the source's snapshot
+            processes   (int):         Processes to parse the source with,
+                                       defaults to one, or one per core
+                                       for large sources
+            progressive (bool):        Publish stock as it's loaded, see
+                                       the partial signal
+            lazy        (bool):        Parse stock as it's first read
     '''
     result = pyqtSignal(object)
+    # The model, and the labels of the stock published to it so far
+    partial = pyqtSignal(object, list)
     progressLabel = pyqtSignal(str)
     progressBytes = pyqtSignal(int)
 
-    def __init__(self, parent, source):
+    def __init__(self,
+                 parent,
+                 source,
+                 useSnapshot=True,
+                 processes=None,
+                 progressive=False,
+                 lazy=False):
         super(StockWorker, self).__init__(parent)
         self.source = source
+        self.useSnapshot = useSnapshot
+        self.processes = processes
+        self.progressive = progressive
+        self.lazy = lazy
 
     def run(self):
         '''
@@ -36,7 +55,14 @@ class StockWorker(QThread):
         model.currentLoadBytes.connect(
             lambda bytes: self.progressBytes.emit(bytes)
         )
-        model.load(self.source)
+        model.loadedLabels.connect(
+            lambda labels: self.partial.emit(model, labels)
+        )
+        model.load(self.source,
+                   useSnapshot=self.useSnapshot,
+                   processes=self.processes,
+                   progressive=self.progressive,
+                   lazy=self.lazy)
         self.result.emit(model)
 
     def stop(self):
@@ -5,13 +5,21 @@
     Author:
         Matthew Barber <mfmbarber@gmail.com>
 '''
-from datetime import datetime
 from app.lib.constants import Constants
-from PyQt5.QtCore import QObject, pyqtSignal
-from .stock_node import StockNode, StockValue
-
-
-class Stock(QObject):
+from functools import partial
+import os
+import numpy as np
+from .stock_cache import StockCache
+from .stock_date import StockDate
+from .stock_node import StockNode
+from .stock_panel import StockPanel
+from .stock_profit_table import StockProfitTable
+from .stock_signal import StockSignal
+from .stock_snapshot import StockSnapshot
+from .stock_source_index import StockSourceIndex
+
+
+class Stock:
     '''
         Stock model representing stock
         Args:
@@ -32,56 +40,218 @@ class Stock(QObject):
     # Used during loading the data to provide progress
     currentLabel = None
     loadedBytes = 0
-    currentLoadLabel = pyqtSignal(str)
-    currentLoadBytes = pyqtSignal(int)
 
-    def __init__(self, parent=None):
-        super(Stock, self).__init__(parent)
+    def __init__(self):
+        # Signals (str) for the label, and (int) for the bytes loaded
+        self.currentLoadLabel = StockSignal()
+        self.currentLoadBytes = StockSignal()
+        # Signals (list) the labels published by a progressive load
+        self.loadedLabels = StockSignal()
+        # Series derived from the loaded data, cleared when it changes
+        self.seriesCache = StockCache(Constants.SERIES_CACHE_BYTES)
+        # Every stock on the trading calendar, built on first use
+        self.panel = None
+
+    def load(self,
+             stock_source,
+             useSnapshot: bool = True,
+             processes: int = 1,
+             progressive: bool = False,
+             lazy: bool = False):
+        '''
+            Load the data into the model, from a snapshot of the source when
+            we have an up to date one, otherwise parsing the source and
+            saving a snapshot for next time
+
+            A progressive load builds the nodes aside, and after each block
+            publishes a new node for every stock the source has moved past.
+            A published node is never changed, so the model can be used from
+            another thread while it loads. Sources not grouped by stock are
+            published once they're loaded, rather than republishing every
+            stock after each block
+
+            A lazy load, when there's no up to date snapshot, builds the
+            nodes from the source's index instead, each node parsing its
+            own rows when it's first read
+
+            Args:
+                stock_source    (StockSource):  The source of our data
+                useSnapshot     (bool):         Read and write snapshots
+                processes       (int):          Processes to parse with,
+                                                None for one per core when
+                                                the source is large
+                progressive     (bool):         Publish stock as it's loaded
+                lazy            (bool):         Parse stock as it's read
+        '''
+        self.stockData = {}
+        self.seriesCache.clear()
+        self.panel = None
+        snapshot = StockSnapshot.fromSource(
+            stock_source) if useSnapshot else None
+        if snapshot is not None and snapshot.isValid():
+            try:
+                snapshot.read(self)
+                self.loadedBytes = stock_source.getResourceSize()
+                self.currentLoadBytes.emit(self.loadedBytes)
+                return
+            except (OSError, ValueError):
+                self.stockData = {}
+        index = StockSourceIndex.fromSource(stock_source) if lazy else None
+        if index is not None:
+            try:
+                self.loadIndex(stock_source, index)
+                return
+            except (OSError, ValueError):
+                self.stockData = {}
+        if processes is None:
+            large = (stock_source.getResourceSize() >=
+                     Constants.PARALLEL_LOAD_BYTES)
+            processes = (os.cpu_count() or 1) if large else 1
+        # genChunk is a generator that will yield blocks of typed columns
+        tables = stock_source.genChunk(
+        ) if processes <= 1 else stock_source.genChunkParallel(processes)
+        nodes = {} if progressive else self.stockData
+        # The stock loaded since they were last published, in order
+        loading = {}
+        grouped = True
+        for table in tables:
+            self.loadedBytes += stock_source.getChunkSize()
+            labels = self.loadTable(table, nodes)
+            if not progressive or not labels:
+                continue
+            if grouped and any(label in self.stockData for label in labels):
+                # A published stock has more rows, so the source isn't
+                # grouped by stock, the rest is published once it's loaded
+                grouped = False
+            loading.update(dict.fromkeys(labels))
+            if grouped:
+                # Only the last stock of a block can carry on into the next
+                last = table.names[-1].decode('utf-8')
+                complete = [label for label in loading if label != last]
+                if complete:
+                    self.publish(complete, nodes)
+                loading = {last: None}
+        if loading:
+            self.publish(list(loading), nodes)
+        for node in self.stockData.values():
+            node.mergePending()
+        if snapshot is not None:
+            try:
+                snapshot.write(self)
+            except OSError:
+                # The snapshot is only a cache, we can carry on without it
+                pass
+
+    def loadIndex(self, stock_source, index):
+        '''
+            Load the stock names and bounds from the source's index, building
+            the index first if it's out of date. The nodes load their rows
+            from the source when they're first read
 
-    def load(self, stock_source):
+            Args:
+                stock_source    (StockSourceFile):  The source of our data
+                index           (StockSourceIndex): The index of the source
         '''
-            Load the data into the model
+        if not index.read():
+            index.build(stock_source, self.currentLoadBytes.emit)
+            try:
+                index.write()
+            except OSError:
+                # Like the snapshot, the index is only a cache
+                pass
+        if not index.isGrouped():
+            raise ValueError("The source isn't grouped by stock")
+        for label, entry in index.getEntries().items():
+            node = self.createStockNode(label)
+            node.setLoader(
+                partial(stock_source.parseRanges,
+                        [tuple(byteRange) for byteRange in entry["ranges"]]))
+            self.insertStockNode(node)
+        bounds = index.getBounds()
+        if bounds is not None:
+            self.updateBounds(StockDate.toDatetime(bounds["earliest"]),
+                              StockDate.toDatetime(bounds["latest"]),
+                              bounds["lowest"], bounds["highest"])
+        self.loadedBytes = stock_source.getResourceSize()
+        self.currentLoadBytes.emit(self.loadedBytes)
+
+    def loadTable(self, table, nodes=None):
+        '''
+            Load a block of rows into the model
 
             Args:
-                stock_source (StockSource): The source of our data
+                table   (StockTable):               The rows to load
+                nodes   (dict{str, StockNode}):     The nodes to load into,
+                                                    defaults to the model's
 
+            Returns:
+                (List[str]) The labels of the stock in the block
         '''
-        self.stockData = {}
-        # TODO : validate headers
-        valueFields = ["open", "high", "low", "close"]
-        # genRow is a generator that will yield rows till it completes
-        for row in stock_source.genRow():
-            self.loadedBytes += stock_source.getLineSize()
-            label = row["name"]
-            date_string = row["date"]
+        if not table.getSize():
+            return []
+        if nodes is None:
+            nodes = self.stockData
+        self.seriesCache.clear()
+        self.panel = None
+        labels = []
+        for label, rows in table.genGroups():
             # create and insert a stock node if it doesnt exist
-            if label not in self.stockData:
-                self.insertStockNode(self.createStockNode(label))
-            # cast the string values
-            for field in valueFields:
-                if not row[field]:
-                    row[field] = 0.0
-                else:
-                    row[field] = float(row[field])
-
+            if label not in nodes:
+                nodes[label] = self.createStockNode(label)
             # update the node
-            self.stockData[label].addData(
-                date_string,
-                StockValue(row["open"], row["high"], row["low"], row["close"]))
-            # track the global bounds
-            date = datetime.strptime(date_string, Constants.PY_DATE_FORMAT)
-            if self.earliestDate is None or date < self.earliestDate:
-                self.earliestDate = date
-            elif self.latestDate is None or date > self.latestDate:
-                self.latestDate = date
-            if self.highestValue is None or row["high"] > self.highestValue:
-                self.highestValue = row["high"]
-            elif self.lowestValue is None or row["low"] < self.lowestValue:
-                self.lowestValue = row["low"]
-            if self.currentLabel is None or label != self.currentLabel:
-                self.currentLabel = label
-                self.currentLoadLabel.emit(label)
-                self.currentLoadBytes.emit(self.loadedBytes)
+            nodes[label].addColumns(*rows.getColumns())
+            labels.append(label)
+        label = labels[-1]
+        # track the global bounds
+        self.updateBounds(StockDate.toDatetime(table.dates.min()),
+                          StockDate.toDatetime(table.dates.max()),
+                          float(table.low.min()), float(table.high.max()))
+        if self.currentLabel is None or label != self.currentLabel:
+            self.currentLabel = label
+            self.currentLoadLabel.emit(label)
+        self.currentLoadBytes.emit(self.loadedBytes)
+        return labels
+
+    def publish(self, labels, nodes):
+        '''
+            Publish stock built aside during a progressive load. Each is
+            published as a new node sharing the merged columns, which are
+            never written to, replacing any earlier node for the stock
+
+            Args:
+                labels  (List[str]):                The stock to publish
+                nodes   (dict{str, StockNode}):     The nodes being loaded
+        '''
+        for label in labels:
+            node = nodes[label]
+            node.mergePending()
+            published = self.createStockNode(label)
+            published.setColumns(*node.getColumns())
+            # Replacing the entry is atomic, readers see the old node or
+            # the new one
+            self.stockData[label] = published
+        self.panel = None
+        self.loadedLabels.emit(labels)
+
+    def updateBounds(self, earliestDate, latestDate, lowestValue: float,
+                     highestValue: float):
+        '''
+            Widen the global bounds to include new values
+
+            Args:
+                earliestDate    (datetime): The earliest date seen
+                latestDate      (datetime): The latest date seen
+                lowestValue     (float):    The lowest value seen
+                highestValue    (float):    The highest value seen
+        '''
+        if self.earliestDate is None or earliestDate < self.earliestDate:
+            self.earliestDate = earliestDate
+        if self.latestDate is None or latestDate > self.latestDate:
+            self.latestDate = latestDate
+        if self.highestValue is None or highestValue > self.highestValue:
+            self.highestValue = highestValue
+        if self.lowestValue is None or lowestValue < self.lowestValue:
+            self.lowestValue = lowestValue
 
     def createStockNode(self, label: str):
         '''
@@ -125,10 +295,193 @@ class Stock(QObject):
         '''
             Return all stock nodes for a given date
 
+            Args:
+                date (str): Date in yyyy-mm-dd format
+
             Returns:
                 (List[StockNode])
         '''
-        raise RuntimeError("Not implemented")
+        crossSection = self.getCrossSection(date)
+        if crossSection is None:
+            return []
+        return [
+            self.stockData[label]
+            for label in crossSection.findLabels().tolist()
+            if label in self.stockData
+        ]
+
+    def getPanel(self):
+        '''
+            Get every stock's values on the trading calendar, the panel is
+            built on first use and rebuilt after the model changes
+
+            Returns:
+                (StockPanel)
+        '''
+        panel = self.panel
+        if panel is None:
+            panel = self.panel = StockPanel.fromNodes(
+                list(self.stockData.values()))
+        return panel
+
+    def getCrossSection(self, date: str):
+        '''
+            Get every stock's values on a date, for cross sectional queries
+            such as the top movers, the high and low, and the breadth
+
+            Args:
+                date (str): Date in yyyy-mm-dd format
+
+            Returns:
+                (StockCrossSection || None) None when it isn't a trading day
+        '''
+        return self.getPanel().getCrossSection(date)
+
+    def getSeries(self, label: str, option: str, fromDate: str,
+                  toDate: str):
+        '''
+            Get a plottable series for a stock, series are cached so moving
+            back to a recent option or date range doesn't rebuild them
+
+            Args:
+                label       (str):  The stock label
+                option      (str):  Check Constants.GraphOptions for enumerable
+                fromDate    (str):  The from date
+                toDate      (str):  The to date
+
+            Returns:
+                (StockSeries || None)
+        '''
+        node = self.findByName(label)
+        if node is None:
+            return None
+        key = (label, option, fromDate, toDate)
+        entry = self.seriesCache.get(key)
+        # The node is kept with its series, a stock republished while
+        # loading has a new node and so misses
+        if entry is not None and entry[0] is node:
+            return entry[1]
+        series = node.getSeries(option, fromDate, toDate)
+        self.seriesCache.put(key, (node, series), series.getSize())
+        return series
+
+    def getProfitValues(self, labels, buyDates, sellDates, amounts):
+        '''
+            Calculate the profit metrics for many scenarios at once, each
+            argument is an array with a row per scenario, or a single value
+            shared by every row
+
+            Args:
+                labels      (List[str]):            Stock labels
+                buyDates    (List[str] || ndarray): Buy dates (yyyy-mm-dd)
+                                                    or day numbers
+                sellDates   (List[str] || ndarray): Sell dates (yyyy-mm-dd)
+                                                    or day numbers
+                amounts     (List[int] || ndarray): Amounts of stock
+
+            Returns:
+                (StockProfitTable)
+        '''
+        labels = np.asarray(labels, dtype=str)
+        size = len(labels)
+        buyDates = np.broadcast_to(StockDate.toDayNumbers(buyDates), size)
+        sellDates = np.broadcast_to(StockDate.toDayNumbers(sellDates), size)
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), size)
+        buy = [np.full(size, np.nan) for _ in range(3)]
+        sell = [np.full(size, np.nan) for _ in range(3)]
+        volumes = [np.full(size, np.nan) for _ in range(3)]
+        # Group the rows by label, so each node is searched once
+        uniqueLabels, inverse = np.unique(labels, return_inverse=True)
+        order = np.argsort(inverse, kind='stable')
+        bounds = np.searchsorted(inverse[order],
+                                 np.arange(len(uniqueLabels) + 1))
+        for index, label in enumerate(uniqueLabels):
+            node = self.findByName(str(label))
+            if node is None:
+                continue
+            rows = order[bounds[index]:bounds[index + 1]]
+            dates, open, high, low, close, volume = node.getColumns()
+            ends = []
+            for days, values in ((buyDates, buy), (sellDates, sell)):
+                found, positions = node.findDays(days[rows])
+                ends.append(np.where(found, positions, -1))
+                foundRows = rows[found]
+                positions = positions[found]
+                values[0][foundRows] = low[positions]
+                values[1][foundRows] = high[positions]
+                values[2][foundRows] = (open[positions] + high[positions]
+                                        + low[positions]
+                                        + close[positions]) / 4
+            self.setVolumeValues(node, rows, ends[0], ends[1] + 1, volumes)
+        return StockProfitTable.calculate(labels, buyDates, sellDates,
+                                          amounts, buy, sell, volumes)
+
+    def setVolumeValues(self, node, rows, starts, ends, volumes):
+        '''
+            Set the days, volume and turnover between row positions of a
+            node, from its cumulative sums, leaving NaN where the range is
+            empty or a position wasn't found
+
+            Args:
+                node    (StockNode):        The stock node
+                rows    (ndarray[int]):     The scenario rows to set
+                starts  (ndarray[int]):     The first node row, -1 if missing
+                ends    (ndarray[int]):     The node row to stop before, 0 if
+                                            missing
+                volumes (List[ndarray]):    The days, volume and turnover
+        '''
+        valid = (starts >= 0) & (ends > starts)
+        if not valid.any():
+            return
+        rows, starts, ends = rows[valid], starts[valid], ends[valid]
+        cumulative = node.getCumulativeValues()
+        volumes[0][rows] = ends - starts
+        for values, row in zip(volumes[1:],
+                               (StockNode.VOLUME, StockNode.TURNOVER)):
+            values[rows] = cumulative[row, ends] - cumulative[row, starts]
+
+    def screen(self, fromDate: str, toDate: str, amount: int = 1):
+        '''
+            Calculate the profit metrics of every stock between two dates,
+            searching each node once for both dates
+
+            Args:
+                fromDate    (str):  The from (buy) date
+                toDate      (str):  The to (sell) date
+                amount      (int):  The amount of stock
+
+            Returns:
+                (StockProfitTable)
+        '''
+        nodes = list(self.stockData.values())
+        size = len(nodes)
+        days = StockDate.toDayNumbers([fromDate, toDate])
+        buy = [np.full(size, np.nan) for _ in range(3)]
+        sell = [np.full(size, np.nan) for _ in range(3)]
+        volumes = [np.full(size, np.nan) for _ in range(3)]
+        for index, node in enumerate(nodes):
+            found, rows = node.findDays(days)
+            if not found.all():
+                continue
+            dates, open, high, low, close, volume = node.getColumns()
+            rows = rows.tolist()
+            for row, values in zip(rows, (buy, sell)):
+                values[0][index] = low[row]
+                values[1][index] = high[row]
+                values[2][index] = (open[row] + high[row] + low[row] +
+                                    close[row]) / 4
+            start, end = rows[0], rows[1] + 1
+            if end > start:
+                cumulative = node.getCumulativeValues()
+                volumes[0][index] = end - start
+                volumes[1][index] = (cumulative[StockNode.VOLUME, end] -
+                                     cumulative[StockNode.VOLUME, start])
+                volumes[2][index] = (cumulative[StockNode.TURNOVER, end] -
+                                     cumulative[StockNode.TURNOVER, start])
+        return StockProfitTable.calculate(
+            np.array([node.getLabel() for node in nodes], dtype=str),
+            np.full(size, days[0]), np.full(size, days[1]),
+            np.full(size, amount, dtype=np.float64), buy, sell, volumes)
 
     def selectAll(self):
         '''
@@ -146,7 +499,7 @@ class Stock(QObject):
             Returns:
                 (List[str])
         '''
-        return self.stockData.keys()
+        return list(self.stockData.keys())
 
     def getEarliestDate(self):
         '''
@@ -0,0 +1,89 @@
+'''
+    Stock Cache
+    A bounded least recently used cache for derived stock data
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from collections import OrderedDict
+from threading import Lock
+
+
+class StockCache:
+    '''
+        Holds derived values (like series) under a key, evicting the least
+        recently used once the total size is over a cap. Series are built on
+        worker threads, so access is locked
+
+        Args:
+            capacity (int): The most bytes to hold
+    '''
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.size = 0
+        self.entries = OrderedDict()
+        self.lock = Lock()
+
+    def get(self, key):
+        '''
+            Get a value, marking it as recently used
+
+            Args:
+                key (tuple): The key of the value
+
+            Returns:
+                (mixed || None)
+        '''
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size: int):
+        '''
+            Add a value, evicting the least recently used values to make
+            room. Values bigger than the cap aren't kept
+
+            Args:
+                key     (tuple):    The key of the value
+                value   (mixed):    The value
+                size    (int):      The size of the value in bytes
+        '''
+        with self.lock:
+            if key in self.entries:
+                self.size -= self.entries.pop(key)[1]
+            if size > self.capacity:
+                return
+            self.entries[key] = (value, size)
+            self.size += size
+            while self.size > self.capacity:
+                _, (_, evicted) = self.entries.popitem(last=False)
+                self.size -= evicted
+
+    def clear(self):
+        '''
+            Remove every value
+        '''
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def getSize(self):
+        '''
+            Getter for the bytes held
+
+            Returns:
+                (int)
+        '''
+        return self.size
+
+    def __len__(self):
+        '''
+            Magic method (for len(...) calls)
+
+            Returns:
+                (int)
+        '''
+        return len(self.entries)
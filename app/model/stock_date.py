@@ -0,0 +1,119 @@
+'''
+    Stock Date
+    Helpers for converting between date strings and day numbers
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.lib.constants import Constants
+from datetime import date, datetime, timedelta
+import numpy as np
+
+
+class StockDate:
+    '''
+        Dates are stored as day numbers, the count of days since the epoch,
+        this keeps them compact and sortable as int32 columns
+    '''
+    EPOCH = date(1970, 1, 1)
+    DTYPE = np.int32
+
+    @staticmethod
+    def toDayNumber(dateString: str):
+        '''
+            Convert a date string to a day number
+
+            Args:
+                dateString (str): Date in yyyy-mm-dd format
+
+            Returns:
+                (int)
+        '''
+        return StockDate.fromDate(
+            datetime.strptime(dateString, Constants.PY_DATE_FORMAT))
+
+    @staticmethod
+    def toDayNumbers(values):
+        '''
+            Convert date strings (or day numbers) to a day number array in
+            one pass
+
+            Args:
+                values (List[str] || ndarray): Dates in yyyy-mm-dd format
+
+            Returns:
+                (ndarray[int32])
+        '''
+        values = np.asarray(values)
+        if values.dtype.kind in 'iu':
+            return values.astype(StockDate.DTYPE)
+        return values.astype('datetime64[D]').astype(StockDate.DTYPE)
+
+    @staticmethod
+    def fromDate(value):
+        '''
+            Convert a date (or datetime) to a day number
+
+            Args:
+                value (date): The date to convert
+
+            Returns:
+                (int)
+        '''
+        if isinstance(value, datetime):
+            value = value.date()
+        return (value - StockDate.EPOCH).days
+
+    @staticmethod
+    def toDateString(dayNumber: int):
+        '''
+            Convert a day number to a date string
+
+            Args:
+                dayNumber (int): Days since the epoch
+
+            Returns:
+                (str)
+        '''
+        return StockDate.toDate(dayNumber).strftime(Constants.PY_DATE_FORMAT)
+
+    @staticmethod
+    def toDateStrings(dayNumbers):
+        '''
+            Convert day numbers to date strings in one pass
+
+            Args:
+                dayNumbers (ndarray[int]): Days since the epoch
+
+            Returns:
+                (List[str])
+        '''
+        return np.datetime_as_string(
+            np.asarray(dayNumbers).astype('datetime64[D]')).tolist()
+
+    @staticmethod
+    def toDate(dayNumber: int):
+        '''
+            Convert a day number to a date
+
+            Args:
+                dayNumber (int): Days since the epoch
+
+            Returns:
+                (date)
+        '''
+        return StockDate.EPOCH + timedelta(days=int(dayNumber))
+
+    @staticmethod
+    def toDatetime(dayNumber: int):
+        '''
+            Convert a day number to a datetime (at midnight)
+
+            Args:
+                dayNumber (int): Days since the epoch
+
+            Returns:
+                (datetime)
+        '''
+        return datetime.combine(StockDate.toDate(dayNumber),
+                                datetime.min.time())
@@ -0,0 +1,83 @@
+'''
+    Stock Index
+    A search index over stock labels
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+
+
+class StockIndex:
+    '''
+        Maps every substring of every label (up to a maximum length) to the
+        positions of the labels containing it, so a search is a lookup
+        rather than a scan of all labels
+
+        Args:
+            labels (List[str]): The stock labels to index
+    '''
+
+    # Longer searches are narrowed by their leading substring, then checked
+    MAX_SUBSTRING = 8
+
+    def __init__(self, labels=None):
+        self.labels = []
+        self.positions = {}
+        self.substrings = {}
+        self.addLabels(labels or [])
+
+    def addLabels(self, labels):
+        '''
+            Add labels to the index, any already indexed are skipped
+
+            Args:
+                labels (List[str]): The stock labels to add
+        '''
+        for label in labels:
+            if label in self.positions:
+                continue
+            position = len(self.labels)
+            self.labels.append(label)
+            self.positions[label] = position
+            substrings = {
+                label[start:end]
+                for start in range(len(label))
+                for end in range(start + 1,
+                                 min(start + self.MAX_SUBSTRING, len(label)) +
+                                 1)
+            }
+            for substring in substrings:
+                self.substrings.setdefault(substring, []).append(position)
+
+    def getLabels(self):
+        '''
+            Return all the labels, in the order they were added
+
+            Returns:
+                (List[str])
+        '''
+        return self.labels
+
+    def search(self, value: str):
+        '''
+            Find the labels containing a value, labels starting with the
+            value come first, otherwise labels keep the order they were added
+
+            Args:
+                value (str): The value to search for
+
+            Returns:
+                (List[str])
+        '''
+        if not value:
+            return list(self.labels)
+        positions = self.substrings.get(value[:self.MAX_SUBSTRING], [])
+        labels = [self.labels[position] for position in positions]
+        if len(value) > self.MAX_SUBSTRING:
+            labels = [label for label in labels if value in label]
+        prefixed = [label for label in labels if label.startswith(value)]
+        if len(prefixed) == len(labels):
+            return prefixed
+        return prefixed + [
+            label for label in labels if not label.startswith(value)
+        ]
@@ -0,0 +1,231 @@
+'''
+    Stock Indicators
+    Technical indicators over a stock's columns
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.lib.constants import Constants
+import numpy as np
+
+
+class StockIndicators:
+    '''
+        Sliding window kernels for technical indicators, each one pass over
+        the columns. Rows before an indicator's first full window are NaN
+    '''
+
+    # Trading days in a year, to annualize volatility
+    TRADING_DAYS = 252
+
+    # The window used for each indicator when plotted
+    WINDOWS = {
+        Constants.GraphOptions.SMA: 20,
+        Constants.GraphOptions.EMA: 20,
+        Constants.GraphOptions.BOLLINGER: 20,
+        Constants.GraphOptions.RSI: 14,
+        Constants.GraphOptions.ATR: 14,
+        Constants.GraphOptions.VOLATILITY: 20
+    }
+
+    @staticmethod
+    def calculate(name: str, window: int, high, low, close):
+        '''
+            Calculate an indicator
+
+            Args:
+                name    (str):              Check StockIndicators.WINDOWS
+                window  (int):              The window in days
+                high    (ndarray[float]):   The high values
+                low     (ndarray[float]):   The low values
+                close   (ndarray[float]):   The close values
+
+            Returns:
+                (ndarray[float])
+        '''
+        if name == Constants.GraphOptions.SMA:
+            return StockIndicators.sma(close, window)
+        if name == Constants.GraphOptions.EMA:
+            return StockIndicators.ema(close, window)
+        if name == Constants.GraphOptions.BOLLINGER:
+            return StockIndicators.bollinger(close, window)
+        if name == Constants.GraphOptions.RSI:
+            return StockIndicators.rsi(close, window)
+        if name == Constants.GraphOptions.ATR:
+            return StockIndicators.atr(high, low, close, window)
+        if name == Constants.GraphOptions.VOLATILITY:
+            return StockIndicators.volatility(close, window)
+        raise IndexError("%s isn't an indicator" % name)
+
+    @staticmethod
+    def sma(values, window: int):
+        '''
+            Simple moving average, from the difference of a running sum
+
+            Args:
+                values  (ndarray[float]):   The values
+                window  (int):              The window in days
+
+            Returns:
+                (ndarray[float])
+        '''
+        result = np.full(len(values), np.nan)
+        if len(values) < window:
+            return result
+        sums = np.cumsum(np.concatenate(([0.0], values)))
+        result[window - 1:] = (sums[window:] - sums[:-window]) / window
+        return result
+
+    @staticmethod
+    def rollingStd(values, window: int):
+        '''
+            Rolling (population) standard deviation, from the difference of
+            running sums of the values and their squares
+
+            Args:
+                values  (ndarray[float]):   The values
+                window  (int):              The window in days
+
+            Returns:
+                (ndarray[float])
+        '''
+        # Centre the values so the squares don't lose precision
+        values = values - np.mean(values) if len(values) else values
+        mean = StockIndicators.sma(values, window)
+        squares = StockIndicators.sma(values * values, window)
+        return np.sqrt(np.maximum(squares - mean * mean, 0))
+
+    @staticmethod
+    def ema(values, window: int):
+        '''
+            Exponential moving average, seeded with the first window's mean
+
+            Args:
+                values  (ndarray[float]):   The values
+                window  (int):              The window in days
+
+            Returns:
+                (ndarray[float])
+        '''
+        return StockIndicators.smooth(values, window, 2 / (window + 1))
+
+    @staticmethod
+    def smooth(values, window: int, alpha: float):
+        '''
+            Exponential smoothing, seeded with the first window's mean
+
+            Args:
+                values  (ndarray[float]):   The values
+                window  (int):              The window in days
+                alpha   (float):            The weight of each new value
+
+            Returns:
+                (ndarray[float])
+        '''
+        result = np.full(len(values), np.nan)
+        if len(values) < window:
+            return result
+        average = float(np.mean(values[:window]))
+        smoothed = [average]
+        for value in values[window:].tolist():
+            average += alpha * (value - average)
+            smoothed.append(average)
+        result[window - 1:] = smoothed
+        return result
+
+    @staticmethod
+    def bollinger(values, window: int, deviations: float = 2):
+        '''
+            Bollinger %B, where the value sits between the bands a number of
+            standard deviations either side of the moving average (0 at the
+            lower band, 100 at the upper)
+
+            Args:
+                values      (ndarray[float]):   The values
+                window      (int):              The window in days
+                deviations  (float):            The width of the bands
+
+            Returns:
+                (ndarray[float])
+        '''
+        mean = StockIndicators.sma(values, window)
+        width = 2 * deviations * StockIndicators.rollingStd(values, window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result = (values - (mean - width / 2)) / width * 100
+        # A flat window has no bands, so sits in the middle
+        result[width == 0] = 50
+        return result
+
+    @staticmethod
+    def rsi(values, window: int):
+        '''
+            Relative strength index, with Wilder's smoothing of the gains and
+            losses
+
+            Args:
+                values  (ndarray[float]):   The values
+                window  (int):              The window in days
+
+            Returns:
+                (ndarray[float])
+        '''
+        result = np.full(len(values), np.nan)
+        if len(values) <= window:
+            return result
+        changes = np.diff(values)
+        gains = StockIndicators.smooth(np.maximum(changes, 0), window,
+                                       1 / window)
+        losses = StockIndicators.smooth(np.maximum(-changes, 0), window,
+                                        1 / window)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            result[1:] = 100 - 100 / (1 + gains / losses)
+        # No losses in the window, the strength is at its highest
+        result[1:][(losses == 0) & (gains > 0)] = 100
+        result[1:][(losses == 0) & (gains == 0)] = 50
+        return result
+
+    @staticmethod
+    def atr(high, low, close, window: int):
+        '''
+            Average true range, with Wilder's smoothing
+
+            Args:
+                high    (ndarray[float]):   The high values
+                low     (ndarray[float]):   The low values
+                close   (ndarray[float]):   The close values
+                window  (int):              The window in days
+
+            Returns:
+                (ndarray[float])
+        '''
+        ranges = high - low
+        if len(close) > 1:
+            previous = close[:-1]
+            ranges[1:] = np.maximum.reduce([
+                ranges[1:],
+                np.abs(high[1:] - previous),
+                np.abs(low[1:] - previous)
+            ])
+        return StockIndicators.smooth(ranges, window, 1 / window)
+
+    @staticmethod
+    def volatility(values, window: int):
+        '''
+            Rolling volatility, the standard deviation of the daily log
+            returns annualized as a percentage
+
+            Args:
+                values  (ndarray[float]):   The values
+                window  (int):              The window in days
+
+            Returns:
+                (ndarray[float])
+        '''
+        result = np.full(len(values), np.nan)
+        if len(values) <= window:
+            return result
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns = np.diff(np.log(values))
+        result[1:] = (StockIndicators.rollingStd(returns, window) *
+                      np.sqrt(StockIndicators.TRADING_DAYS) * 100)
+        return result
@@ -6,16 +6,44 @@
         Matthew Barber <mfmbarber@gmail.com>
 '''
 from app.lib.constants import Constants
-from datetime import datetime, timedelta
+from array import array
+from threading import Lock
+from .stock_date import StockDate
+from .stock_indicators import StockIndicators
+from .stock_series import StockSeries
+from .stock_volume import StockVolume
+from .stock_window import StockWindow
+import numpy as np
 
 
 class StockNode:
     '''
         A stock node represents a stock
+
+        The daily values are held as contiguous columns sorted by date, a
+        day number column (int32) and the open/high/low/close/volume
+        (float64) columns, rows added through addData are buffered until first read.
+        A node given a loader is empty until first read, when it loads its
+        columns once
     '''
+    # The rows of the volume and turnover in getCumulativeValues
+    VOLUME = 4
+    TURNOVER = 5
+
     def __init__(self, label):
-        self.data = {}
         self.label = label
+        self.dates = np.empty(0, dtype=StockDate.DTYPE)
+        self.open = np.empty(0)
+        self.high = np.empty(0)
+        self.low = np.empty(0)
+        self.close = np.empty(0)
+        self.volume = np.empty(0)
+        self.pending = []
+        self.buffer = None
+        self.cumulative = None
+        self.indicators = {}
+        self.loader = None
+        self.lock = Lock()
 
     def getLabel(self):
         '''
@@ -34,10 +62,124 @@ class StockNode:
                 date        (str):          The date for the data
                 stock_value (StockValue):   The StockValue for the data
         '''
-        if date not in self.data:
-            self.data[date] = stock_value
-        else:
-            raise ValueError("No two entries can exist for the same date")
+        if self.buffer is None:
+            self.buffer = (array('i'), array('d'), array('d'), array('d'),
+                           array('d'), array('d'))
+        dates, open, high, low, close, volume = self.buffer
+        dates.append(StockDate.toDayNumber(date))
+        open.append(stock_value.getOpeningValue())
+        high.append(stock_value.getHighValue())
+        low.append(stock_value.getLowValue())
+        close.append(stock_value.getCloseValue())
+        volume.append(stock_value.getVolume())
+
+    def addColumns(self, dates, open, high, low, close, volume):
+        '''
+            Add a block of rows to the stock node as columns
+
+            Args:
+                dates   (ndarray[int32]):   Day numbers for the rows
+                open    (ndarray[float]):   The opening prices
+                high    (ndarray[float]):   The high prices
+                low     (ndarray[float]):   The low prices
+                close   (ndarray[float]):   The close prices
+                volume  (ndarray[float]):   The volumes traded
+        '''
+        self.pending.append((dates, open, high, low, close, volume))
+
+    def setLoader(self, loader):
+        '''
+            Defer loading the stock node until it's first read
+
+            Args:
+                loader (callable): Returns the date and value columns, in the
+                                   order addColumns takes
+        '''
+        self.loader = loader
+
+    def isLoaded(self):
+        '''
+            Check whether the stock node has loaded its columns
+
+            Returns:
+                (bool)
+        '''
+        return self.loader is None
+
+    def setColumns(self, dates, open, high, low, close, volume):
+        '''
+            Replace the data of the stock node with columns already sorted
+            by date, such as views onto a snapshot
+
+            Args:
+                dates   (ndarray[int32]):   Sorted day numbers for the rows
+                open    (ndarray[float]):   The opening prices
+                high    (ndarray[float]):   The high prices
+                low     (ndarray[float]):   The low prices
+                close   (ndarray[float]):   The close prices
+                volume  (ndarray[float]):   The volumes traded
+        '''
+        self.pending = []
+        self.buffer = None
+        self.loader = None
+        self.cumulative = None
+        self.indicators = {}
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    def getColumns(self):
+        '''
+            Return the date and value columns
+
+            Returns:
+                (tuple(ndarray))
+        '''
+        self.mergePending()
+        return (self.dates, self.open, self.high, self.low, self.close,
+                self.volume)
+
+    def getSize(self):
+        '''
+            Return the number of days we have data for
+
+            Returns:
+                int
+        '''
+        self.mergePending()
+        return len(self.dates)
+
+    def getDates(self):
+        '''
+            Return the sorted day numbers we have data for
+
+            Returns:
+                ndarray[int32]
+        '''
+        self.mergePending()
+        return self.dates
+
+    def getIndexRange(self, fromDate: str, toDate: str, includeTo=True):
+        '''
+            Resolve a date range to row positions with a binary search
+
+            Args:
+                fromDate    (str):  The from date (inclusive)
+                toDate      (str):  The to date
+                includeTo   (bool): Whether the to date is included
+
+            Returns:
+                (tuple(int, int)) The first row, and the row to stop before
+        '''
+        self.mergePending()
+        start = np.searchsorted(self.dates, StockDate.toDayNumber(fromDate))
+        end = np.searchsorted(self.dates,
+                              StockDate.toDayNumber(toDate),
+                              side='right' if includeTo else 'left')
+        return int(start), int(max(start, end))
 
     def getValueForDate(self, date: str):
         '''
@@ -49,10 +191,46 @@ class StockNode:
             Returns:
                 StockValue || None
         '''
-        if date in self.data:
-            return self.data[date]
+        self.mergePending()
+        day = StockDate.toDayNumber(date)
+        index = np.searchsorted(self.dates, day)
+        if index < len(self.dates) and self.dates[index] == day:
+            return self.getValueForIndex(index)
         return None
 
+    def findDays(self, days):
+        '''
+            Find the rows for an array of day numbers in one pass
+
+            Args:
+                days (ndarray[int32]): The day numbers to find
+
+            Returns:
+                (tuple(ndarray[bool], ndarray[int])) Whether each day was
+                found, and its row (only valid where found)
+        '''
+        self.mergePending()
+        if not len(self.dates):
+            return np.zeros(len(days), dtype=bool), np.zeros(len(days),
+                                                             dtype=int)
+        rows = np.minimum(np.searchsorted(self.dates, days),
+                          len(self.dates) - 1)
+        return self.dates[rows] == days, rows
+
+    def getValueForIndex(self, index: int):
+        '''
+            Return a stock value for a row
+
+            Args:
+                index (int): The row position
+
+            Returns:
+                StockValue
+        '''
+        return StockValue(float(self.open[index]), float(self.high[index]),
+                          float(self.low[index]), float(self.close[index]),
+                          float(self.volume[index]))
+
     def getAverageValues(self, fromDate: str, toDate: str):
         '''
             Calculate the average values between two dates
@@ -64,32 +242,267 @@ class StockNode:
             Returns:
                 StockValue
         '''
-        currentDate = datetime.strptime(fromDate, Constants.PY_DATE_FORMAT)
-        endDate = datetime.strptime(toDate, Constants.PY_DATE_FORMAT)
-        # Create a time delta to iterate with
-        delta = timedelta(days=1)
-        totalCount = 0
-        open = 0.0
-        high = 0.0
-        low = 0.0
-        close = 0.0
-
-        while currentDate < endDate:
-            node = self.getValueForDate(
-                currentDate.strftime(Constants.PY_DATE_FORMAT))
-            if node is not None:
-                totalCount += 1
-                open += node.getOpeningValue()
-                high += node.getHighValue()
-                low += node.getLowValue()
-                close = node.getCloseValue()
-            currentDate += delta
-        return StockValue(round(open / totalCount, 2),
-                          round(high / totalCount, 2),
-                          round(low / totalCount, 2),
-                          round(close / totalCount, 2))
+        # The range is from inclusive, to exclusive
+        start, end = self.getIndexRange(fromDate, toDate, False)
+        if end == start:
+            return StockValue(0.0, 0.0, 0.0, 0.0)
+        totals = self.getSumValuesForIndexRange(start, end)
+        count = end - start
+        return StockValue(round(totals.getOpeningValue() / count, 2),
+                          round(totals.getHighValue() / count, 2),
+                          round(totals.getLowValue() / count, 2),
+                          round(totals.getCloseValue() / count, 2),
+                          round(totals.getVolume() / count, 2))
+
+    def getSumValues(self, fromDate: str, toDate: str, includeTo=True):
+        '''
+            Calculate the sum of the values between two dates, answered from
+            cumulative sums with two lookups
+
+            Args:
+                fromDate    (str):  The from date (inclusive)
+                toDate      (str):  The to date
+                includeTo   (bool): Whether the to date is included
+
+            Returns:
+                StockValue
+        '''
+        return self.getSumValuesForIndexRange(
+            *self.getIndexRange(fromDate, toDate, includeTo))
+
+    def getSumValuesForIndexRange(self, start: int, end: int):
+        '''
+            Calculate the sum of the values between two row positions
+
+            Args:
+                start   (int):  The first row
+                end     (int):  The row to stop before
+
+            Returns:
+                StockValue
+        '''
+        cumulative = self.getCumulativeValues()[:self.TURNOVER]
+        return StockValue(*[
+            float(total)
+            for total in cumulative[:, end] - cumulative[:, start]
+        ])
+
+    def getVolumeValues(self, fromDate: str, toDate: str):
+        '''
+            Calculate the volume traded between two dates, and the turnover
+            and volume weighted average price, from the cumulative sums
+
+            Args:
+                fromDate    (str):  The from (buy) date
+                toDate      (str):  The to (sell) date
+
+            Returns:
+                StockVolume
+        '''
+        # The whole holding period trades, so both dates are included, as
+        # in the profit tables
+        start, end = self.getIndexRange(fromDate, toDate)
+        cumulative = self.getCumulativeValues()
+        return StockVolume(
+            end - start,
+            float(cumulative[self.VOLUME, end] -
+                  cumulative[self.VOLUME, start]),
+            float(cumulative[self.TURNOVER, end] -
+                  cumulative[self.TURNOVER, start]))
+
+    def getCumulativeValues(self):
+        '''
+            Return the running totals of the open/high/low/close/volume
+            columns, and of the turnover (the OHLC average times the volume)
+            in row TURNOVER. Column 0 of each is zero so a range sum is
+            cumulative[end] - cumulative[start]. These are built on first use
+
+            Returns:
+                ndarray[float] (6, size + 1)
+        '''
+        self.mergePending()
+        if self.cumulative is None:
+            cumulative = np.zeros((6, len(self.dates) + 1))
+            columns = (self.open, self.high, self.low, self.close, self.volume,
+                       (self.open + self.high + self.low + self.close) / 4 *
+                       self.volume)
+            for row, column in enumerate(columns):
+                np.cumsum(column, out=cumulative[row, 1:])
+            self.cumulative = cumulative
+        return self.cumulative
+
+    def getSeries(self, option: str, fromDate: str, toDate: str):
+        '''
+            Extract a plottable series between two dates (inclusive)
+
+            Args:
+                option      (str):  Check Constants.GraphOptions for enumerable
+                fromDate    (str):  The from date
+                toDate      (str):  The to date
+
+            Returns:
+                StockSeries
+        '''
+        start, end = self.getIndexRange(fromDate, toDate)
+        x = self.dates[start:end]
+        volume = self.volume[start:end]
+        if option in StockIndicators.WINDOWS:
+            y = self.getIndicator(option,
+                                  StockIndicators.WINDOWS[option])[start:end]
+            # Drop the days before the indicator's first full window
+            finite = np.isfinite(y)
+            if not finite.all():
+                x, y, volume = x[finite], y[finite], volume[finite]
+        elif option == Constants.GraphOptions.LOW:
+            y = self.low[start:end]
+        elif option == Constants.GraphOptions.HIGH:
+            y = self.high[start:end]
+        elif option == Constants.GraphOptions.DIFF:
+            y = self.high[start:end] - self.low[start:end]
+        else:
+            y = (self.open[start:end] + self.high[start:end] +
+                 self.low[start:end] + self.close[start:end]) / 4
+            if option != Constants.GraphOptions.AVERAGE and len(y):
+                y = (y - y[0]) / y[0] * 100
+        if not len(y):
+            return StockSeries(x, y, volume=volume)
+        return StockSeries(x, y, float(y.min()), float(y.max()), volume)
+
+    def getIndicator(self, name: str, window: int):
+        '''
+            Get an indicator over the full history, they're calculated on
+            first use and kept for each name and window
+
+            Args:
+                name    (str):  Check StockIndicators.WINDOWS for enumerable
+                window  (int):  The window in days
+
+            Returns:
+                (ndarray[float]) The value for every row
+        '''
+        self.mergePending()
+        key = (name, window)
+        if key not in self.indicators:
+            self.indicators[key] = StockIndicators.calculate(
+                name, window, self.high, self.low, self.close)
+        return self.indicators[key]
+
+    def getBestWindows(self, fromDate: str, toDate: str, count: int = 1):
+        '''
+            Find the most profitable buy/sell pairs on the close price
+            between two dates (inclusive). Each sell date is paired with the
+            lowest close before it, in one running minimum pass, and the top
+            count that gain are returned, best first, each with a different
+            sell date
+
+            Args:
+                fromDate    (str):  The from date
+                toDate      (str):  The to date
+                count       (int):  The number of windows to return
+
+            Returns:
+                (List[StockWindow])
+        '''
+        start, end = self.getIndexRange(fromDate, toDate)
+        buys, changes = self.__getRunningChanges(self.close[start:end],
+                                                 np.minimum)
+        # Only a rise is a window worth buying, when the price only falls
+        # there are none
+        gains = np.flatnonzero(changes > 0)
+        count = min(count, len(gains))
+        if count < 1:
+            return []
+        sells = gains[np.argpartition(-changes[gains], count - 1)[:count]]
+        sells = sells[np.argsort(-changes[sells], kind='stable')]
+        return [
+            self.__createWindow(start + buys[sell], start + sell + 1)
+            for sell in sells
+        ]
+
+    def getMaxRunUp(self, fromDate: str, toDate: str):
+        '''
+            Find the largest rise in close price between two dates
+
+            Args:
+                fromDate    (str):  The from date
+                toDate      (str):  The to date
+
+            Returns:
+                (StockWindow || None) None when the price never rises
+        '''
+        windows = self.getBestWindows(fromDate, toDate)
+        return windows[0] if windows else None
+
+    def getMaxDrawdown(self, fromDate: str, toDate: str):
+        '''
+            Find the largest fall in close price between two dates, pairing
+            each date with the highest close before it
+
+            Args:
+                fromDate    (str):  The from date
+                toDate      (str):  The to date
+
+            Returns:
+                (StockWindow || None) None when the price never falls
+        '''
+        start, end = self.getIndexRange(fromDate, toDate)
+        peaks, changes = self.__getRunningChanges(self.close[start:end],
+                                                  np.maximum)
+        if not len(changes):
+            return None
+        trough = int(np.argmin(changes))
+        if not changes[trough] < 0:
+            return None
+        return self.__createWindow(start + peaks[trough], start + trough + 1)
+
+    def __getRunningChanges(self, values, extreme):
+        '''
+            Pair each value with the running extreme of the values before it
+
+            Args:
+                values  (ndarray[float]):   The values in date order
+                extreme (ufunc):            np.minimum or np.maximum
+
+            Returns:
+                (tuple(ndarray[int], ndarray[float])) For each value after
+                the first, the position of the extreme before it, and the
+                change from it
+        '''
+        if len(values) < 2:
+            return np.empty(0, dtype=int), np.empty(0)
+        running = extreme.accumulate(values)
+        # The latest position holding the running extreme
+        positions = np.maximum.accumulate(
+            np.where(values == running, np.arange(len(values)), 0))
+        return positions[:-1], values[1:] - running[:-1]
+
+    def __createWindow(self, buy: int, sell: int):
+        '''
+            Create a window between two rows
+
+            Args:
+                buy     (int):  The buy row
+                sell    (int):  The sell row
+
+            Returns:
+                (StockWindow)
+        '''
+        return StockWindow(StockDate.toDateString(self.dates[buy]),
+                           StockDate.toDateString(self.dates[sell]),
+                           float(self.close[buy]), float(self.close[sell]))
 
     def getProfitValue(self, amount, fromDate, toDate):
+        '''
+            Calculate the profit of buying on one date and selling on another
+
+            Args:
+                amount      (int):  The amount of stock
+                fromDate    (str):  The from (buy) date
+                toDate      (str):  The to (sell) date
+
+            Returns:
+                StockProfit || None
+        '''
         buyValue = self.getValueForDate(fromDate)
         sellValue = self.getValueForDate(toDate)
         if buyValue is None or sellValue is None:
@@ -97,6 +510,67 @@ class StockNode:
 
         return StockProfit(amount, buyValue, sellValue)
 
+    def mergePending(self):
+        '''
+            Merge any buffered rows into the sorted columns, readers do this
+            on demand, but the loader does it up front so nodes are read
+            only once loaded and can be shared with other threads
+        '''
+        if self.loader is not None:
+            self.__load()
+        if self.buffer is not None:
+            dates, *values = self.buffer
+            self.buffer = None
+            self.pending.append(
+                (np.frombuffer(dates, dtype=np.int32).astype(StockDate.DTYPE),
+                 *[np.frombuffer(column) for column in values]))
+        if not self.pending:
+            return
+        blocks = [(self.dates, self.open, self.high, self.low, self.close,
+                   self.volume)] + self.pending
+        self.pending = []
+        self.cumulative = None
+        self.indicators = {}
+        columns = self.__sortColumns(
+            [np.concatenate(column) for column in zip(*blocks)])
+        (self.dates, self.open, self.high, self.low, self.close,
+         self.volume) = columns
+
+    def __load(self):
+        '''
+            Load the columns from the loader, the first reader to get here
+            loads them while any others wait. The loader is only cleared
+            once the columns are set, so readers that see it cleared never
+            see a partly loaded node
+        '''
+        with self.lock:
+            if self.loader is None:
+                return
+            columns = self.__sortColumns(
+                [np.asarray(column) for column in self.loader()])
+            (self.dates, self.open, self.high, self.low, self.close,
+             self.volume) = columns
+            self.loader = None
+
+    def __sortColumns(self, columns):
+        '''
+            Sort columns by date
+
+            Args:
+                columns (List[ndarray]): The date and value columns
+
+            Returns:
+                (List[ndarray])
+        '''
+        dates = columns[0]
+        # Data is usually ordered by date already, only sort when it isn't
+        if len(dates) > 1 and (np.diff(dates) <= 0).any():
+            order = np.argsort(dates, kind='stable')
+            columns = [column[order] for column in columns]
+            if (np.diff(columns[0]) == 0).any():
+                raise ValueError("No two entries can exist for the same date")
+        return columns
+
 
 class StockValue:
     '''
@@ -107,12 +581,19 @@ class StockValue:
             high    (float): The high price on the given date
             low     (float): The low price on the given date
             close   (float): The close price on the given date
+            volume  (float): The volume traded on the given date
     '''
-    def __init__(self, open: float, high: float, low: float, close: float):
+    def __init__(self,
+                 open: float,
+                 high: float,
+                 low: float,
+                 close: float,
+                 volume: float = 0.0):
         self.open = open
         self.high = high
         self.low = low
         self.close = close
+        self.volume = volume
 
     def getCloseValue(self):
         '''
@@ -150,6 +631,15 @@ class StockValue:
         '''
         return self.open
 
+    def getVolume(self):
+        '''
+            Getter for volume
+
+            Returns:
+                (float)
+        '''
+        return self.volume
+
     def getDayDiff(self):
         '''
             Determine the difference between the close and open
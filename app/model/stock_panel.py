@@ -0,0 +1,383 @@
+'''
+    Stock Panel
+    Every stock's values on a shared trading calendar, for questions about
+    all stock on a day
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from .stock_date import StockDate
+import numpy as np
+
+
+class StockPanel:
+    '''
+        A panel holds a dense array per value column, with a row per day of
+        the trading calendar (every day any stock has data for) and a column
+        per stock. Days a stock has no data for hold NaN, so a day's values
+        for every stock are one contiguous row. A stock's previous close is
+        its last close before the day, even when it didn't trade on the
+        trading day before
+
+        Args:
+            labels      (ndarray[str]):     The label of each stock column
+            calendar    (ndarray[int32]):   The sorted day numbers of the rows
+            columns     (dict{str: ndarray[float]}): The (days, stock) arrays
+    '''
+    COLUMNS = ["open", "high", "low", "close", "volume"]
+
+    def __init__(self, labels, calendar, columns):
+        self.labels = labels
+        self.calendar = calendar
+        self.columns = columns
+        # Each stock's last close up to each row, built on first use
+        self.lastClose = None
+
+    @staticmethod
+    def fromNodes(nodes):
+        '''
+            Build a panel from stock nodes, placing each node's rows on the
+            calendar with a binary search
+
+            Args:
+                nodes (List[StockNode]): The stock nodes
+
+            Returns:
+                (StockPanel)
+        '''
+        nodes = list(nodes)
+        calendar = np.unique(
+            np.concatenate([node.getDates() for node in nodes] +
+                           [np.empty(0, dtype=StockDate.DTYPE)]))
+        shape = (len(calendar), len(nodes))
+        columns = {name: np.full(shape, np.nan) for name in StockPanel.COLUMNS}
+        for index, node in enumerate(nodes):
+            dates, *values = node.getColumns()
+            rows = np.searchsorted(calendar, dates)
+            for name, column in zip(StockPanel.COLUMNS, values):
+                columns[name][rows, index] = column
+        return StockPanel(
+            np.array([node.getLabel() for node in nodes], dtype=str),
+            calendar, columns)
+
+    def getLabels(self):
+        '''
+            Getter for the label of each stock column
+
+            Returns:
+                (ndarray[str])
+        '''
+        return self.labels
+
+    def getCalendar(self):
+        '''
+            Getter for the trading calendar, the day number of each row
+
+            Returns:
+                (ndarray[int32])
+        '''
+        return self.calendar
+
+    def getColumn(self, name: str):
+        '''
+            Getter for a value column, see COLUMNS
+
+            Args:
+                name (str): The column name
+
+            Returns:
+                (ndarray[float]) (days, stock)
+        '''
+        if name not in self.columns:
+            raise IndexError("%s isn't a panel column" % name)
+        return self.columns[name]
+
+    def findRow(self, date: str):
+        '''
+            Find the row of a date on the calendar
+
+            Args:
+                date (str): Date in yyyy-mm-dd format
+
+            Returns:
+                (int || None) None when it isn't a trading day
+        '''
+        day = StockDate.toDayNumber(date)
+        row = int(np.searchsorted(self.calendar, day))
+        if row == len(self.calendar) or self.calendar[row] != day:
+            return None
+        return row
+
+    def findRows(self, fromDate: str, toDate: str):
+        '''
+            Find the rows of the trading days between two dates
+
+            Args:
+                fromDate    (str): Date in yyyy-mm-dd format
+                toDate      (str): Date in yyyy-mm-dd format (inclusive)
+
+            Returns:
+                (slice)
+        '''
+        days = StockDate.toDayNumbers([fromDate, toDate])
+        return slice(int(np.searchsorted(self.calendar, days[0])),
+                     int(np.searchsorted(self.calendar, days[1],
+                                         side='right')))
+
+    def getLastClose(self):
+        '''
+            Getter for each stock's last close up to and including each row,
+            NaN before its first close
+
+            Returns:
+                (ndarray[float]) (days, stock)
+        '''
+        if self.lastClose is None:
+            close = self.columns["close"]
+            rows = np.where(np.isnan(close), 0,
+                            np.arange(len(close))[:, None])
+            np.maximum.accumulate(rows, axis=0, out=rows)
+            self.lastClose = np.take_along_axis(close, rows, axis=0)
+        return self.lastClose
+
+    def getPreviousClose(self, rows: slice):
+        '''
+            Getter for each stock's last close before each of a range of
+            rows
+
+            Args:
+                rows (slice): The rows, with a step of one
+
+            Returns:
+                (ndarray[float]) (days, stock)
+        '''
+        lastClose = self.getLastClose()
+        start, stop, _ = rows.indices(len(lastClose))
+        previousClose = lastClose[max(start - 1, 0):max(stop - 1, 0)]
+        if start == 0 and stop > 0:
+            # Nothing closed before the first row
+            previousClose = np.concatenate(
+                (np.full((1, len(self.labels)), np.nan), previousClose))
+        return previousClose
+
+    def getCrossSection(self, date: str):
+        '''
+            Get every stock's values on a date, along with their last close
+            before it
+
+            Args:
+                date (str): Date in yyyy-mm-dd format
+
+            Returns:
+                (StockCrossSection || None) None when it isn't a trading day
+        '''
+        row = self.findRow(date)
+        if row is None:
+            return None
+        return StockCrossSection(
+            self.labels, int(self.calendar[row]),
+            self.getPreviousClose(slice(row, row + 1))[0],
+            {name: column[row]
+             for name, column in self.columns.items()})
+
+    def getBreadth(self, fromDate: str, toDate: str):
+        '''
+            Count the stock that closed up, down and unchanged on each
+            trading day between two dates, and find the highest high and
+            lowest low, from one slice of the panel
+
+            Args:
+                fromDate    (str): Date in yyyy-mm-dd format
+                toDate      (str): Date in yyyy-mm-dd format (inclusive)
+
+            Returns:
+                (dict{str: ndarray}) The day number of each row, and the
+                    columns of StockCrossSection.getBreadth, getHighest and
+                    getLowest, None and NaN on days without values
+        '''
+        rows = self.findRows(fromDate, toDate)
+        changes = StockPanel.toChanges(self.columns["close"][rows],
+                                       self.getPreviousClose(rows))
+        breadth = {"days": self.calendar[rows]}
+        with np.errstate(invalid='ignore'):
+            breadth["advancing"] = (changes > 0).sum(axis=1)
+            breadth["declining"] = (changes < 0).sum(axis=1)
+            breadth["unchanged"] = (changes == 0).sum(axis=1)
+        for name, column, fill, find in (("highest", "high", -np.inf,
+                                          np.argmax),
+                                         ("lowest", "low", np.inf,
+                                          np.argmin)):
+            values = self.columns[column][rows]
+            missing = np.isnan(values)
+            index = find(np.where(missing, fill, values), axis=1)
+            empty = missing.all(axis=1)
+            found = values[np.arange(len(values)), index]
+            breadth[name + "Stock"] = np.where(
+                empty, None, self.labels[index].astype(object))
+            breadth[name] = np.where(empty, np.nan, found)
+        return breadth
+
+    @staticmethod
+    def toChanges(close, previousClose):
+        '''
+            The percentage change of each close from the previous close,
+            NaN where either is missing
+
+            Args:
+                close           (ndarray[float]): The closes
+                previousClose   (ndarray[float]): The closes before
+
+            Returns:
+                (ndarray[float])
+        '''
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.round((close - previousClose) / previousClose * 100, 4)
+
+
+class StockCrossSection:
+    '''
+        Every stock's values on a single day, as views onto a panel row.
+        Stock with no data for the day hold NaN
+
+        Args:
+            labels          (ndarray[str]):     The label of each stock
+            day             (int):              The day number
+            previousClose   (ndarray[float]):   The last close before the
+                                                day
+            values          (dict{str: ndarray[float]}): The value columns
+    '''
+    def __init__(self, labels, day: int, previousClose, values):
+        self.labels = labels
+        self.day = day
+        self.previousClose = previousClose
+        self.values = values
+
+    def getDate(self):
+        '''
+            Getter for the date
+
+            Returns:
+                (str) yyyy-mm-dd
+        '''
+        return StockDate.toDateString(self.day)
+
+    def getLabels(self):
+        '''
+            Getter for the label of each stock
+
+            Returns:
+                (ndarray[str])
+        '''
+        return self.labels
+
+    def getValues(self, name: str):
+        '''
+            Getter for a value column, see StockPanel.COLUMNS
+
+            Args:
+                name (str): The column name
+
+            Returns:
+                (ndarray[float])
+        '''
+        if name not in self.values:
+            raise IndexError("%s isn't a panel column" % name)
+        return self.values[name]
+
+    def getPreviousClose(self):
+        '''
+            Getter for each stock's last close before the day
+
+            Returns:
+                (ndarray[float])
+        '''
+        return self.previousClose
+
+    def findLabels(self):
+        '''
+            Find the stock with data for the day
+
+            Returns:
+                (ndarray[str])
+        '''
+        return self.labels[~np.isnan(self.values["close"])]
+
+    def getChanges(self):
+        '''
+            The percentage change of each stock's close from its last close
+            before, NaN where either is missing
+
+            Returns:
+                (ndarray[float])
+        '''
+        return StockPanel.toChanges(self.values["close"], self.previousClose)
+
+    def getMovers(self, count: int = 10, descending: bool = True):
+        '''
+            Find the stock that moved the most, the biggest gainers or with
+            descending False the biggest losers
+
+            Args:
+                count       (int):  The most stock to return
+                descending  (bool): Gainers first, otherwise losers first
+
+            Returns:
+                (ndarray[int]) The positions of the stock, biggest movers
+                first, to index the labels and values with
+        '''
+        changes = self.getChanges()
+        found = np.flatnonzero(np.isfinite(changes))
+        order = found[np.argsort(changes[found], kind='stable')]
+        if descending:
+            order = order[::-1]
+        return order[:max(count, 0)]
+
+    def getHighest(self):
+        '''
+            Find the highest high of all stock on the day
+
+            Returns:
+                (tuple(str, float) || None) The label and the high
+        '''
+        return self.__findExtreme(self.values["high"], np.nanargmax)
+
+    def getLowest(self):
+        '''
+            Find the lowest low of all stock on the day
+
+            Returns:
+                (tuple(str, float) || None) The label and the low
+        '''
+        return self.__findExtreme(self.values["low"], np.nanargmin)
+
+    def getBreadth(self):
+        '''
+            Count the stock that closed up, down and unchanged from their
+            last close before
+
+            Returns:
+                (dict{str: int})
+        '''
+        changes = self.getChanges()
+        changes = changes[np.isfinite(changes)]
+        return {
+            "advancing": int((changes > 0).sum()),
+            "declining": int((changes < 0).sum()),
+            "unchanged": int((changes == 0).sum())
+        }
+
+    def __findExtreme(self, values, find):
+        '''
+            Find the stock with an extreme value
+
+            Args:
+                values  (ndarray[float]):   The values of each stock
+                find    (callable):         np.nanargmax or np.nanargmin
+
+            Returns:
+                (tuple(str, float) || None)
+        '''
+        if np.isnan(values).all():
+            return None
+        index = int(find(values))
+        return str(self.labels[index]), float(values[index])
@@ -0,0 +1,253 @@
+'''
+    Stock Profit Table
+    Profit metrics for many stock, amounts and buy/sell dates as columns
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+import numpy as np
+
+
+class StockProfitTable:
+    '''
+        Holds a row per scenario (stock, buy date, sell date and amount), and
+        a column per StockProfit metric. Rows with no value on the buy or
+        sell date hold NaN
+
+        Args:
+            labels      (ndarray[str]):     The stock label of each row
+            buyDates    (ndarray[int32]):   The buy day number of each row
+            sellDates   (ndarray[int32]):   The sell day number of each row
+            amounts     (ndarray[float]):   The amount of stock of each row
+            found       (ndarray[bool]):    Whether each row had a value on
+                                            both its buy and sell dates
+            columns     (dict{str: ndarray[float]}): The metric columns
+    '''
+    COLUMNS = [
+        "lowestMargin", "highestMargin", "averageMargin", "lowestBuyPrice",
+        "highestBuyPrice", "averageBuyPrice", "lowestSellPrice",
+        "highestSellPrice", "averageSellPrice", "percentageGain",
+        "averageChange", "averageVolume", "turnover", "vwap", "vwapChange"
+    ]
+
+    def __init__(self, labels, buyDates, sellDates, amounts, found, columns):
+        self.labels = labels
+        self.buyDates = buyDates
+        self.sellDates = sellDates
+        self.amounts = amounts
+        self.found = found
+        self.columns = columns
+
+    @staticmethod
+    def calculate(labels,
+                  buyDates,
+                  sellDates,
+                  amounts,
+                  buy,
+                  sell,
+                  volumes=None):
+        '''
+            Calculate every metric in one vectorized pass, with the same
+            arithmetic and rounding as the StockProfit getters
+
+            Args:
+                labels      (ndarray[str]):     The stock label of each row
+                buyDates    (ndarray[int32]):   The buy day numbers
+                sellDates   (ndarray[int32]):   The sell day numbers
+                amounts     (ndarray[float]):   The amounts of stock
+                buy         (tuple(ndarray)):   Low, high and OHLC average on
+                                                the buy dates
+                sell        (tuple(ndarray)):   Low, high and OHLC average on
+                                                the sell dates
+                volumes     (tuple(ndarray)):   Days, volume and turnover from
+                                                the buy to the sell date
+                                                (inclusive), NaN if not given
+
+            Returns:
+                (StockProfitTable)
+        '''
+        buyLow, buyHigh, buyAverage = buy
+        sellLow, sellHigh, sellAverage = sell
+        columns = {}
+        columns["lowestMargin"] = StockProfitTable.roundValues(
+            (sellLow - buyHigh) * amounts, 2)
+        columns["highestMargin"] = StockProfitTable.roundValues(
+            (sellHigh - buyLow) * amounts, 2)
+        columns["averageMargin"] = StockProfitTable.roundValues(
+            (columns["highestMargin"] + columns["lowestMargin"]) / 2, 2)
+        columns["lowestBuyPrice"] = StockProfitTable.roundValues(
+            buyLow * amounts, 2)
+        columns["highestBuyPrice"] = StockProfitTable.roundValues(
+            buyHigh * amounts, 2)
+        columns["averageBuyPrice"] = StockProfitTable.roundValues(
+            (columns["highestBuyPrice"] + columns["lowestBuyPrice"]) / 2)
+        columns["lowestSellPrice"] = StockProfitTable.roundValues(
+            sellLow * amounts, 2)
+        columns["highestSellPrice"] = StockProfitTable.roundValues(
+            sellHigh * amounts, 2)
+        columns["averageSellPrice"] = StockProfitTable.roundValues(
+            (columns["highestSellPrice"] + columns["lowestSellPrice"]) / 2)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns["percentageGain"] = StockProfitTable.roundValues(
+                (sellAverage - buyAverage) / buyAverage * 100, 4)
+        columns["averageChange"] = StockProfitTable.roundValues(
+            (sellAverage - buyAverage) * amounts, 2)
+        if volumes is None:
+            volumes = [np.full(len(amounts), np.nan) for _ in range(3)]
+        days, volume, turnover = volumes
+        with np.errstate(divide='ignore', invalid='ignore'):
+            columns["averageVolume"] = StockProfitTable.roundValues(
+                volume / days, 2)
+            vwap = turnover / volume
+        columns["turnover"] = StockProfitTable.roundValues(turnover, 2)
+        columns["vwap"] = StockProfitTable.roundValues(vwap, 2)
+        # Buying through the holding period at its volume weighted average
+        # price, and selling on the sell date
+        columns["vwapChange"] = StockProfitTable.roundValues(
+            (sellAverage - vwap) * amounts, 2)
+        found = ~(np.isnan(buyAverage) | np.isnan(sellAverage))
+        # A row missing either date has no metrics, not half of them
+        columns = {
+            name: np.where(found, column, np.nan)
+            for name, column in columns.items()
+        }
+        return StockProfitTable(labels, buyDates, sellDates, amounts, found,
+                                columns)
+
+    @staticmethod
+    def roundValues(values, digits: int = 0):
+        '''
+            Round values as the builtin round does. np.round scales by a
+            power of ten first, which can carry a value sitting on a half
+            to the other side of it, so those few are rounded with round
+
+            Args:
+                values  (ndarray[float]):   The values to round
+                digits  (int):              The decimal places
+
+            Returns:
+                (ndarray[float])
+        '''
+        values = np.asarray(values, dtype=np.float64)
+        rounded = np.round(values, digits)
+        with np.errstate(invalid='ignore'):
+            scaled = values * 10.0**digits
+            halves = np.abs(scaled - np.floor(scaled) - 0.5) < 1e-6
+        if halves.any():
+            rounded[halves] = [
+                round(value, digits) for value in values[halves].tolist()
+            ]
+        return rounded
+
+    def getSize(self):
+        '''
+            Return the number of rows
+
+            Returns:
+                (int)
+        '''
+        return len(self.labels)
+
+    def getLabels(self):
+        '''
+            Getter for the stock label of each row
+
+            Returns:
+                (ndarray[str])
+        '''
+        return self.labels
+
+    def getBuyDates(self):
+        '''
+            Getter for the buy day number of each row
+
+            Returns:
+                (ndarray[int32])
+        '''
+        return self.buyDates
+
+    def getSellDates(self):
+        '''
+            Getter for the sell day number of each row
+
+            Returns:
+                (ndarray[int32])
+        '''
+        return self.sellDates
+
+    def getAmounts(self):
+        '''
+            Getter for the amount of stock of each row
+
+            Returns:
+                (ndarray[float])
+        '''
+        return self.amounts
+
+    def getColumn(self, name: str):
+        '''
+            Getter for a metric column, see COLUMNS
+
+            Args:
+                name (str): The column name
+
+            Returns:
+                (ndarray[float])
+        '''
+        if name not in self.columns:
+            raise IndexError("%s isn't a profit column" % name)
+        return self.columns[name]
+
+    def getColumns(self):
+        '''
+            Getter for all the metric columns
+
+            Returns:
+                (dict{str: ndarray[float]})
+        '''
+        return self.columns
+
+    def take(self, order):
+        '''
+            Create a table from a selection of rows
+
+            Args:
+                order (ndarray[int] || slice): The rows to take, in order
+
+            Returns:
+                (StockProfitTable)
+        '''
+        return StockProfitTable(
+            self.labels[order], self.buyDates[order], self.sellDates[order],
+            self.amounts[order], self.found[order],
+            {name: column[order]
+             for name, column in self.columns.items()})
+
+    def sortBy(self, name: str, descending: bool = True):
+        '''
+            Sort the rows by a metric column, or by "label", rows without a
+            value always come last
+
+            Args:
+                name        (str):  The column name
+                descending  (bool): Largest first
+
+            Returns:
+                (StockProfitTable)
+        '''
+        if name == "label":
+            order = np.argsort(self.labels, kind='stable')
+            return self.take(order[::-1] if descending else order)
+        column = self.getColumn(name)
+        # NaN sorts last, so negate rather than reverse for descending
+        order = np.argsort(-column if descending else column, kind='stable')
+        return self.take(order)
+
+    def getFound(self):
+        '''
+            Whether each row had a value on both its buy and sell dates
+
+            Returns:
+                (ndarray[bool])
+        '''
+        return self.found
@@ -0,0 +1,92 @@
+'''
+    Stock Series
+    A plottable series of values for a stock
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+
+
+class StockSeries:
+    '''
+        A series of values for a stock over a date range
+
+        Args:
+            x       (ndarray[int32]):   The day number of each point
+            y       (ndarray[float]):   The y value of each point
+            low     (float):            The lowest y value, None when empty
+            high    (float):            The highest y value, None when empty
+            volume  (ndarray[float]):   The volume traded on each day
+    '''
+    def __init__(self, x, y, low=None, high=None, volume=None):
+        self.x = x
+        self.y = y
+        self.low = low
+        self.high = high
+        self.volume = volume
+
+    def getX(self):
+        '''
+            Getter for the x values
+
+            Returns:
+                (ndarray[int32])
+        '''
+        return self.x
+
+    def getY(self):
+        '''
+            Getter for the y values
+
+            Returns:
+                (ndarray[float])
+        '''
+        return self.y
+
+    def getLow(self):
+        '''
+            Getter for the lowest y value
+
+            Returns:
+                (float)
+        '''
+        return self.low
+
+    def getHigh(self):
+        '''
+            Getter for the highest y value
+
+            Returns:
+                (float)
+        '''
+        return self.high
+
+    def getVolume(self):
+        '''
+            Getter for the volume of each point
+
+            Returns:
+                (ndarray[float] || None)
+        '''
+        return self.volume
+
+    def getSize(self):
+        '''
+            The memory held by the points in bytes
+
+            Returns:
+                (int)
+        '''
+        size = self.x.nbytes + self.y.nbytes
+        if self.volume is not None:
+            size += self.volume.nbytes
+        return size
+
+    def isEmpty(self):
+        '''
+            Check if the series has no points
+
+            Returns:
+                (bool)
+        '''
+        return len(self.y) == 0
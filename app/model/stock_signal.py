@@ -0,0 +1,48 @@
+'''
+    Stock Signal
+    A minimal signal for the model, so it doesn't depend on Qt
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+
+
+class StockSignal:
+    '''
+        Calls each connected callback with the emitted values, in the thread
+        that emits. The GUI relays these onto Qt signals (see StockWorker),
+        which carry them across to the GUI thread
+    '''
+    def __init__(self):
+        self.callbacks = []
+
+    def connect(self, callback):
+        '''
+            Connect a callback
+
+            Args:
+                callback (callable): Called with the emitted values
+        '''
+        self.callbacks.append(callback)
+
+    def disconnect(self, callback=None):
+        '''
+            Disconnect a callback, or every callback
+
+            Args:
+                callback (callable): The callback to disconnect
+        '''
+        if callback is None:
+            self.callbacks = []
+        else:
+            self.callbacks.remove(callback)
+
+    def emit(self, *values):
+        '''
+            Call every connected callback
+
+            Args:
+                *values (args): The values to pass on
+        '''
+        for callback in list(self.callbacks):
+            callback(*values)
@@ -0,0 +1,164 @@
+'''
+    Stock Snapshot
+    A binary snapshot of a loaded stock model, stored next to its source
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+import json
+import os
+import struct
+from .stock_date import StockDate
+import numpy as np
+
+
+class StockSnapshot:
+    '''
+        A snapshot holds every node's columns back to back, with a header
+        recording the source signature, the ticker index and the bounds.
+        Columns are aligned so they can be memory mapped on open
+
+        Args:
+            location    (str):  The location of the snapshot file
+            signature   (dict): Identifies the source the snapshot is for
+    '''
+    MAGIC = b'STKSNAP\x02'
+    ALIGNMENT = 64
+    COLUMNS = [("dates", StockDate.DTYPE), ("open", np.float64),
+               ("high", np.float64), ("low", np.float64),
+               ("close", np.float64), ("volume", np.float64)]
+
+    def __init__(self, location: str, signature):
+        self.location = location
+        self.signature = signature
+
+    @staticmethod
+    def fromSource(stock_source):
+        '''
+            Create the snapshot for a source, if the source supports one
+
+            Args:
+                stock_source (StockSource): The source of our data
+
+            Returns:
+                (StockSnapshot || None)
+        '''
+        location = stock_source.getSnapshotLocation()
+        if location is None:
+            return None
+        return StockSnapshot(location, stock_source.getSignature())
+
+    def isValid(self):
+        '''
+            Check the snapshot exists and was built from the current source
+
+            Returns:
+                (bool)
+        '''
+        try:
+            header, _ = self.__readHeader()
+        except (OSError, ValueError, struct.error):
+            return False
+        return header["signature"] == self.signature
+
+    def read(self, stock):
+        '''
+            Map the snapshot into the stock model
+
+            Args:
+                stock (Stock): The model to load into
+        '''
+        header, offset = self.__readHeader()
+        rows = header["rows"]
+        columns = []
+        for name, dtype in self.COLUMNS:
+            if rows:
+                # Plain array views onto the map, the memmap subclass adds
+                # overhead to every slice the nodes take
+                columns.append(
+                    np.asarray(
+                        np.memmap(self.location,
+                                  dtype=dtype,
+                                  mode='r',
+                                  offset=offset,
+                                  shape=(rows, ))))
+            else:
+                columns.append(np.empty(0, dtype=dtype))
+            offset = self.__align(offset + rows * np.dtype(dtype).itemsize)
+        offsets = header["offsets"]
+        for index, label in enumerate(header["labels"]):
+            start, end = offsets[index], offsets[index + 1]
+            node = stock.createStockNode(label)
+            node.setColumns(*[column[start:end] for column in columns])
+            stock.insertStockNode(node)
+        bounds = header["bounds"]
+        if bounds is not None:
+            stock.updateBounds(StockDate.toDatetime(bounds["earliest"]),
+                               StockDate.toDatetime(bounds["latest"]),
+                               bounds["lowest"], bounds["highest"])
+
+    def write(self, stock):
+        '''
+            Write the stock model to the snapshot, replacing any existing one
+
+            Args:
+                stock (Stock): The model to save
+        '''
+        nodes = list(stock.selectAll().values())
+        blocks = [node.getColumns() for node in nodes]
+        offsets = np.cumsum([0] + [len(block[0]) for block in blocks])
+        bounds = None
+        if stock.getEarliestDate() is not None:
+            bounds = {
+                "earliest": StockDate.fromDate(stock.getEarliestDate()),
+                "latest": StockDate.fromDate(stock.getLatestDate()),
+                "lowest": stock.getLowestValue(),
+                "highest": stock.getHighestValue()
+            }
+        header = json.dumps({
+            "signature": self.signature,
+            "rows": int(offsets[-1]),
+            "labels": [node.getLabel() for node in nodes],
+            "offsets": offsets.tolist(),
+            "bounds": bounds
+        }).encode('utf-8')
+        # Write to a temporary file and swap it in, so a reader never sees
+        # a partial snapshot
+        temporary = self.location + '.tmp'
+        with open(temporary, mode='wb') as handler:
+            handler.write(self.MAGIC + struct.pack('<Q', len(header)))
+            handler.write(header)
+            for index, (name, dtype) in enumerate(self.COLUMNS):
+                handler.write(b'\0' * (self.__align(handler.tell()) -
+                                       handler.tell()))
+                for block in blocks:
+                    handler.write(
+                        np.ascontiguousarray(block[index],
+                                             dtype=dtype).tobytes())
+        os.replace(temporary, self.location)
+
+    def __readHeader(self):
+        '''
+            Read the header of the snapshot
+
+            Returns:
+                (tuple(dict, int)) The header, and the offset of the columns
+        '''
+        with open(self.location, mode='rb') as handler:
+            if handler.read(len(self.MAGIC)) != self.MAGIC:
+                raise ValueError("%s isn't a snapshot" % self.location)
+            size, = struct.unpack('<Q', handler.read(8))
+            header = json.loads(handler.read(size).decode('utf-8'))
+            return header, self.__align(handler.tell())
+
+    def __align(self, offset: int):
+        '''
+            Round an offset up to the column alignment
+
+            Args:
+                offset (int): A byte offset
+
+            Returns:
+                (int)
+        '''
+        return -(-offset // self.ALIGNMENT) * self.ALIGNMENT
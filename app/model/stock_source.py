@@ -5,6 +5,7 @@
     Author:
         Matthew Barber <mfmbarber@gmail.com>
 '''
+from .stock_table import StockTable
 
 
 class StockSource:
@@ -16,6 +17,10 @@ class StockSource:
     '''
     isReady = False
 
+    # The number of rows gathered into each chunk by genChunk
+    chunkRows = 65536
+    currentChunkSize = 0
+
     def __init__(self, location=None):
         self.location = location
 
@@ -41,6 +46,81 @@ class StockSource:
         for line in self.genLine():
             yield dict(zip(headers, line))
 
+    def genChunk(self):
+        '''
+            Gen blocks of rows as typed columns, child classes should
+            override this with a bulk parser where they can
+
+            Yields:
+                (StockTable)
+        '''
+        rows = []
+        self.currentChunkSize = 0
+        size = 0
+        for row in self.genRow():
+            rows.append(row)
+            size += self.getLineSize()
+            if len(rows) == self.chunkRows:
+                self.currentChunkSize = size
+                yield StockTable.fromRows(rows)
+                rows = []
+                size = 0
+        if rows:
+            self.currentChunkSize = size
+            yield StockTable.fromRows(rows)
+
+    def genChunkParallel(self, processes: int):
+        '''
+            Gen blocks of rows parsed across a pool of processes, child
+            classes that can split their data should override this
+
+            Args:
+                processes (int): The number of worker processes
+
+            Yields:
+                (StockTable)
+        '''
+        yield from self.genChunk()
+
+    def getChunkSize(self):
+        '''
+            Getter for the size of the last chunk generated (bytes)
+
+            Returns:
+                (int)
+        '''
+        return self.currentChunkSize
+
+    def getSnapshotLocation(self):
+        '''
+            Getter for where a snapshot of the loaded model can be kept,
+            should be overridden by child classes that support snapshots
+
+            Returns:
+                (str || None)
+        '''
+        return None
+
+    def getIndexLocation(self):
+        '''
+            Getter for where a byte offset index of the source can be kept,
+            should be overridden by child classes that support lazy loading
+
+            Returns:
+                (str || None)
+        '''
+        return None
+
+    def getSignature(self):
+        '''
+            Getter for a signature that changes whenever the source does,
+            should be overridden by child classes that support snapshots
+
+            Returns:
+                (dict || None)
+        '''
+        return None
+
     def getLineSize(self):
         '''
             Getter for line size, should be overridden by child classes
@@ -5,8 +5,14 @@
         Matthew Barber <mfmbarber@gmail.com>
 '''
 import csv
+import hashlib
+import multiprocessing
 import os
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+import numpy as np
 from .stock_source import StockSource
+from .stock_table import StockTable
 
 
 class StockSourceFile(StockSource):
@@ -16,7 +22,15 @@ class StockSourceFile(StockSource):
         Args:
             location (str): The location of the data
     '''
+    file = None
     handler = None
+    headers = None
+
+    # The number of bytes read into each chunk by genChunk
+    chunkBytes = 1 << 23
+
+    # The number of bytes hashed from each end of the file for a signature
+    signatureBytes = 1 << 16
 
     def __init__(self, location: str):
         super().__init__(location)
@@ -38,7 +52,145 @@ class StockSourceFile(StockSource):
         for line in self.handler:
             self.currentLineSize = len(','.join(line).encode('utf-8'))
             yield line
-        self.handler = None
+        self.close()
+
+    def genChunk(self):
+        '''
+            Generate blocks of complete lines from the resource, parsed in
+            bulk into typed columns
+
+            Yields:
+                (StockTable)
+        '''
+        with open(self.location, mode='rb') as handler:
+            header = handler.readline()
+            headers = self.parseHeaders(header)
+            self.currentChunkSize = len(header)
+            remainder = b''
+            while True:
+                block = handler.read(self.chunkBytes)
+                if not block:
+                    break
+                block = remainder + block
+                # Only parse complete lines, carry the rest into the next
+                end = block.rfind(b'\n') + 1
+                remainder = block[end:]
+                if end:
+                    self.currentChunkSize += end
+                    yield self.parseChunk(block[:end], headers)
+                    self.currentChunkSize = 0
+            if remainder:
+                self.currentChunkSize += len(remainder)
+                yield self.parseChunk(remainder, headers)
+
+    def genChunkParallel(self, processes: int):
+        '''
+            Split the resource into byte ranges of complete lines, and parse
+            these in a pool of processes. Blocks are yielded in file order
+
+            Args:
+                processes (int): The number of worker processes
+
+            Yields:
+                (StockTable)
+        '''
+        ranges = self.getByteRanges()
+        if processes <= 1 or len(ranges) <= 1:
+            yield from self.genChunk()
+            return
+        headers = self.getHeaders()
+        # Spawn rather than fork, forking a process running Qt threads is
+        # unsafe
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(processes, mp_context=context) as executor:
+            tables = executor.map(parseFileRange, repeat(self.location),
+                                  [start for start, _ in ranges],
+                                  [end for _, end in ranges], repeat(headers))
+            previous = 0
+            for (_, end), table in zip(ranges, tables):
+                self.currentChunkSize = end - previous
+                previous = end
+                yield table
+
+    def getByteRanges(self):
+        '''
+            Split the lines after the header into byte ranges of roughly
+            chunkBytes, each starting and ending on a line boundary
+
+            Returns:
+                (List[tuple(int, int)])
+        '''
+        boundaries = [self.getLineBoundary(1)]
+        while boundaries[-1] < self.size:
+            boundaries.append(
+                self.getLineBoundary(boundaries[-1] + self.chunkBytes))
+        return list(zip(boundaries[:-1], boundaries[1:]))
+
+    def getLineBoundary(self, offset: int):
+        '''
+            Find the start of the first line at or after an offset
+
+            Args:
+                offset (int): A byte offset into the file
+
+            Returns:
+                (int)
+        '''
+        if offset <= 0:
+            return 0
+        if offset >= self.size:
+            return self.size
+        with open(self.location, mode='rb') as handler:
+            handler.seek(offset - 1)
+            handler.readline()
+            return min(handler.tell(), self.size)
+
+    def getHeaders(self):
+        '''
+            Read the lowercase column names from the header line
+
+            Returns:
+                (List[str])
+        '''
+        with open(self.location, mode='rb') as handler:
+            return self.parseHeaders(handler.readline())
+
+    def parseHeaders(self, header: bytes):
+        '''
+            Parse the header line into lowercase column names
+
+            Args:
+                header (bytes): The header line
+
+            Returns:
+                (List[str])
+        '''
+        return [
+            column.strip().lower()
+            for column in header.decode('utf-8').split(',')
+        ]
+
+    @staticmethod
+    def parseChunk(block, headers):
+        '''
+            Parse a block of complete lines, falling back to the csv reader
+            for lines the bulk parser can't handle (quoted fields)
+
+            Args:
+                block   (bytes-like):   Complete csv lines
+                headers (List[str]):    Lowercase column headers
+
+            Returns:
+                (StockTable)
+        '''
+        try:
+            return StockTable.fromBytes(block, headers)
+        except ValueError:
+            lines = csv.reader(bytes(block).decode('utf-8').splitlines(),
+                               delimiter=',',
+                               quotechar='"')
+            return StockTable.fromRows(
+                [dict(zip(headers, line)) for line in lines if line])
 
     def getLineSize(self):
         '''
@@ -58,18 +210,118 @@ class StockSourceFile(StockSource):
         '''
         return self.size
 
+    def getSnapshotLocation(self):
+        '''
+            Get the location of the snapshot, kept next to the file
+
+            Returns:
+                (str)
+        '''
+        return self.location + '.snapshot'
+
+    def getIndexLocation(self):
+        '''
+            Get the location of the byte offset index, kept next to the file
+
+            Returns:
+                (str)
+        '''
+        return self.location + '.index'
+
+    def readRange(self, start: int, end: int):
+        '''
+            Read a byte range of the file
+
+            Args:
+                start   (int):  The first byte of the range
+                end     (int):  The byte to stop before
+
+            Returns:
+                (bytes-like)
+        '''
+        with open(self.location, mode='rb') as handler:
+            handler.seek(start)
+            return handler.read(end - start)
+
+    def parseRanges(self, ranges):
+        '''
+            Parse byte ranges of complete lines into one set of columns, used
+            to load a stock from its ranges in the index
+
+            Args:
+                ranges (List[tuple(int, int)]): The byte ranges to parse
+
+            Returns:
+                (tuple(ndarray)) The date and value columns
+        '''
+        if self.headers is None:
+            self.headers = self.getHeaders()
+        tables = [
+            self.parseChunk(self.readRange(start, end), self.headers)
+            for start, end in ranges
+        ]
+        if not tables:
+            tables = [StockTable.empty()]
+        return tuple(
+            np.concatenate(column)
+            for column in zip(*[table.getColumns() for table in tables]))
+
+    def getSignature(self):
+        '''
+            Get a signature of the file, its size, modified time, and a hash
+            of its head and tail
+
+            Returns:
+                (dict)
+        '''
+        stat = os.stat(self.location)
+        digest = hashlib.sha1()
+        with open(self.location, mode='rb') as handler:
+            digest.update(handler.read(self.signatureBytes))
+            handler.seek(max(stat.st_size - self.signatureBytes, 0))
+            digest.update(handler.read(self.signatureBytes))
+        return {
+            "size": stat.st_size,
+            "modified": stat.st_mtime_ns,
+            "hash": digest.hexdigest()
+        }
+
+    def close(self):
+        '''
+            Close the file handler
+        '''
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.handler = None
+
     def __setHandler(self):
         '''
             Set the file handler on the instance for reading the data
         '''
-        if self.handler is not None:
-            self.handler.close()
+        self.close()
         try:
             # TODO: validate source file mime type
-            self.handler = csv.reader(open(file=self.location,
-                                           mode='r',
-                                           encoding='utf-8'),
-                                      delimiter=',',
-                                      quotechar='"')
+            self.file = open(file=self.location, mode='r', encoding='utf-8')
+            self.handler = csv.reader(self.file, delimiter=',', quotechar='"')
         except Exception:
             raise ValueError("Cannot open file: ", self.location)
+
+
+def parseFileRange(location: str, start: int, end: int, headers):
+    '''
+        Parse a byte range of complete lines from a file, this is run in the
+        worker processes so it lives at the module level
+
+        Args:
+            location    (str):          The location of the data
+            start       (int):          The first byte of the range
+            end         (int):          The byte to stop before
+            headers     (List[str]):    Lowercase column headers
+
+        Returns:
+            (StockTable)
+    '''
+    with open(location, mode='rb') as handler:
+        handler.seek(start)
+        return StockSourceFile.parseChunk(handler.read(end - start), headers)
@@ -0,0 +1,215 @@
+'''
+    Stock Source Index
+    A byte offset index of a source, stored next to it, so each stock can
+    be parsed on its own when it's first read
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+import json
+import os
+from .stock_table import StockTable
+import numpy as np
+
+
+class StockSourceIndex:
+    '''
+        An index records, for each stock, the byte ranges of the source its
+        rows are in and how many rows there are, along with the bounds of
+        the whole source. Sources grouped by stock have one range per stock
+
+        Args:
+            location    (str):  The location of the index file
+            signature   (dict): Identifies the source the index is for
+    '''
+    VERSION = 1
+
+    # Sources with more ranges per stock than this on average aren't
+    # grouped by stock, and are better parsed in one pass
+    rangesPerStock = 4
+
+    def __init__(self, location: str, signature):
+        self.location = location
+        self.signature = signature
+        self.entries = {}
+        self.bounds = None
+
+    @staticmethod
+    def fromSource(stock_source):
+        '''
+            Create the index for a source, if the source supports one
+
+            Args:
+                stock_source (StockSource): The source of our data
+
+            Returns:
+                (StockSourceIndex || None)
+        '''
+        location = stock_source.getIndexLocation()
+        if location is None:
+            return None
+        return StockSourceIndex(location, stock_source.getSignature())
+
+    def read(self):
+        '''
+            Read the index, if it exists and was built from the current source
+
+            Returns:
+                (bool) True if the index was read
+        '''
+        try:
+            with open(self.location, mode='r', encoding='utf-8') as handler:
+                index = json.load(handler)
+        except (OSError, ValueError):
+            return False
+        if (not isinstance(index, dict)
+                or index.get("version") != self.VERSION
+                or index.get("signature") != self.signature):
+            return False
+        self.entries = index["entries"]
+        self.bounds = index["bounds"]
+        return True
+
+    def build(self, stock_source, progress=None):
+        '''
+            Build the index in one pass over the source, a block at a time,
+            noting where each run of rows for a stock starts and ends
+
+            Args:
+                stock_source    (StockSourceFile):  The source of our data
+                progress        (callable):         Called with the bytes read
+        '''
+        self.entries = {}
+        self.bounds = None
+        headers = stock_source.getHeaders()
+        read = 0
+        for start, end in stock_source.getByteRanges():
+            block = stock_source.readRange(start, end)
+            table = stock_source.parseChunk(block, headers)
+            offsets = self.__getLineOffsets(block)
+            if len(offsets) != table.getSize():
+                raise ValueError(
+                    "Rows span lines, the source can't be indexed")
+            self.__addRuns(table, offsets + start, end)
+            read += end - start
+            if progress is not None:
+                progress(read)
+        ranges = sum(len(entry["ranges"]) for entry in self.entries.values())
+        if ranges > self.rangesPerStock * len(self.entries):
+            # Keep the result, so the source isn't indexed again
+            self.entries = None
+
+    def write(self):
+        '''
+            Write the index, replacing any existing one
+        '''
+        temporary = self.location + '.tmp'
+        with open(temporary, mode='w', encoding='utf-8') as handler:
+            json.dump(
+                {
+                    "version": self.VERSION,
+                    "signature": self.signature,
+                    "entries": self.entries,
+                    "bounds": self.bounds
+                }, handler)
+        os.replace(temporary, self.location)
+
+    def isGrouped(self):
+        '''
+            Check the source is grouped by stock, so it can be loaded lazily
+
+            Returns:
+                (bool)
+        '''
+        return self.entries is not None
+
+    def getEntries(self):
+        '''
+            Get the entry for each stock, its byte ranges, row count, and
+            earliest and latest day numbers, None if the source isn't grouped
+
+            Returns:
+                (dict{str: dict} || None)
+        '''
+        return self.entries
+
+    def getBounds(self):
+        '''
+            Get the bounds of the source, the earliest and latest day numbers
+            and the lowest and highest values
+
+            Returns:
+                (dict || None)
+        '''
+        return self.bounds
+
+    def __addRuns(self, table, offsets, end: int):
+        '''
+            Add the runs of rows in a parsed block to the entries, a run
+            carrying on from the end of the last block extends its range
+
+            Args:
+                table   (StockTable):       The rows of the block
+                offsets (ndarray[int]):     The byte offset of each row
+                end     (int):              The byte the block ends before
+        '''
+        if not table.getSize():
+            return
+        names = table.names
+        runs = np.concatenate(
+            ([0], np.flatnonzero(names[1:] != names[:-1]) + 1, [len(names)]))
+        starts = np.append(offsets, end)[runs]
+        earliest = np.minimum.reduceat(table.dates, runs[:-1])
+        latest = np.maximum.reduceat(table.dates, runs[:-1])
+        for index in range(len(runs) - 1):
+            label = names[runs[index]].decode('utf-8')
+            rows = int(runs[index + 1] - runs[index])
+            entry = self.entries.get(label)
+            if entry is None:
+                entry = self.entries[label] = {
+                    "ranges": [],
+                    "rows": 0,
+                    "earliest": int(earliest[index]),
+                    "latest": int(latest[index])
+                }
+            ranges = entry["ranges"]
+            start, stop = int(starts[index]), int(starts[index + 1])
+            if ranges and ranges[-1][1] == start:
+                ranges[-1][1] = stop
+            else:
+                ranges.append([start, stop])
+            entry["rows"] += rows
+            entry["earliest"] = min(entry["earliest"], int(earliest[index]))
+            entry["latest"] = max(entry["latest"], int(latest[index]))
+        bounds = (int(table.dates.min()), int(table.dates.max()),
+                  float(table.low.min()), float(table.high.max()))
+        if self.bounds is not None:
+            bounds = (min(bounds[0], self.bounds["earliest"]),
+                      max(bounds[1], self.bounds["latest"]),
+                      min(bounds[2], self.bounds["lowest"]),
+                      max(bounds[3], self.bounds["highest"]))
+        self.bounds = dict(zip(("earliest", "latest", "lowest", "highest"),
+                               bounds))
+
+    @staticmethod
+    def __getLineOffsets(block):
+        '''
+            Find where each line with content starts in a block of complete
+            lines, these are the lines StockTable.fromBytes makes rows of
+
+            Args:
+                block (bytes-like): Complete csv lines
+
+            Returns:
+                (ndarray[int])
+        '''
+        data = np.frombuffer(block, dtype=np.uint8)
+        newLines = np.flatnonzero(data == StockTable.NEWLINE)
+        starts = np.concatenate(([0], newLines + 1))
+        ends = np.append(newLines, len(data))
+        # Lines holding nothing but carriage returns are blank too
+        content = np.concatenate(
+            ([0],
+             np.cumsum((data != StockTable.NEWLINE)
+                       & (data != StockTable.RETURN))))
+        return starts[content[ends] > content[starts]]
@@ -0,0 +1,122 @@
+'''
+    A Memory Mapped Stock Source File Handler
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+import mmap
+from .stock_source_file import StockSourceFile
+
+
+class StockSourceMappedFile(StockSourceFile):
+    '''
+        Stock source file reader that memory maps the file, chunks are
+        tokenized in place from the map so the file is never decoded or
+        copied into python strings
+
+        Args:
+            location (str): The location of the data
+    '''
+    map = None
+    position = 0
+
+    def __init__(self, location: str):
+        super().__init__(location)
+        # Lines are read from the map, never from the base's file handler
+        super().close()
+        self.__setMap()
+
+    def genLine(self):
+        '''
+            Generate a new line from the map, split into fields
+
+            Yields:
+                (List[str])
+        '''
+        if self.map is None:
+            return
+        # Like the file handler, lines carry on from where we left off
+        while self.position < self.size:
+            start = self.position
+            end = self.getLineBoundary(start + 1)
+            self.position = end
+            self.currentLineSize = end - start
+            line = self.map[start:end].rstrip(b'\r\n')
+            if line:
+                yield line.decode('utf-8').split(',')
+
+    def genChunk(self):
+        '''
+            Generate blocks of complete lines as views onto the map, parsed
+            in bulk into typed columns
+
+            Yields:
+                (StockTable)
+        '''
+        if self.map is None:
+            return
+        start = self.map.find(b'\n') + 1
+        if not start:
+            return
+        headers = self.parseHeaders(self.map[:start])
+        self.currentChunkSize = start
+        with memoryview(self.map) as view:
+            while start < self.size:
+                end = self.getLineBoundary(start + self.chunkBytes)
+                self.currentChunkSize += end - start
+                yield self.parseChunk(view[start:end], headers)
+                self.currentChunkSize = 0
+                start = end
+
+    def getLineBoundary(self, offset: int):
+        '''
+            Find the start of the first line at or after an offset
+
+            Args:
+                offset (int): A byte offset into the file
+
+            Returns:
+                (int)
+        '''
+        if offset <= 0:
+            return 0
+        if offset >= self.size:
+            return self.size
+        newLine = self.map.find(b'\n', offset - 1)
+        return self.size if newLine == -1 else newLine + 1
+
+    def readRange(self, start: int, end: int):
+        '''
+            Read a byte range of the map
+
+            Args:
+                start   (int):  The first byte of the range
+                end     (int):  The byte to stop before
+
+            Returns:
+                (bytes-like)
+        '''
+        if self.map is None:
+            return b''
+        return self.map[start:end]
+
+    def close(self):
+        '''
+            Release the map, and the file handler
+        '''
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        super().close()
+
+    def __setMap(self):
+        '''
+            Map the file read only, empty files can't be mapped
+        '''
+        if not self.size:
+            return
+        with open(self.location, mode='rb') as handler:
+            self.map = mmap.mmap(handler.fileno(), 0, access=mmap.ACCESS_READ)
+        # We read the map front to back, let the kernel read ahead
+        if hasattr(self.map, 'madvise') and hasattr(mmap, 'MADV_SEQUENTIAL'):
+            self.map.madvise(mmap.MADV_SEQUENTIAL)
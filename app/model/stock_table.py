@@ -0,0 +1,241 @@
+'''
+    Stock Table
+    A block of stock rows held as typed columns, used for bulk loading
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from .stock_date import StockDate
+import numpy as np
+
+
+class StockTable:
+    '''
+        A block of stock rows held as typed columns
+
+        Args:
+            names   (ndarray[bytes]):   The stock label for each row
+            dates   (ndarray[int32]):   Day numbers for each row
+            open    (ndarray[float]):   The opening prices
+            high    (ndarray[float]):   The high prices
+            low     (ndarray[float]):   The low prices
+            close   (ndarray[float]):   The close prices
+            volume  (ndarray[float]):   The volumes traded
+    '''
+    VALUE_FIELDS = ["open", "high", "low", "close", "volume"]
+
+    # Value fields a source may leave out, these are zero
+    OPTIONAL_FIELDS = ["volume"]
+
+    COMMA = ord(',')
+    NEWLINE = ord('\n')
+    RETURN = ord('\r')
+    QUOTE = ord('"')
+
+    def __init__(self, names, dates, open, high, low, close, volume):
+        self.names = names
+        self.dates = dates
+        self.open = open
+        self.high = high
+        self.low = low
+        self.close = close
+        self.volume = volume
+
+    @staticmethod
+    def fromRows(rows):
+        '''
+            Build a table from rows of strings keyed by (lowercase) header
+
+            Args:
+                rows (List[dict{str: str}]): Rows as yielded by genRow
+
+            Returns:
+                (StockTable)
+        '''
+        columns = {
+            field: np.array([row.get(field) or 0.0 for row in rows],
+                            dtype=np.float64)
+            for field in StockTable.VALUE_FIELDS
+        }
+        return StockTable(
+            np.array([row["name"].encode('utf-8') for row in rows],
+                     dtype=bytes),
+            np.array([StockDate.toDayNumber(row["date"]) for row in rows],
+                     dtype=StockDate.DTYPE), **columns)
+
+    @staticmethod
+    def fromBytes(buffer, headers):
+        '''
+            Parse complete csv lines into a table in one vectorized pass
+
+            The buffer is tokenized on commas and new lines with array
+            operations, so no python objects are made per row
+
+            Args:
+                buffer  (bytes):        Complete csv lines (without a header)
+                headers (List[str]):    Lowercase headers of the columns
+
+            Returns:
+                (StockTable)
+        '''
+        data = np.frombuffer(buffer, dtype=np.uint8)
+        if (data == StockTable.QUOTE).any():
+            raise ValueError("Quoted fields can't be parsed in bulk")
+        if (data == StockTable.RETURN).any():
+            data = data[data != StockTable.RETURN]
+        newLines = data == StockTable.NEWLINE
+        # Drop blank lines, and close off the final line
+        blank = newLines.copy()
+        blank[1:] &= newLines[:-1]
+        if blank.any():
+            data = data[~blank]
+        if data.size and data[-1] != StockTable.NEWLINE:
+            data = np.append(data, np.uint8(StockTable.NEWLINE))
+        if not data.size:
+            return StockTable.empty()
+
+        columnCount = len(headers)
+        separators = np.flatnonzero((data == StockTable.COMMA)
+                                    | (data == StockTable.NEWLINE))
+        if (len(separators) % columnCount
+                or (data[separators[columnCount - 1::columnCount]] !=
+                    StockTable.NEWLINE).any()):
+            raise ValueError("Rows must have %d fields" % columnCount)
+        starts = np.empty_like(separators)
+        starts[0] = 0
+        starts[1:] = separators[:-1] + 1
+        starts = starts.reshape(-1, columnCount)
+        ends = separators.reshape(-1, columnCount)
+
+        def field(name):
+            if name in StockTable.OPTIONAL_FIELDS and name not in headers:
+                return np.zeros(len(starts), dtype=bytes)
+            if name not in headers:
+                raise ValueError("Missing the %s column" % name)
+            index = headers.index(name)
+            return StockTable.__gatherField(data, starts[:, index],
+                                            ends[:, index])
+
+        columns = {}
+        for name in StockTable.VALUE_FIELDS:
+            values = field(name)
+            # Missing values are treated as zero
+            values[values == b''] = b'0'
+            columns[name] = values.astype(np.float64)
+        return StockTable(
+            field("name"),
+            field("date").astype('datetime64[D]').astype(StockDate.DTYPE),
+            **columns)
+
+    @staticmethod
+    def empty():
+        '''
+            Create a table with no rows
+
+            Returns:
+                (StockTable)
+        '''
+        return StockTable(np.empty(0, dtype=bytes),
+                          np.empty(0, dtype=StockDate.DTYPE),
+                          *[np.empty(0) for _ in StockTable.VALUE_FIELDS])
+
+    def getSize(self):
+        '''
+            Return the number of rows
+
+            Returns:
+                (int)
+        '''
+        return len(self.dates)
+
+    def getColumns(self):
+        '''
+            Return the date and value columns, in the order StockNode takes
+
+            Returns:
+                (tuple(ndarray))
+        '''
+        return (self.dates, self.open, self.high, self.low, self.close,
+                self.volume)
+
+    def slice(self, start: int, end: int):
+        '''
+            Return the rows between two positions as a table
+
+            Args:
+                start   (int): The first row
+                end     (int): The row to stop before
+
+            Returns:
+                (StockTable)
+        '''
+        return StockTable(self.names[start:end], self.dates[start:end],
+                          self.open[start:end], self.high[start:end],
+                          self.low[start:end], self.close[start:end],
+                          self.volume[start:end])
+
+    def take(self, order):
+        '''
+            Return the rows in a given order as a table
+
+            Args:
+                order (ndarray[int]): Row positions
+
+            Returns:
+                (StockTable)
+        '''
+        return StockTable(self.names[order], self.dates[order],
+                          self.open[order], self.high[order],
+                          self.low[order], self.close[order],
+                          self.volume[order])
+
+    def genGroups(self):
+        '''
+            Generate the rows for each stock label
+
+            Yields:
+                (tuple(str, StockTable))
+        '''
+        if not self.getSize():
+            return
+        table = self
+        runs = table.__getRuns()
+        # Rows are usually grouped by name, only sort when they aren't
+        if len(runs) - 1 != len(np.unique(table.names[runs[:-1]])):
+            table = table.take(np.argsort(table.names, kind='stable'))
+            runs = table.__getRuns()
+        for start, end in zip(runs[:-1], runs[1:]):
+            yield table.names[start].decode('utf-8'), table.slice(start, end)
+
+    def __getRuns(self):
+        '''
+            Find where each run of equal names starts
+
+            Returns:
+                (ndarray[int]) The run starts followed by the row count
+        '''
+        changes = np.flatnonzero(self.names[1:] != self.names[:-1]) + 1
+        return np.concatenate(([0], changes, [len(self.names)]))
+
+    @staticmethod
+    def __gatherField(data, starts, ends):
+        '''
+            Gather one field for every row into a fixed width bytes array
+
+            Args:
+                data    (ndarray[uint8]):   The raw bytes
+                starts  (ndarray[int]):     The field start positions
+                ends    (ndarray[int]):     The field end positions
+
+            Returns:
+                (ndarray[bytes])
+        '''
+        lengths = ends - starts
+        width = max(int(lengths.max()), 1)
+        offsets = np.arange(width)
+        inField = offsets < lengths[:, None]
+        # Pad each field with nulls, which numpy strips from bytes values
+        chars = np.where(
+            inField, data[np.minimum(starts[:, None] + offsets,
+                                     len(data) - 1)], 0).astype(np.uint8)
+        return chars.view('S%d' % width).ravel()
@@ -0,0 +1,72 @@
+'''
+    Stock Volume
+    The volume traded in a stock over a range of days
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+
+
+class StockVolume:
+    '''
+        The volume traded in a stock over a range of days
+
+        Args:
+            days        (int):      The number of trading days
+            volume      (float):    The total volume traded
+            turnover    (float):    The total value traded, each day's volume
+                                    times its OHLC average
+    '''
+    def __init__(self, days: int, volume: float, turnover: float):
+        self.days = days
+        self.volume = volume
+        self.turnover = turnover
+
+    def getDays(self):
+        '''
+            Getter for the number of trading days
+
+            Returns:
+                (int)
+        '''
+        return self.days
+
+    def getVolume(self):
+        '''
+            Getter for the total volume traded
+
+            Returns:
+                (float)
+        '''
+        return self.volume
+
+    def getTurnover(self):
+        '''
+            The total value traded
+
+            Returns:
+                (float)
+        '''
+        return round(self.turnover, 2)
+
+    def getAverageVolume(self):
+        '''
+            The average daily volume
+
+            Returns:
+                (float)
+        '''
+        if not self.days:
+            return 0.0
+        return round(self.volume / self.days, 2)
+
+    def getVwap(self):
+        '''
+            The volume weighted average price
+
+            Returns:
+                (float)
+        '''
+        if not self.volume:
+            return 0.0
+        return round(self.turnover / self.volume, 2)
@@ -0,0 +1,82 @@
+'''
+    Stock Window
+    A buy and sell date pair for a stock
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+
+
+class StockWindow:
+    '''
+        A window between buying and selling a stock
+
+        Args:
+            buyDate     (str):      The buy date in yyyy-mm-dd format
+            sellDate    (str):      The sell date in yyyy-mm-dd format
+            buyPrice    (float):    The price on the buy date
+            sellPrice   (float):    The price on the sell date
+    '''
+    def __init__(self, buyDate: str, sellDate: str, buyPrice: float,
+                 sellPrice: float):
+        self.buyDate = buyDate
+        self.sellDate = sellDate
+        self.buyPrice = buyPrice
+        self.sellPrice = sellPrice
+
+    def getBuyDate(self):
+        '''
+            Getter for the buy date
+
+            Returns:
+                (str)
+        '''
+        return self.buyDate
+
+    def getSellDate(self):
+        '''
+            Getter for the sell date
+
+            Returns:
+                (str)
+        '''
+        return self.sellDate
+
+    def getBuyPrice(self):
+        '''
+            Getter for the buy price
+
+            Returns:
+                (float)
+        '''
+        return self.buyPrice
+
+    def getSellPrice(self):
+        '''
+            Getter for the sell price
+
+            Returns:
+                (float)
+        '''
+        return self.sellPrice
+
+    def getChange(self):
+        '''
+            The change in price per unit of stock
+
+            Returns:
+                (float)
+        '''
+        return round(self.sellPrice - self.buyPrice, 2)
+
+    def getPercentageChange(self):
+        '''
+            The change in price as a percentage of the buy price
+
+            Returns:
+                (float)
+        '''
+        if not self.buyPrice:
+            return 0.0
+        return round((self.sellPrice - self.buyPrice) / self.buyPrice * 100,
+                     4)
@@ -7,7 +7,9 @@
         Matthew Barber <mfmbarber@gmail.com>
 '''
 from app.model.stock_node import StockValue
-from .value_data import ValueData, CurrencyValue
+from app.model.stock_volume import StockVolume
+from app.model.stock_window import StockWindow
+from .value_data import ValueData, CurrencyValue, NumberValue, PercentageValue
 from PyQt5.QtWidgets import QVBoxLayout
 
 
@@ -67,3 +69,158 @@ class AverageStockValueData(QVBoxLayout):
             CurrencyValue('$', self.stockValue.getOpeningValue()))
         self.closeComponent.updateValue(
             CurrencyValue('$', self.stockValue.getCloseValue()))
+
+
+class StockWindowValueData(QVBoxLayout):
+    '''
+        StockWindowValueData layout used for analysis, showing the best
+        buy/sell window (max run-up) and the max drawdown
+
+        Args:
+            runUp       (StockWindow): The max run-up window
+            drawdown    (StockWindow): The max drawdown window
+    '''
+    noRunUp = 'No rise in range'
+    noDrawdown = 'No fall in range'
+
+    def __init__(self, runUp=None, drawdown=None, parent=None):
+        super().__init__(parent)
+        self.runUp = runUp or StockWindowValueData.createEmptyValue()
+        self.drawdown = drawdown or StockWindowValueData.createEmptyValue()
+        self.initUI()
+
+    @staticmethod
+    def createEmptyValue():
+        '''
+            Return an empty placeholder stock window
+
+            Return:
+                StockWindow
+        '''
+        return StockWindow('', '', 0.0, 0.0)
+
+    def initUI(self):
+        '''
+            Iniitalize the UI
+        '''
+        group = ValueData('Best Window')
+        self.buyDateComponent = group.addRow('Buy:',
+                                             self.runUp.getBuyDate())
+        self.sellDateComponent = group.addRow('Sell:',
+                                              self.runUp.getSellDate())
+        self.runUpComponent = group.addRow(
+            'Gain:', CurrencyValue('$', self.runUp.getChange()))
+        self.runUpPercentageComponent = group.addRow(
+            'Gain %:', PercentageValue(self.runUp.getPercentageChange()))
+        group.addColumn('Max Drawdown')
+        self.peakDateComponent = group.addRow('Peak:',
+                                              self.drawdown.getBuyDate())
+        self.troughDateComponent = group.addRow('Trough:',
+                                                self.drawdown.getSellDate())
+        self.drawdownComponent = group.addRow(
+            'Loss:', CurrencyValue('$', self.drawdown.getChange()))
+        self.drawdownPercentageComponent = group.addRow(
+            'Loss %:', PercentageValue(self.drawdown.getPercentageChange()))
+        self.addLayout(group.done())
+
+    def updateWindowValues(self, runUp=None, drawdown=None):
+        '''
+            Update the UI, a window of None is shown as there being no rise
+            or fall in the range
+
+            Args:
+                runUp       (StockWindow): The max run-up window
+                drawdown    (StockWindow): The max drawdown window
+        '''
+        self.runUp = runUp
+        self.drawdown = drawdown
+        self.showWindow(runUp, self.noRunUp, self.buyDateComponent,
+                        self.sellDateComponent, self.runUpComponent,
+                        self.runUpPercentageComponent)
+        self.showWindow(drawdown, self.noDrawdown, self.peakDateComponent,
+                        self.troughDateComponent, self.drawdownComponent,
+                        self.drawdownPercentageComponent)
+
+    @staticmethod
+    def showWindow(window, missing: str, buyDate, sellDate, change,
+                   percentageChange):
+        '''
+            Show a window in its components, or that there isn't one
+
+            Args:
+                window              (StockWindow):  The window, or None
+                missing             (str):          Shown when there's none
+                buyDate             (Value):        The buy date component
+                sellDate            (Value):        The sell date component
+                change              (Value):        The change component
+                percentageChange    (Value):        The percentage component
+        '''
+        if window is None:
+            buyDate.updateValue(missing)
+            for component in (sellDate, change, percentageChange):
+                component.updateValue('')
+            return
+        buyDate.updateValue(window.getBuyDate())
+        sellDate.updateValue(window.getSellDate())
+        change.updateValue(CurrencyValue('$', window.getChange()))
+        percentageChange.updateValue(
+            PercentageValue(window.getPercentageChange()))
+
+
+class StockVolumeValueData(QVBoxLayout):
+    '''
+        StockVolumeValueData layout used for analysis, showing the volume
+        traded, the turnover and the volume weighted average price
+
+        Args:
+            stockVolume (StockVolume): A stock volume object
+    '''
+    def __init__(self, stockVolume=None, parent=None):
+        super().__init__(parent)
+        self.stockVolume = (stockVolume
+                            or StockVolumeValueData.createEmptyValue())
+        self.initUI()
+
+    @staticmethod
+    def createEmptyValue():
+        '''
+            Return an empty placeholder stock volume
+
+            Return:
+                StockVolume
+        '''
+        return StockVolume(0, 0.0, 0.0)
+
+    def initUI(self):
+        '''
+            Iniitalize the UI
+        '''
+        group = ValueData('Volume')
+        self.averageVolumeComponent = group.addRow(
+            'Daily:', NumberValue(self.stockVolume.getAverageVolume()))
+        self.volumeComponent = group.addRow(
+            'Total:', NumberValue(self.stockVolume.getVolume()))
+        group.addColumn('Turnover')
+        self.turnoverComponent = group.addRow(
+            'Total:', CurrencyValue('$', self.stockVolume.getTurnover()))
+        self.vwapComponent = group.addRow(
+            'VWAP:', CurrencyValue('$', self.stockVolume.getVwap()))
+        self.addLayout(group.done())
+
+    def updateVolumeValues(self, stockVolume=None):
+        '''
+            Update the UI
+
+            Args:
+                stockVolume (StockVolume): The update value
+        '''
+        self.stockVolume = (stockVolume
+                            or StockVolumeValueData.createEmptyValue())
+        self.averageVolumeComponent.updateValue(
+            NumberValue(self.stockVolume.getAverageVolume()))
+        self.volumeComponent.updateValue(
+            NumberValue(self.stockVolume.getVolume()))
+        self.turnoverComponent.updateValue(
+            CurrencyValue('$', self.stockVolume.getTurnover()))
+        self.vwapComponent.updateValue(
+            CurrencyValue('$', self.stockVolume.getVwap()))
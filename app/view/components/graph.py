@@ -5,9 +5,11 @@
     Author:
         Matthew Barber <mfmbarber@gmail.com>
 '''
-import datetime
-import pyqtgraph as pg
 from app.lib.constants import Constants
+from app.model.stock_date import StockDate
+from functools import lru_cache
+import numpy as np
+import pyqtgraph as pg
 from PyQt5.QtCore import pyqtSignal
 from PyQt5.QtWidgets import QRadioButton, QWidget
 
@@ -36,22 +38,104 @@ class NonScientificAxis(pg.AxisItem):
             Returns:
                 (List[str])
         '''
-        # TODO : Validation
-        return [round(value, 2)
-                for value in values]    # This line return the NonScie
+        return [NonScientificAxis.formatValue(value) for value in values]
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def formatValue(value: float):
+        '''
+            Format a tick value, repaints ask for the same ticks again and
+            again so the strings are kept
+
+            Args:
+                value (float): The tick value
+
+            Returns:
+                (str)
+        '''
+        return str(round(value, 2))
 
 
 class DateAxis(pg.AxisItem):
     '''
-        This is used to print the date string on the axis
+        This is used to print the date string on the axis, x values are day
+        numbers and ticks are snapped to trading days, months or years
+        depending on how many fit
 
         Args:
             *args (args):      Unnamed parameters
             **kwargs (kwargs): Named parameters
     '''
+
+    # The width of a tick label in pixels, to work out how many fit
+    TICK_WIDTH = 90
+
+    # (unit, step, label format) from finest to coarsest, the finest that
+    # fits is used
+    STEPS = [('D', 1, Constants.PY_DATE_FORMAT),
+             ('W', 1, Constants.PY_DATE_FORMAT),
+             ('W', 2, Constants.PY_DATE_FORMAT), ('M', 1, '%b %Y'),
+             ('M', 3, '%b %Y'), ('M', 6, '%b %Y'), ('Y', 1, '%Y'),
+             ('Y', 2, '%Y'), ('Y', 5, '%Y'), ('Y', 10, '%Y')]
+
+    # The approximate length of each unit in days
+    UNIT_DAYS = {'D': 1, 'W': 7, 'M': 30.4, 'Y': 365.25}
+
     def __init__(self, *args, **kwargs):
         super(DateAxis, self).__init__(*args, **kwargs)
 
+    def tickValues(self, minVal, maxVal, size):
+        '''
+            Place ticks on day, week, month or year boundaries, picking the
+            finest step that leaves room for the labels
+
+            Args:
+                minVal  (float):    The lowest day number in view
+                maxVal  (float):    The highest day number in view
+                size    (float):    The length of the axis in pixels
+
+            Returns:
+                (List[tuple(float, List[float])])
+        '''
+        minVal, maxVal = sorted((minVal, maxVal))
+        fit = max(size / self.TICK_WIDTH, 2)
+        unit, step, _ = self.getStep(maxVal - minVal, fit)
+        dtype = 'datetime64[%s]' % unit
+        first = np.datetime64(int(np.floor(minVal)), 'D').astype(dtype)
+        last = np.datetime64(int(np.ceil(maxVal)), 'D').astype(dtype)
+        # Start on a multiple of the step, so 3 months are quarters
+        first -= first.astype(np.int64) % step
+        days = np.arange(first, last + 1, step).astype('datetime64[D]')
+        days = days.astype(np.int64)
+        if unit == 'W':
+            # datetime64 weeks start on a Thursday, the epoch, so shift the
+            # boundaries onto Mondays
+            days += 4
+        days = days[(days >= minVal) & (days <= maxVal)]
+        if unit == 'D':
+            # Only label trading days, the epoch was a Thursday
+            days = days[(days + 3) % 7 < 5]
+        return [(step * self.UNIT_DAYS[unit], days.tolist())]
+
+    def getStep(self, span: float, fit: float):
+        '''
+            Find the finest step with no more ticks than fit in a span
+
+            Args:
+                span    (float):    The number of days in view
+                fit     (float):    The number of ticks that fit
+
+            Returns:
+                (tuple(str, int, str)) The unit, step and label format
+        '''
+        for unit, step, dateFormat in self.STEPS:
+            if span / (step * self.UNIT_DAYS[unit]) <= fit:
+                return unit, step, dateFormat
+        unit, step, dateFormat = self.STEPS[-1]
+        # Beyond the coarsest step, widen it in whole multiples
+        step *= int(np.ceil(span / (step * self.UNIT_DAYS[unit] * fit)))
+        return unit, step, dateFormat
+
     def tickStrings(self, values, scale, spacing):
         '''
             For ticks, convert them to date strings
@@ -64,67 +148,240 @@ class DateAxis(pg.AxisItem):
             Returns:
                 (List[str])
         '''
+        _, _, dateFormat = self.getStep(spacing, 1)
         return [
-            datetime.date.fromtimestamp(int(value)).strftime(
-                Constants.PY_DATE_FORMAT) for value in values
+            DateAxis.formatDay(int(round(value)), dateFormat)
+            for value in values
         ]
 
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def formatDay(dayNumber: int, dateFormat: str):
+        '''
+            Format a day number, repaints ask for the same ticks again and
+            again so the strings are kept
+
+            Args:
+                dayNumber   (int):  Days since the epoch
+                dateFormat  (str):  The strftime format
+
+            Returns:
+                (str)
+        '''
+        return StockDate.toDate(dayNumber).strftime(dateFormat)
+
 
 class StockLineGraph(pg.GraphicsLayoutWidget):
     '''
-        Creates a stock line graph widget
+        Creates a stock line graph widget, keeping one curve per stock that
+        is updated in place, over the volume of each stock sharing its x
+        axis. Each stock's volume is drawn in a view of its own, scaled to
+        its own range in view, so a thinly traded stock isn't flattened by
+        a heavily traded one
 
         Args:
             title (str): A title for the graph
     '''
     prefix = "Stock"
 
+    volumeHeight = 100
+
     def __init__(self, title: str = ''):
         super().__init__()
         self.setStyleSheet("min-height: 300px")
+        self.volumeViews = {}
         self.initGraph(title)
 
     def initGraph(self, title: str = ''):
         '''
             Clear and initialize the graph
         '''
+        # The volume views sit on the scene rather than in the layout
+        for view in self.volumeViews.values():
+            self.scene().removeItem(view)
         self.clear()
-        self.lowestValue = 0
-        self.highestValue = 0
+        self.title = title
+        self.curves = {}
+        self.volumes = {}
+        self.volumeViews = {}
+        self.bounds = {}
         self.plotCount = 0
-        self.plot = self.addPlot(title="%s : %s" % (self.prefix, title),
+        self.plot = self.addPlot(title=self.getTitle(title),
                                  axisItems={
                                      'left':
                                      NonScientificAxis(orientation='left'),
                                      'bottom': DateAxis(orientation='bottom')
                                  })
-        self.plot.addLegend(offset=(0, 0))
+        self.legend = self.plot.addLegend(offset=(0, 0))
+        # Only draw the points in view, reduced to a min/max pair per pixel
+        # column, so the cost of a redraw follows the width of the graph
+        # rather than the length of the series. Detail returns on zooming in
+        self.plot.setDownsampling(auto=True, mode='peak')
+        self.plot.setClipToView(True)
+        self.nextRow()
+        self.volumePlot = self.addPlot(
+            axisItems={'left': NonScientificAxis(orientation='left')})
+        self.volumePlot.setXLink(self.plot)
+        self.volumePlot.setMaximumHeight(self.volumeHeight)
+        self.volumePlot.setMouseEnabled(y=False)
+        self.volumePlot.hideAxis('bottom')
+        # Every stock has its own scale, so the axis only names the row
+        self.volumePlot.setLabel('left', 'Volume')
+        self.volumePlot.getAxis('left').setStyle(showValues=False)
+        self.volumePlot.vb.sigResized.connect(self.updateVolumeViews)
 
-    def plotStock(self, label: str, x, y, low: float, high: float):
+    def getTitle(self, title: str):
         '''
-            Plot a stock to the graph
+            Build the title of the graph
 
             Args:
-                label   (str):          The label for the stock
-                x       (List[str]):    Each point represents a day
-                y       (List[float]):  Each entry represents the value of the stock
-                low     (float):        The low for this stock entry
-                high    (float):        The high for this stock entry
-        '''
-        # Redraw the y axis depending on the high and low points
-        if self.highestValue is None or high > self.highestValue:
-            self.highestValue = high
-            self.plot.setYRange(self.lowestValue, self.highestValue)
-        elif self.lowestValue is None or low < self.lowestValue:
-            self.lowestValue = low
-            self.plot.setYRange(self.lowestValue, self.highestValue)
-        # Add a plot to the plot
-        self.plot.plot(antialias=True,
-                       x=x,
-                       y=y,
-                       name=label,
-                       pen=pg.intColor(self.plotCount))
-        self.plotCount += 1
+                title (str): The title of the current option
+
+            Returns:
+                (str)
+        '''
+        return "%s : %s" % (self.prefix, title)
+
+    def setTitle(self, title: str):
+        '''
+            Update the title of the graph
+
+            Args:
+                title (str): The title of the current option
+        '''
+        self.title = title
+        self.plot.setTitle(self.getTitle(title))
+
+    def setError(self, error: str):
+        '''
+            Show an error in place of the title, until the next plot
+
+            Args:
+                error (str): The error message
+        '''
+        self.plot.setTitle(error, color='r')
+
+    def getLabels(self):
+        '''
+            Return the labels of the stock plotted
+
+            Returns:
+                (List[str])
+        '''
+        return list(self.curves.keys())
+
+    def plotStock(self,
+                  label: str,
+                  x,
+                  y,
+                  low: float,
+                  high: float,
+                  volume=None):
+        '''
+            Plot a stock to the graph, replacing the data of its curve and
+            volume if it's already plotted
+
+            Args:
+                label   (str):              The label for the stock
+                x       (ndarray[int]):     The day number of each point
+                y       (ndarray[float]):   Each entry represents the value of the stock
+                low     (float):            The low for this stock entry
+                high    (float):            The high for this stock entry
+                volume  (ndarray[float]):   The volume traded each day
+        '''
+        if volume is None:
+            volume = np.zeros(len(x))
+        self.setTitle(self.title)
+        if label in self.curves:
+            self.curves[label].setData(x=x, y=y)
+            self.volumes[label].setData(x=x, y=volume)
+        else:
+            # Add a plot to the plot
+            self.curves[label] = self.plot.plot(antialias=True,
+                                                x=x,
+                                                y=y,
+                                                name=label,
+                                                pen=pg.intColor(
+                                                    self.plotCount))
+            # And its volume, in the same colour
+            self.volumes[label] = self.addVolume(label, x, volume)
+            self.plotCount += 1
+        # An empty series has no bounds to add
+        if high is None or low is None:
+            self.bounds.pop(label, None)
+        else:
+            self.bounds[label] = (low, high)
+        self.updateRange()
+
+    def removeStock(self, label: str):
+        '''
+            Remove a stock from the graph
+
+            Args:
+                label (str): The label for the stock
+        '''
+        curve = self.curves.pop(label, None)
+        if curve is None:
+            return
+        self.bounds.pop(label, None)
+        self.legend.removeItem(label)
+        self.plot.removeItem(curve)
+        del self.volumes[label]
+        self.volumePlot.scene().removeItem(self.volumeViews.pop(label))
+        self.updateRange()
+
+    def addVolume(self, label: str, x, volume):
+        '''
+            Add the volume of a stock as a filled curve in a view of its
+            own, linked to the x axis of the graph. Like the price curves
+            it's clipped to the view and reduced to a min/max pair per pixel
+            column
+
+            Args:
+                label   (str):              The label for the stock
+                x       (ndarray[int]):     The day number of each point
+                volume  (ndarray[float]):   The volume traded each day
+
+            Returns:
+                (PlotDataItem)
+        '''
+        item = pg.PlotDataItem(x=x,
+                               y=volume,
+                               pen=None,
+                               fillLevel=0,
+                               brush=pg.intColor(self.plotCount, alpha=96))
+        item.setDownsampling(auto=True, method='peak')
+        item.setClipToView(True)
+        view = pg.ViewBox(enableMouse=False)
+        # Filled before it's on the scene, otherwise the item is put on the
+        # scene first, where it can't find its view to clip to
+        view.addItem(item)
+        # Scale to the volume in view, from zero
+        view.setLimits(yMin=0)
+        view.setAutoVisible(y=True)
+        view.enableAutoRange(axis=pg.ViewBox.YAxis)
+        self.volumePlot.scene().addItem(view)
+        view.setXLink(self.volumePlot)
+        view.setGeometry(self.volumePlot.vb.sceneBoundingRect())
+        self.volumeViews[label] = view
+        return item
+
+    def updateVolumeViews(self):
+        '''
+            Keep the volume views over the volume plot as it's resized
+        '''
+        rect = self.volumePlot.vb.sceneBoundingRect()
+        for view in self.volumeViews.values():
+            view.setGeometry(rect)
+
+    def updateRange(self):
+        '''
+            Redraw the y axis depending on the high and low points
+        '''
+        if not self.bounds:
+            return
+        lows, highs = zip(*self.bounds.values())
+        self.plot.setYRange(min(lows), max(highs))
 
 
 class GraphOptions(QWidget):
@@ -0,0 +1,158 @@
+'''
+    Stock Screen Components
+    Widgets for screening every stock between two dates
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from .value_data import CurrencyValue, NumberValue, PercentageValue
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QTableView
+import math
+
+
+class StockScreenModel(QAbstractTableModel):
+    '''
+        Table model over a StockProfitTable, sorting reorders the table's
+        columns rather than the view comparing cells
+
+        Args:
+            table   (StockProfitTable): The screened stock
+            parent  (QObject):          The parent of the model
+    '''
+
+    # (header, profit table column, value type)
+    COLUMNS = [("Stock", "label", str),
+               ("Gain", "percentageGain", PercentageValue),
+               ("Average Change", "averageChange", CurrencyValue),
+               ("Lowest Margin", "lowestMargin", CurrencyValue),
+               ("Highest Margin", "highestMargin", CurrencyValue),
+               ("Average Margin", "averageMargin", CurrencyValue),
+               ("Average Volume", "averageVolume", NumberValue),
+               ("VWAP Change", "vwapChange", CurrencyValue)]
+
+    def __init__(self, table=None, parent=None):
+        super().__init__(parent)
+        self.table = table
+
+    def rowCount(self, parent=QModelIndex()):
+        '''
+            The number of rows, a table has no children
+
+            Args:
+                parent (QModelIndex): The parent row
+
+            Returns:
+                (int)
+        '''
+        if parent.isValid() or self.table is None:
+            return 0
+        return self.table.getSize()
+
+    def columnCount(self, parent=QModelIndex()):
+        '''
+            The number of columns
+
+            Args:
+                parent (QModelIndex): The parent row
+
+            Returns:
+                (int)
+        '''
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        '''
+            The header for a column
+
+            Args:
+                section     (int):              The column (or row)
+                orientation (Qt.Orientation):   The header orientation
+                role        (int):              The data role
+
+            Returns:
+                (str || None)
+        '''
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][0]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index, role=Qt.DisplayRole):
+        '''
+            The formatted value for a cell
+
+            Args:
+                index   (QModelIndex):  The cell
+                role    (int):          The data role
+
+            Returns:
+                (str || None)
+        '''
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        _, name, valueType = self.COLUMNS[index.column()]
+        if valueType is str:
+            return str(self.table.getLabels()[index.row()])
+        value = float(self.table.getColumn(name)[index.row()])
+        if math.isnan(value):
+            return '-'
+        if valueType is CurrencyValue:
+            return str(CurrencyValue('$', value))
+        return str(valueType(value))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        '''
+            Sort the rows by a column
+
+            Args:
+                column  (int):          The column
+                order   (Qt.SortOrder): The sort order
+        '''
+        if self.table is None:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self.table = self.table.sortBy(self.COLUMNS[column][1],
+                                       order == Qt.DescendingOrder)
+        self.layoutChanged.emit()
+
+    def setTable(self, table):
+        '''
+            Replace the screened stock
+
+            Args:
+                table (StockProfitTable): The screened stock
+        '''
+        self.beginResetModel()
+        self.table = table
+        self.endResetModel()
+
+
+class StockScreenTable(QTableView):
+    '''
+        Stock screen table widget extends QTableView, backed by a
+        StockScreenModel, and sorted by clicking a header
+
+        Args:
+            parent (QWidget): The parent to attach the widget to
+    '''
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.screenModel = StockScreenModel(parent=self)
+        self.setModel(self.screenModel)
+        self.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.verticalHeader().hide()
+        self.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.setSortingEnabled(True)
+        self.sortByColumn(1, Qt.DescendingOrder)
+
+    def updateTable(self, table):
+        '''
+            Show a new screen, keeping the current sort
+
+            Args:
+                table (StockProfitTable): The screened stock
+        '''
+        self.screenModel.setTable(table)
+        header = self.horizontalHeader()
+        self.screenModel.sort(header.sortIndicatorSection(),
+                              header.sortIndicatorOrder())
@@ -6,9 +6,11 @@
         Matthew Barber <mfmbarber@gmail.com>
 '''
 from app.lib.constants import Constants
-from PyQt5.QtCore import pyqtSignal, QRegExp
+from app.model.stock_index import StockIndex
+from PyQt5.QtCore import (pyqtSignal, QAbstractListModel,
+                          QAbstractProxyModel, QModelIndex, QRegExp, Qt)
 from PyQt5.QtGui import QRegExpValidator
-from PyQt5.QtWidgets import (QComboBox, QPushButton, QLineEdit, QListWidget,
+from PyQt5.QtWidgets import (QComboBox, QPushButton, QLineEdit, QListView,
                              QAbstractItemView)
 
 
@@ -49,9 +51,232 @@ class StockFilter(QLineEdit):
         self.onChange.emit(value)
 
 
-class StockList(QListWidget):
+class StockListModel(QAbstractListModel):
     '''
-        Stock list widget extends QListWidget
+        List model holding every label the stock list can show, labels are
+        only ever added, and the view only asks for the rows it draws
+
+        Args:
+            values (List[str]): Base values
+            parent (QObject):   The parent of the model
+    '''
+    def __init__(self, values, parent=None):
+        super().__init__(parent)
+        self.values = []
+        self.rows = {}
+        self.addValues(values)
+
+    def rowCount(self, parent=QModelIndex()):
+        '''
+            The number of rows, a list has no children
+
+            Args:
+                parent (QModelIndex): The parent row
+
+            Returns:
+                (int)
+        '''
+        return 0 if parent.isValid() else len(self.values)
+
+    def data(self, index, role=Qt.DisplayRole):
+        '''
+            The label for a row
+
+            Args:
+                index   (QModelIndex):  The row
+                role    (int):          The data role
+
+            Returns:
+                (str || None)
+        '''
+        if role == Qt.DisplayRole and index.isValid():
+            return self.values[index.row()]
+        return None
+
+    def getValue(self, row: int):
+        '''
+            Getter for the label of a row
+
+            Args:
+                row (int): The row
+
+            Returns:
+                (str)
+        '''
+        return self.values[row]
+
+    def getRow(self, value: str):
+        '''
+            Getter for the row of a label
+
+            Args:
+                value (str): The label
+
+            Returns:
+                (int)
+        '''
+        return self.rows[value]
+
+    def addValues(self, values):
+        '''
+            Append labels, any already in the model are skipped
+
+            Args:
+                values (List[str]): The labels to add
+        '''
+        values = [value for value in dict.fromkeys(values)
+                  if value not in self.rows]
+        if not values:
+            return
+        start = len(self.values)
+        self.beginInsertRows(QModelIndex(), start, start + len(values) - 1)
+        self.rows.update((value, row)
+                         for row, value in enumerate(values, start))
+        self.values.extend(values)
+        self.endInsertRows()
+
+
+class StockFilterModel(QAbstractProxyModel):
+    '''
+        Proxy over a StockListModel showing the labels matching a filter,
+        searched through a StockIndex. Pinned labels are always shown first,
+        followed by the labels starting with the filter then the rest. The
+        shown rows are set straight from the search, so a filter costs the
+        labels found rather than a check of every label
+
+        Args:
+            values (List[str]): The labels to index
+            parent (QObject):   The parent of the model
+    '''
+    def __init__(self, values, parent=None):
+        super().__init__(parent)
+        self.stockIndex = StockIndex(values)
+        # The list model row of each shown row, and the reverse
+        self.sourceRows = []
+        self.ranks = {}
+
+    def addValues(self, values):
+        '''
+            Index new labels, they're shown on the next filter
+
+            Args:
+                values (List[str]): The labels to add
+        '''
+        self.stockIndex.addLabels(values)
+
+    def setFilter(self, value: str, pinned=[]):
+        '''
+            Filter and order the rows, the rows that stay shown keep their
+            selection
+
+            Args:
+                value   (str):          The value to search for
+                pinned  (List[str]):    Labels to show first regardless
+        '''
+        labels = dict.fromkeys(pinned)
+        labels.update(dict.fromkeys(self.stockIndex.search(value)))
+        self.layoutAboutToBeChanged.emit()
+        # Only the rows with a persistent index (the selected and current
+        # rows) are moved, rows no longer shown lose theirs
+        before = self.persistentIndexList()
+        sourceRows = [self.sourceRows[index.row()] for index in before]
+        self.sourceRows = [
+            self.sourceModel().getRow(label) for label in labels
+        ]
+        self.ranks = {row: rank for rank, row in enumerate(self.sourceRows)}
+        self.changePersistentIndexList(before, [
+            self.index(self.ranks[row], 0) if row in self.ranks else
+            QModelIndex() for row in sourceRows
+        ])
+        self.layoutChanged.emit()
+
+    def index(self, row: int, column: int, parent=QModelIndex()):
+        '''
+            The index of a shown row
+
+            Args:
+                row     (int):          The shown row
+                column  (int):          The column
+                parent  (QModelIndex):  The parent row
+
+            Returns:
+                (QModelIndex)
+        '''
+        if (parent.isValid() or column != 0
+                or not 0 <= row < len(self.sourceRows)):
+            return QModelIndex()
+        return self.createIndex(row, column)
+
+    def parent(self, index=QModelIndex()):
+        '''
+            A list has no parent rows
+
+            Args:
+                index (QModelIndex): The row
+
+            Returns:
+                (QModelIndex)
+        '''
+        return QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        '''
+            The number of shown rows, a list has no children
+
+            Args:
+                parent (QModelIndex): The parent row
+
+            Returns:
+                (int)
+        '''
+        return 0 if parent.isValid() else len(self.sourceRows)
+
+    def columnCount(self, parent=QModelIndex()):
+        '''
+            A list has a single column
+
+            Args:
+                parent (QModelIndex): The parent row
+
+            Returns:
+                (int)
+        '''
+        return 0 if parent.isValid() else 1
+
+    def mapToSource(self, proxyIndex):
+        '''
+            The list model row of a shown row
+
+            Args:
+                proxyIndex (QModelIndex): A shown row
+
+            Returns:
+                (QModelIndex)
+        '''
+        if not proxyIndex.isValid():
+            return QModelIndex()
+        return self.sourceModel().index(self.sourceRows[proxyIndex.row()], 0)
+
+    def mapFromSource(self, sourceIndex):
+        '''
+            The shown row of a list model row, if it's shown
+
+            Args:
+                sourceIndex (QModelIndex): A list model row
+
+            Returns:
+                (QModelIndex)
+        '''
+        if not sourceIndex.isValid() or sourceIndex.row() not in self.ranks:
+            return QModelIndex()
+        return self.index(self.ranks[sourceIndex.row()], 0)
+
+
+class StockList(QListView):
+    '''
+        Stock list widget extends QListView, showing a StockListModel
+        populated once through a StockFilterModel, filtering only changes
+        which rows are shown so the selection is kept
 
         Args:
             values (List[str]):     Base values
@@ -62,39 +287,68 @@ class StockList(QListWidget):
 
     def __init__(self, values, selected, parent=None):
         super().__init__(parent)
-        self.addItems(values)
+        self.updating = False
+        self.stockModel = StockListModel(values, self)
+        self.filterModel = StockFilterModel(values, self)
+        self.filterModel.setSourceModel(self.stockModel)
+        self.filterModel.setFilter('')
+        self.setModel(self.filterModel)
+        # Rows are all the same size, so only the visible rows are laid out
+        self.setUniformItemSizes(True)
         # We override the selection mode to allow for multiple values to be selected
         self.setSelectionMode(QAbstractItemView.MultiSelection)
-        self.itemSelectionChanged.connect(self.stockChange)
+        self.selectionModel().selectionChanged.connect(self.stockChange)
+
+    def addValues(self, values):
+        '''
+            Add labels to the list, they're shown on the next filter
+
+            Args:
+                values (List[str]): The labels to add
+        '''
+        self.filterModel.addValues(values)
+        self.stockModel.addValues(values)
 
-    def updateValues(self, values, clearSelected: bool = False):
+    def filterValues(self, value: str, clearSelected: bool = False):
         '''
-            Overwrite the list of values, retaining the current selected
+            Show the labels matching a value, the selected labels stay
+            shown and selected, first in the list
 
             Args:
-                values          (List[str]):    Update values
-                clearSelected   bool:           Allow busting the selected options
+                value           (str):  The value to search for
+                clearSelected   bool:   Allow busting the selected options
+        '''
+        self.updating = True
+        if clearSelected:
+            self.selectionModel().clearSelection()
+        self.filterModel.setFilter(value, self.getSelected())
+        self.updating = False
+
+    def getSelected(self):
         '''
-        # temporary store the selected items
-        selected = [
-            item.text() for item in self.selectedItems() if not clearSelected
+            Return the selected labels in row order
+
+            Returns:
+                (List[str])
+        '''
+        return [
+            self.stockModel.getValue(
+                self.filterModel.mapToSource(index).row())
+            for index in sorted(self.selectionModel().selectedIndexes(),
+                                key=lambda index: index.row())
         ]
-        self.clear()
-        # add the selected + new values
-        self.addItems(selected + values)
-        # update the selected items
-        for i in range(len(selected)):
-            self.item(i).setSelected(True)
 
     def stockChange(self, selected=[]):
         '''
             On the stock selection changing, get the values, and emit signal
 
             Args:
-                selected (List[str]): The selected options
+                selected (QItemSelection): The newly selected rows
         '''
-        items = list([item.text() for item in self.selectedItems()] + selected)
-        self.onChange.emit(items)
+        # Filtering the rows isn't a change
+        if self.updating:
+            return
+        self.onChange.emit(self.getSelected())
 
 
 class StockSelector(QComboBox):
@@ -165,3 +165,29 @@ class PercentageValue(BaseValue):
         if not self.isValueValid():
             return str(self.value)
         return str(self.value) + self.symbol
+
+
+class NumberValue(BaseValue):
+    '''
+        Number value class, with thousands separated
+
+        Args:
+            value (float/int): The number
+    '''
+    typeCheckers = [
+        lambda v: isinstance(v, int), lambda v: isinstance(v, float)
+    ]
+
+    def __init__(self, value):
+        super().__init__(value)
+
+    def __str__(self):
+        '''
+            Magic method (for str(...) calls)
+
+            Returns:
+                (str)
+        '''
+        if not self.isValueValid():
+            return str(self.value)
+        return "{:,}".format(round(float(self.value), 2))
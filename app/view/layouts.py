@@ -176,7 +176,13 @@ class AnalysisLayout(BaseRowGroupedLayout):
     '''
         Analysis controller layout
     '''
-    def __init__(self, stockSelector, overview, averageValues, parent=None):
+    def __init__(self,
+                 stockSelector,
+                 overview,
+                 averageValues,
+                 windowValues,
+                 volumeValues,
+                 parent=None):
         super().__init__(parent)
         autoWidthFixedHeight = (QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.createVerticalGroup("Stock Selector", autoWidthFixedHeight)
@@ -187,6 +193,8 @@ class AnalysisLayout(BaseRowGroupedLayout):
         self.finishGroup()
         self.createVerticalGroup("Analysis", autoWidthFixedHeight)
         self.addToCurrentGroup(averageValues)
+        self.addToCurrentGroup(windowValues)
+        self.addToCurrentGroup(volumeValues)
         self.finishGroup()
         self.setStretch(2, 0)
 
@@ -236,7 +244,7 @@ class ProfitLayout(BaseRowGroupedLayout):
     '''
         Profit controller layout
     '''
-    def __init__(self, stockSelector, profitValue, parent=None):
+    def __init__(self, stockSelector, profitValue, status, parent=None):
         super().__init__(parent)
         autoWidthFixedHeight = (QSizePolicy.Expanding, QSizePolicy.Fixed)
         self.createVerticalGroup("Stock Selector", autoWidthFixedHeight,
@@ -244,11 +252,23 @@ class ProfitLayout(BaseRowGroupedLayout):
         self.addToCurrentGroup(stockSelector)
         self.finishGroup()
         self.createVerticalGroup("Profits", autoWidthFixedHeight, Qt.AlignTop)
-        self.addToCurrentGroup(profitValue)
+        self.addToCurrentGroup(status, profitValue)
         self.finishGroup()
         self.setAlignment(Qt.AlignTop)
 
 
+class ScreenLayout(BaseRowGroupedLayout):
+    '''
+        Screen controller layout
+    '''
+    def __init__(self, screenTable, parent=None):
+        super().__init__(parent)
+        self.createVerticalGroup(
+            "All Stock", (QSizePolicy.Expanding, QSizePolicy.Expanding))
+        self.addToCurrentGroup(screenTable)
+        self.finishGroup()
+
+
 class StockLayout(BaseRowGroupedLayout):
     '''
         Stock controller layout
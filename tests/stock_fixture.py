@@ -0,0 +1,94 @@
+'''
+    Stock Fixture
+    Small generated stock sources and models for the tests
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock import Stock
+from app.model.stock_source_mapped_file import StockSourceMappedFile
+import numpy as np
+import os
+import tempfile
+
+HEADER = 'date,open,high,low,close,volume,Name\n'
+
+
+def createRows(labels=('AAA', 'BBB', 'CCC', 'DDD'),
+               fromDate='2014-01-01',
+               toDate='2014-07-01',
+               seed=0):
+    '''
+        Generate a random walk of daily values for each label, each stock
+        missing some trading days so they don't share a calendar
+
+        Args:
+            labels      (List[str]):    The stock labels
+            fromDate    (str):          The first date
+            toDate      (str):          The date to stop before
+            seed        (int):          The random seed
+
+        Returns:
+            (List[tuple]) Rows of date, open, high, low, close, volume, name
+    '''
+    random = np.random.RandomState(seed)
+    days = np.arange(fromDate, toDate, dtype='datetime64[D]')
+    days = days[np.is_busday(days)]
+    rows = []
+    for label in labels:
+        kept = days[random.rand(len(days)) > 0.1]
+        close = np.round(
+            50 * np.exp(np.cumsum(random.normal(0, 0.02, len(kept)))), 2)
+        open = np.round(close * (1 + random.normal(0, 0.01, len(kept))), 2)
+        high = np.maximum(open, close) + np.round(random.rand(len(kept)), 2)
+        low = np.minimum(open, close) - np.round(random.rand(len(kept)), 2)
+        volume = random.randint(1000, 100000, len(kept))
+        rows.extend(
+            (str(day), float(o), float(h), float(lo), float(c), int(v), label)
+            for day, o, h, lo, c, v in zip(kept, open, high, low, close,
+                                           volume))
+    return rows
+
+
+def writeSource(directory, rows, name='stock.csv', header=HEADER):
+    '''
+        Write rows to a csv source
+
+        Args:
+            directory   (str):          The directory to write to
+            rows        (List[tuple]):  The rows
+            name        (str):          The file name
+            header      (str):          The header line
+
+        Returns:
+            (str) The location of the source
+    '''
+    location = os.path.join(directory, name)
+    with open(location, mode='w', newline='') as handler:
+        handler.write(header)
+        for row in rows:
+            handler.write(','.join(str(value) for value in row) + '\n')
+    return location
+
+
+def loadModel(rows, **options):
+    '''
+        Load a model from rows, through a temporary csv source
+
+        Args:
+            rows    (List[tuple]):  The rows
+            options (kwargs):       Options for Stock.load
+
+        Returns:
+            (Stock)
+    '''
+    options.setdefault('useSnapshot', False)
+    with tempfile.TemporaryDirectory() as directory:
+        source = StockSourceMappedFile(writeSource(directory, rows))
+        model = Stock()
+        model.load(source, **options)
+        # Lazy nodes read from the source, so parse them before it goes
+        for node in model.selectAll().values():
+            node.mergePending()
+        source.close()
+    return model
@@ -0,0 +1,76 @@
+'''
+    Command Line Interface Tests
+    Validation of the command line and of profit input rows
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.cli import StockCli
+from tests.stock_fixture import createRows, writeSource
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+
+class TestStockCli(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.source = writeSource(self.directory.name, createRows(seed=10))
+
+    def runCli(self, *argv):
+        stream, errors = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stderr(errors):
+            status = StockCli(stream).run(
+                list(argv) + ['--source', self.source, '--no-snapshot'])
+        return status, list(csv.DictReader(io.StringIO(
+            stream.getvalue()))), errors.getvalue()
+
+    def testReversedRange(self):
+        for command in ('profit', 'average', 'best-window', 'export', 'screen',
+                        'breadth'):
+            with self.assertRaises(SystemExit) as error:
+                self.runCli(command, '--from', '2014-05-01', '--to',
+                            '2014-03-01')
+            self.assertEqual(error.exception.code, 2)
+
+    def testDatesAreZeroPadded(self):
+        status, rows, _ = self.runCli('average', '--stock', 'AAA', '--from',
+                                      '2014-3-3', '--to', '2014-4-1')
+        self.assertEqual(status, 0)
+        self.assertEqual((rows[0]["fromDate"], rows[0]["toDate"]),
+                         ('2014-03-03', '2014-04-01'))
+
+    def testProfitInputSkipsBadRows(self):
+        location = os.path.join(self.directory.name, 'scenarios.csv')
+        with open(location, mode='w') as handler:
+            handler.write('stock,buy,sell,amount\n'
+                          'aaa,2014-03-03,2014-04-01,10\n'
+                          'AAA,2014-3-3,2014-04-01,1\n'
+                          'AAA,2014-13-01,2014-04-01,1\n'
+                          'AAA,2014-03-03,2014-04-01,x\n'
+                          'AAA,2014-05-01,2014-04-01,1\n'
+                          ',2014-03-03,2014-04-01,1\n')
+        status, rows, errors = self.runCli('profit', '--input', location)
+        self.assertEqual(status, 1)
+        self.assertEqual([(row["stock"], row["buyDate"], row["amount"])
+                          for row in rows], [('AAA', '2014-03-03', '10.0'),
+                                             ('AAA', '2014-03-03', '1.0')])
+        self.assertEqual(
+            [line.split(':')[0] for line in errors.splitlines()],
+            ['%s line %d' % (location, line) for line in range(4, 8)])
+
+    def testProfitInputAllValid(self):
+        location = os.path.join(self.directory.name, 'scenarios.csv')
+        with open(location, mode='w') as handler:
+            handler.write('stock,buy,sell\nAAA,,\nBBB,2014-03-03,\n')
+        status, rows, errors = self.runCli('profit', '--input', location)
+        self.assertEqual((status, len(rows), errors), (0, 2, ''))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,116 @@
+'''
+    Stock Indicators Tests
+    The sliding window kernels against each window worked out in turn
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.lib.constants import Constants
+from app.model.stock_indicators import StockIndicators
+import math
+import numpy as np
+import unittest
+
+
+class TestStockIndicators(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        random = np.random.RandomState(5)
+        cls.close = 100 * np.exp(np.cumsum(random.normal(0, 0.02, 120)))
+        cls.high = cls.close + random.rand(120)
+        cls.low = cls.close - random.rand(120)
+
+    def assertValues(self, values, expected, start):
+        # Rows before the first full window are NaN
+        self.assertTrue(np.isnan(values[:start]).all())
+        np.testing.assert_allclose(values[start:], expected[start:],
+                                   rtol=1e-9, atol=1e-9)
+
+    def smooth(self, values, window, alpha):
+        result = [math.nan] * len(values)
+        average = sum(values[:window]) / window
+        result[window - 1] = average
+        for row in range(window, len(values)):
+            average = average * (1 - alpha) + values[row] * alpha
+            result[row] = average
+        return np.array(result)
+
+    def testSma(self):
+        expected = [
+            np.mean(self.close[row - 9:row + 1]) if row >= 9 else math.nan
+            for row in range(len(self.close))
+        ]
+        self.assertValues(StockIndicators.sma(self.close, 10),
+                          np.array(expected), 9)
+
+    def testEma(self):
+        self.assertValues(StockIndicators.ema(self.close, 10),
+                          self.smooth(self.close.tolist(), 10, 2 / 11), 9)
+
+    def testBollinger(self):
+        expected = np.full(len(self.close), math.nan)
+        for row in range(19, len(self.close)):
+            window = self.close[row - 19:row + 1]
+            mean, deviation = np.mean(window), np.std(window)
+            lower = mean - 2 * deviation
+            expected[row] = ((self.close[row] - lower) / (4 * deviation) *
+                             100)
+        self.assertValues(StockIndicators.bollinger(self.close, 20),
+                          expected, 19)
+
+    def testRsi(self):
+        changes = np.diff(self.close).tolist()
+        gains = self.smooth([max(change, 0) for change in changes], 14,
+                            1 / 14)
+        losses = self.smooth([max(-change, 0) for change in changes], 14,
+                             1 / 14)
+        expected = np.concatenate(([math.nan],
+                                   100 - 100 / (1 + gains / losses)))
+        self.assertValues(StockIndicators.rsi(self.close, 14), expected, 14)
+
+    def testAtr(self):
+        ranges = [self.high[0] - self.low[0]] + [
+            max(self.high[row] - self.low[row],
+                abs(self.high[row] - self.close[row - 1]),
+                abs(self.low[row] - self.close[row - 1]))
+            for row in range(1, len(self.close))
+        ]
+        self.assertValues(
+            StockIndicators.atr(self.high, self.low, self.close, 14),
+            self.smooth(ranges, 14, 1 / 14), 13)
+
+    def testVolatility(self):
+        returns = np.diff(np.log(self.close))
+        expected = np.full(len(self.close), math.nan)
+        for row in range(20, len(self.close)):
+            expected[row] = (np.std(returns[row - 20:row]) *
+                             math.sqrt(StockIndicators.TRADING_DAYS) * 100)
+        self.assertValues(StockIndicators.volatility(self.close, 20),
+                          expected, 20)
+
+    def testFlatValues(self):
+        flat = np.full(30, 10.0)
+        self.assertValues(StockIndicators.bollinger(flat, 20),
+                          np.full(30, 50.0), 19)
+        self.assertValues(StockIndicators.rsi(flat, 14), np.full(30, 50.0),
+                          14)
+        rising = np.arange(30, dtype=float)
+        self.assertValues(StockIndicators.rsi(rising, 14),
+                          np.full(30, 100.0), 14)
+
+    def testShorterThanTheWindow(self):
+        for name, window in StockIndicators.WINDOWS.items():
+            values = StockIndicators.calculate(name, window,
+                                               self.high[:window - 1],
+                                               self.low[:window - 1],
+                                               self.close[:window - 1])
+            self.assertTrue(np.isnan(values).all(), name)
+
+    def testUnknownIndicator(self):
+        with self.assertRaises(IndexError):
+            StockIndicators.calculate(Constants.GraphOptions.AVERAGE, 10,
+                                      self.high, self.low, self.close)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+'''
+    Stock Panel Tests
+    Cross sections, movers and breadth against each stock's own rows
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from tests.stock_fixture import createRows, loadModel
+import math
+import unittest
+
+
+class TestStockPanel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rows = createRows(labels=('AAA', 'BBB', 'CCC', 'DDD', 'EEE'),
+                              seed=4)
+        cls.model = loadModel(cls.rows)
+        cls.closes = {}
+        for date, _, _, _, close, _, label in cls.rows:
+            cls.closes.setdefault(label, {})[date] = close
+        cls.dates = sorted({row[0] for row in cls.rows})
+
+    def getPreviousClose(self, label, date):
+        # The stock's last close before the date, however long ago
+        before = [day for day in self.closes[label] if day < date]
+        return self.closes[label][max(before)] if before else None
+
+    def getChange(self, label, date):
+        close = self.closes[label].get(date)
+        previousClose = self.getPreviousClose(label, date)
+        if close is None or previousClose is None:
+            return None
+        return round((close - previousClose) / previousClose * 100, 4)
+
+    def testFindByDate(self):
+        for date in self.dates[:20]:
+            labels = sorted(label for label in self.closes
+                            if date in self.closes[label])
+            self.assertEqual(
+                sorted(node.getLabel()
+                       for node in self.model.findByDate(date)), labels)
+        self.assertEqual(self.model.findByDate('2014-01-04'), [])
+
+    def testPreviousCloseSpansGaps(self):
+        for date in self.dates:
+            crossSection = self.model.getCrossSection(date)
+            for label, previousClose in zip(
+                    crossSection.getLabels().tolist(),
+                    crossSection.getPreviousClose().tolist()):
+                expected = self.getPreviousClose(label, date)
+                if expected is None:
+                    self.assertTrue(math.isnan(previousClose))
+                else:
+                    self.assertEqual(previousClose, expected)
+
+    def testMovers(self):
+        for date in self.dates[1::10]:
+            crossSection = self.model.getCrossSection(date)
+            labels = crossSection.getLabels()
+            changes = {
+                label: self.getChange(label, date)
+                for label in self.closes
+                if self.getChange(label, date) is not None
+            }
+            for descending in (True, False):
+                movers = crossSection.getMovers(3, descending)
+                found = [changes[label] for label in labels[movers]]
+                expected = sorted(changes.values(), reverse=descending)[:3]
+                self.assertEqual(found, expected)
+
+    def testBreadthMatchesCrossSections(self):
+        fromDate, toDate = self.dates[5], self.dates[40]
+        breadth = self.model.getPanel().getBreadth(fromDate, toDate)
+        dates = self.dates[5:41]
+        self.assertEqual(len(breadth["days"]), len(dates))
+        for row, date in enumerate(dates):
+            crossSection = self.model.getCrossSection(date)
+            for name, count in crossSection.getBreadth().items():
+                self.assertEqual(breadth[name][row], count, name)
+            changes = [
+                self.getChange(label, date) for label in self.closes
+            ]
+            changes = [change for change in changes if change is not None]
+            self.assertEqual(breadth["advancing"][row],
+                             sum(change > 0 for change in changes))
+            self.assertEqual(breadth["declining"][row],
+                             sum(change < 0 for change in changes))
+            self.assertEqual(
+                (breadth["highestStock"][row], breadth["highest"][row]),
+                crossSection.getHighest())
+            self.assertEqual(
+                (breadth["lowestStock"][row], breadth["lowest"][row]),
+                crossSection.getLowest())
+
+    def testBreadthOutsideTheCalendar(self):
+        breadth = self.model.getPanel().getBreadth('2010-01-01', '2010-02-01')
+        self.assertEqual(len(breadth["days"]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
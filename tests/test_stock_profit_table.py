@@ -0,0 +1,95 @@
+'''
+    Stock Profit Table Tests
+    The batch profit engine against the StockProfit getters
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock_date import StockDate
+from tests.stock_fixture import createRows, loadModel
+import math
+import numpy as np
+import unittest
+
+# Each StockProfit getter, by the table column holding it
+GETTERS = {
+    "lowestMargin": "getLowestMargin",
+    "highestMargin": "getHighestMargin",
+    "averageMargin": "getAverageMargin",
+    "lowestBuyPrice": "getLowestBuyPrice",
+    "highestBuyPrice": "getHighestBuyPrice",
+    "averageBuyPrice": "getAverageBuyPrice",
+    "lowestSellPrice": "getLowestSellPrice",
+    "highestSellPrice": "getHighestSellPrice",
+    "averageSellPrice": "getAverageSellPrice",
+    "percentageGain": "getPercentageGain"
+}
+
+
+class TestStockProfitTable(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.model = loadModel(createRows())
+        random = np.random.RandomState(1)
+        # Every weekday, so some dates are missing from some stock
+        days = np.arange('2014-01-01', '2014-07-01', dtype='datetime64[D]')
+        days = [str(day) for day in days[np.is_busday(days)]]
+        cls.scenarios = []
+        for _ in range(400):
+            buy, sell = sorted(random.choice(len(days), 2))
+            cls.scenarios.append(
+                (random.choice(cls.model.selectAllNames()), days[buy],
+                 days[sell], int(random.randint(1, 500))))
+
+    def getTable(self, scenarios):
+        return self.model.getProfitValues(*[list(column)
+                                            for column in zip(*scenarios)])
+
+    def testMatchesStockProfit(self):
+        table = self.getTable(self.scenarios)
+        self.assertEqual(table.getSize(), len(self.scenarios))
+        found = table.getFound()
+        self.assertTrue(found.any() and not found.all())
+        for row, (label, buy, sell, amount) in enumerate(self.scenarios):
+            profit = self.model.findByName(label).getProfitValue(
+                amount, buy, sell)
+            self.assertEqual(bool(found[row]), profit is not None)
+            for name, getter in GETTERS.items():
+                value = table.getColumn(name)[row]
+                if profit is None:
+                    self.assertTrue(math.isnan(value), name)
+                else:
+                    self.assertEqual(value, getattr(profit, getter)(), name)
+
+    def testMissingDateLeavesEveryColumnNaN(self):
+        node = self.model.findByName('AAA')
+        dates = StockDate.toDateStrings(node.getDates())
+        # A weekday the stock didn't trade on
+        missing = next(
+            str(day) for day in np.arange(
+                dates[0], dates[-1], dtype='datetime64[D]')
+            if np.is_busday(day) and str(day) not in dates)
+        table = self.getTable([('AAA', dates[0], missing, 1),
+                               ('AAA', missing, dates[-1], 1),
+                               ('ZZZ', dates[0], dates[-1], 1)])
+        self.assertFalse(table.getFound().any())
+        for name, column in table.getColumns().items():
+            self.assertTrue(np.isnan(column).all(), name)
+
+    def testScreenMatchesProfitValues(self):
+        labels = self.model.selectAllNames()
+        for buy, sell in (('2014-02-03', '2014-05-01'),
+                          ('2014-03-03', '2014-03-03')):
+            screen = self.model.screen(buy, sell, 10)
+            table = self.model.getProfitValues(screen.getLabels(), buy, sell,
+                                               10)
+            self.assertEqual(sorted(screen.getLabels()), sorted(labels))
+            np.testing.assert_array_equal(screen.getFound(),
+                                          table.getFound())
+            for name, column in screen.getColumns().items():
+                np.testing.assert_array_equal(column, table.getColumn(name),
+                                              name)
+
+
+if __name__ == '__main__':
+    unittest.main()
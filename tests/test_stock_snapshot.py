@@ -0,0 +1,91 @@
+'''
+    Stock Snapshot Tests
+    Snapshots are reused while the source is unchanged, and rebuilt after
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock import Stock
+from app.model.stock_snapshot import StockSnapshot
+from app.model.stock_source_mapped_file import StockSourceMappedFile
+from tests.stock_fixture import createRows, writeSource
+import numpy as np
+import os
+import tempfile
+import unittest
+
+
+class TestStockSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.rows = createRows(seed=6)
+        self.location = writeSource(self.directory.name, self.rows)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def load(self, **options):
+        source = StockSourceMappedFile(self.location)
+        model = Stock()
+        model.load(source, **options)
+        for node in model.selectAll().values():
+            # Read the rows before the source is closed
+            node.getColumns()
+        source.close()
+        return model, StockSnapshot.fromSource(source)
+
+    def isSnapshotValid(self):
+        source = StockSourceMappedFile(self.location)
+        source.close()
+        return StockSnapshot.fromSource(source).isValid()
+
+    def assertSameModel(self, model, expected):
+        self.assertEqual(sorted(model.selectAllNames()),
+                         sorted(expected.selectAllNames()))
+        for label, node in expected.selectAll().items():
+            for column, other in zip(node.getColumns(),
+                                     model.findByName(label).getColumns()):
+                np.testing.assert_array_equal(column, other)
+        self.assertEqual(model.getEarliestDate(), expected.getEarliestDate())
+        self.assertEqual(model.getHighestValue(), expected.getHighestValue())
+
+    def testReadsTheSnapshotItWrote(self):
+        parsed, snapshot = self.load()
+        self.assertTrue(snapshot.isValid())
+        mapped, _ = self.load()
+        self.assertSameModel(mapped, parsed)
+        self.assertSameModel(mapped, self.load(useSnapshot=False)[0])
+
+    def testRebuiltAfterTheSourceChanges(self):
+        self.load()
+        with open(self.location, mode='a') as handler:
+            handler.write('2014-07-01,1,2,0.5,1.5,100,NEW\n')
+        self.assertFalse(self.isSnapshotValid())
+        model, snapshot = self.load()
+        self.assertIsNotNone(model.findByName('NEW'))
+        self.assertTrue(snapshot.isValid())
+
+    def testRebuiltAfterAnEditOfTheSameSize(self):
+        self.load()
+        with open(self.location, mode='r+b') as handler:
+            handler.seek(os.path.getsize(self.location) // 2)
+            handler.write(b'9')
+        os.utime(self.location, ns=(0, 0))
+        self.assertFalse(self.isSnapshotValid())
+
+    def testIgnoresACorruptSnapshot(self):
+        parsed, snapshot = self.load()
+        with open(snapshot.location, mode='wb') as handler:
+            handler.write(b'not a snapshot')
+        self.assertFalse(snapshot.isValid())
+        model, snapshot = self.load()
+        self.assertSameModel(model, parsed)
+        self.assertTrue(snapshot.isValid())
+
+    def testNoSnapshotWritten(self):
+        _, snapshot = self.load(useSnapshot=False)
+        self.assertFalse(os.path.exists(snapshot.location))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+'''
+    Stock Source Index Tests
+    Lazy loads from the byte offset index, and its invalidation
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock import Stock
+from app.model.stock_source_index import StockSourceIndex
+from app.model.stock_source_mapped_file import StockSourceMappedFile
+from tests.stock_fixture import createRows, loadModel, writeSource
+import numpy as np
+import tempfile
+import unittest
+
+
+class TestStockSourceIndex(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def load(self, location, **options):
+        # Lazy nodes parse their rows from the source, so it's only closed
+        # once the test is done
+        source = StockSourceMappedFile(location)
+        model = Stock()
+        model.load(source, useSnapshot=False, lazy=True, **options)
+        self.addCleanup(source.close)
+        return model
+
+    def getIndex(self, location):
+        source = StockSourceMappedFile(location)
+        source.close()
+        index = StockSourceIndex.fromSource(source)
+        return index if index.read() else None
+
+    def assertSameModel(self, model, expected):
+        self.assertEqual(sorted(model.selectAllNames()),
+                         sorted(expected.selectAllNames()))
+        for label, node in expected.selectAll().items():
+            for column, other in zip(node.getColumns(),
+                                     model.findByName(label).getColumns()):
+                np.testing.assert_array_equal(column, other)
+        self.assertEqual(model.getEarliestDate(), expected.getEarliestDate())
+        self.assertEqual(model.getLatestDate(), expected.getLatestDate())
+        self.assertEqual(model.getLowestValue(), expected.getLowestValue())
+
+    def testLazyLoadMatchesParsing(self):
+        rows = createRows(seed=7)
+        location = writeSource(self.directory.name, rows)
+        model = self.load(location)
+        index = self.getIndex(location)
+        self.assertTrue(index.isGrouped())
+        self.assertEqual(sorted(index.getEntries()),
+                         sorted(model.selectAllNames()))
+        # Nothing is parsed until it's read
+        self.assertFalse(
+            any(node.isLoaded() for node in model.selectAll().values()))
+        self.assertSameModel(model, loadModel(rows))
+
+    def testRebuiltAfterTheSourceChanges(self):
+        rows = createRows(seed=8)
+        location = writeSource(self.directory.name, rows)
+        self.load(location)
+        self.assertIsNotNone(self.getIndex(location))
+        rows.append(('2014-07-01', 1.0, 2.0, 0.5, 1.5, 100, 'NEW'))
+        writeSource(self.directory.name, rows)
+        self.assertIsNone(self.getIndex(location))
+        model = self.load(location)
+        self.assertIsNotNone(self.getIndex(location))
+        self.assertSameModel(model, loadModel(rows))
+
+    def testUngroupedSourceIsParsed(self):
+        rows = sorted(createRows(seed=9))
+        model = self.load(writeSource(self.directory.name, rows))
+        self.assertSameModel(model, loadModel(rows))
+        self.assertTrue(
+            all(node.isLoaded() for node in model.selectAll().values()))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+'''
+    Stock Table Tests
+    The bulk csv tokenizer, and the csv reader it falls back to
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock_date import StockDate
+from app.model.stock_source_file import StockSourceFile
+from app.model.stock_table import StockTable
+import numpy as np
+import unittest
+
+HEADERS = ['date', 'open', 'high', 'low', 'close', 'volume', 'name']
+
+LINES = (b'2014-01-02,10.5,11,10,10.75,1200,AAA\n'
+         b'2014-01-03,10.75,12.25,10.5,12,3400,AAA\n'
+         b'2014-01-02,20,21,19.5,20.5,560,BBB\n')
+
+
+class TestStockTable(unittest.TestCase):
+    def assertTable(self, table, expected=None):
+        expected = expected or StockTable.fromBytes(LINES, HEADERS)
+        self.assertEqual(table.getSize(), expected.getSize())
+        for column, other in zip(table.getColumns(), expected.getColumns()):
+            np.testing.assert_array_equal(column, other)
+        np.testing.assert_array_equal(table.names, expected.names)
+
+    def testBulkParse(self):
+        table = StockTable.fromBytes(LINES, HEADERS)
+        self.assertEqual(table.names.tolist(), [b'AAA', b'AAA', b'BBB'])
+        self.assertEqual(StockDate.toDateStrings(table.dates),
+                         ['2014-01-02', '2014-01-03', '2014-01-02'])
+        self.assertEqual(table.close.tolist(), [10.75, 12, 20.5])
+        self.assertEqual(table.volume.tolist(), [1200, 3400, 560])
+
+    def testLineEndingsAndBlankLines(self):
+        windows = LINES.replace(b'\n', b'\r\n')
+        self.assertTable(StockTable.fromBytes(windows, HEADERS))
+        blank = LINES.replace(b'AAA\n', b'AAA\n\n')
+        self.assertTable(StockTable.fromBytes(blank, HEADERS))
+        self.assertTable(StockTable.fromBytes(LINES.rstrip(b'\n'), HEADERS))
+
+    def testColumnOrderAndMissingValues(self):
+        headers = ['name', 'date', 'close', 'low', 'high', 'open']
+        table = StockTable.fromBytes(b'AAA,2014-01-02,10.75,10,,10.5\n',
+                                     headers)
+        self.assertEqual(table.high.tolist(), [0.0])
+        self.assertEqual(table.open.tolist(), [10.5])
+        # No volume column is no volume
+        self.assertEqual(table.volume.tolist(), [0.0])
+
+    def testBulkParseRejects(self):
+        with self.assertRaises(ValueError):
+            StockTable.fromBytes(LINES.replace(b'AAA', b'"AAA"'), HEADERS)
+        with self.assertRaises(ValueError):
+            StockTable.fromBytes(LINES + b'2014-01-06,1,2\n', HEADERS)
+        with self.assertRaises(ValueError):
+            StockTable.fromBytes(LINES, HEADERS[:-1] + ['ticker'])
+
+    def testQuotedFieldsFallBackToTheCsvReader(self):
+        quoted = LINES.replace(b'AAA', b'"AAA"').replace(b',20,', b',"20",')
+        self.assertTable(StockSourceFile.parseChunk(quoted, HEADERS))
+        self.assertTable(StockSourceFile.parseChunk(LINES, HEADERS))
+
+    def testEmpty(self):
+        self.assertEqual(StockTable.fromBytes(b'', HEADERS).getSize(), 0)
+        self.assertEqual(StockTable.fromBytes(b'\n\n', HEADERS).getSize(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
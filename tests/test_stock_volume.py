@@ -0,0 +1,90 @@
+'''
+    Stock Volume Tests
+    Volume, turnover and VWAP against sums of the daily values
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock import Stock
+from app.model.stock_source_mapped_file import StockSourceMappedFile
+from tests.stock_fixture import createRows, loadModel, writeSource
+import math
+import tempfile
+import unittest
+
+RANGES = [('2014-01-01', '2014-07-01'), ('2014-02-03', '2014-02-28'),
+          ('2014-03-12', '2014-03-12'), ('2014-05-01', '2014-03-01')]
+
+
+class TestStockVolume(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.rows = createRows(seed=3)
+        cls.model = loadModel(cls.rows)
+
+    def getExpected(self, label, fromDate, toDate):
+        # Both dates are included, the whole holding period trades
+        rows = [
+            row for row in self.rows
+            if row[6] == label and fromDate <= row[0] <= toDate
+        ]
+        volume = sum(row[5] for row in rows)
+        turnover = sum(sum(row[1:5]) / 4 * row[5] for row in rows)
+        return len(rows), volume, turnover
+
+    def testVolumeValuesMatchDailySums(self):
+        for label in self.model.selectAllNames():
+            node = self.model.findByName(label)
+            for fromDate, toDate in RANGES:
+                days, volume, turnover = self.getExpected(
+                    label, fromDate, toDate)
+                values = node.getVolumeValues(fromDate, toDate)
+                self.assertEqual(values.getDays(), days)
+                self.assertEqual(values.getVolume(), volume)
+                self.assertAlmostEqual(values.getTurnover(), turnover, 1)
+                if volume:
+                    # Rounded to the cent
+                    self.assertAlmostEqual(values.getVwap(),
+                                           turnover / volume,
+                                           delta=0.0051)
+                else:
+                    self.assertEqual(values.getVwap(), 0.0)
+
+    def testProfitValuesMatchVolumeValues(self):
+        labels = self.model.selectAllNames()
+        for label in labels:
+            node = self.model.findByName(label)
+            dates = node.getDates()
+            # Dates the stock traded on, so the scenario is found
+            fromDate, toDate = [
+                str(day.astype('datetime64[D]'))
+                for day in (dates[3], dates[-4])
+            ]
+            table = self.model.getProfitValues([label], fromDate, toDate, 1)
+            values = node.getVolumeValues(fromDate, toDate)
+            self.assertEqual(
+                table.getColumn("averageVolume")[0],
+                round(values.getVolume() / values.getDays(), 2))
+            self.assertAlmostEqual(table.getColumn("turnover")[0],
+                                   values.getTurnover(), 2)
+            self.assertEqual(table.getColumn("vwap")[0], values.getVwap())
+
+    def testMissingVolumeColumnIsZero(self):
+        header = 'date,open,high,low,close,Name\n'
+        rows = [(row[0], *row[1:5], row[6]) for row in self.rows]
+        with tempfile.TemporaryDirectory() as directory:
+            source = StockSourceMappedFile(
+                writeSource(directory, rows, header=header))
+            model = Stock()
+            model.load(source, useSnapshot=False)
+            source.close()
+        values = model.findByName('AAA').getVolumeValues(*RANGES[0])
+        self.assertGreater(values.getDays(), 0)
+        self.assertEqual(values.getVolume(), 0.0)
+        self.assertEqual(values.getVwap(), 0.0)
+        table = model.getProfitValues(['AAA'], *RANGES[1], 1)
+        self.assertTrue(math.isnan(table.getColumn("vwap")[0]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+'''
+    Stock Window Tests
+    Best windows, run-up and drawdown against a search of every pair
+
+    Author:
+        Matthew Barber <mfmbarber@gmail.com>
+'''
+from app.model.stock_date import StockDate
+from tests.stock_fixture import createRows, loadModel
+import unittest
+
+
+class TestStockWindow(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        rows = createRows(seed=2)
+        # A stock that only rises, and one that only falls
+        for label, step in (('UP', 1), ('DOWN', -1)):
+            rows.extend(('2014-01-%02d' % day, 50, 80, 20, 50 + step * day,
+                         1000, label) for day in range(1, 21))
+        cls.model = loadModel(rows)
+
+    def getCloses(self, label, fromDate, toDate):
+        node = self.model.findByName(label)
+        start, end = node.getIndexRange(fromDate, toDate)
+        dates = StockDate.toDateStrings(node.getDates()[start:end])
+        return dates, node.getColumns()[4][start:end].tolist()
+
+    def getPairs(self, label, fromDate, toDate):
+        # The change of every buy and later sell, by brute force
+        dates, closes = self.getCloses(label, fromDate, toDate)
+        return [(closes[sell] - closes[buy], dates[buy], dates[sell])
+                for sell in range(len(closes)) for buy in range(sell)]
+
+    def testBestWindowsMatchEveryPair(self):
+        for label in ('AAA', 'BBB', 'CCC', 'DDD'):
+            for fromDate, toDate in (('2014-01-01', '2014-07-01'),
+                                     ('2014-02-10', '2014-04-18')):
+                pairs = self.getPairs(label, fromDate, toDate)
+                # The best gain for each sell date, best first
+                best = {}
+                for change, buy, sell in pairs:
+                    best[sell] = max(best.get(sell, change), change)
+                gains = sorted((change for change in best.values()
+                                if change > 0),
+                               reverse=True)
+                windows = self.model.findByName(label).getBestWindows(
+                    fromDate, toDate, 5)
+                self.assertEqual(len(windows), min(5, len(gains)))
+                self.assertEqual(len({window.getSellDate()
+                                      for window in windows}), len(windows))
+                for window, gain in zip(windows, gains):
+                    self.assertAlmostEqual(
+                        window.getSellPrice() - window.getBuyPrice(), gain)
+                    self.assertTrue(fromDate <= window.getBuyDate() <
+                                    window.getSellDate() <= toDate)
+
+    def testRunUpAndDrawdownMatchEveryPair(self):
+        for label in ('AAA', 'BBB', 'CCC', 'DDD'):
+            pairs = self.getPairs(label, '2014-01-01', '2014-07-01')
+            node = self.model.findByName(label)
+            runUp = node.getMaxRunUp('2014-01-01', '2014-07-01')
+            drawdown = node.getMaxDrawdown('2014-01-01', '2014-07-01')
+            self.assertAlmostEqual(runUp.getSellPrice() - runUp.getBuyPrice(),
+                                   max(pairs)[0])
+            self.assertAlmostEqual(
+                drawdown.getSellPrice() - drawdown.getBuyPrice(),
+                min(pairs)[0])
+            self.assertLess(drawdown.getBuyDate(), drawdown.getSellDate())
+
+    def testOnlyRising(self):
+        node = self.model.findByName('UP')
+        self.assertIsNone(node.getMaxDrawdown('2014-01-01', '2014-01-20'))
+        runUp = node.getMaxRunUp('2014-01-01', '2014-01-20')
+        self.assertEqual((runUp.getBuyDate(), runUp.getSellDate()),
+                         ('2014-01-01', '2014-01-20'))
+        self.assertEqual(runUp.getChange(), 19)
+
+    def testOnlyFalling(self):
+        node = self.model.findByName('DOWN')
+        self.assertEqual(node.getBestWindows('2014-01-01', '2014-01-20', 3),
+                         [])
+        self.assertIsNone(node.getMaxRunUp('2014-01-01', '2014-01-20'))
+        drawdown = node.getMaxDrawdown('2014-01-01', '2014-01-20')
+        self.assertEqual(drawdown.getChange(), -19)
+
+    def testSingleDay(self):
+        node = self.model.findByName('UP')
+        self.assertEqual(node.getBestWindows('2014-01-05', '2014-01-05'), [])
+        self.assertIsNone(node.getMaxDrawdown('2014-01-05', '2014-01-05'))
+
+
+if __name__ == '__main__':
+    unittest.main()